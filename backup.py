@@ -0,0 +1,254 @@
+"""
+Backup online e incremental do banco usando a API de backup do SQLite.
+
+A cópia consistente do banco é dividida em blocos de ``TAMANHO_BLOCO``
+bytes, guardados compactados pelo SHA-256 em ``blocos/``. Cada backup é um
+índice (``.idx``) com a lista dos blocos; só os blocos que ainda não existem
+são compactados e gravados, então um backup depois de poucas alterações
+grava poucos blocos. Backups antigos (``.db.gz`` inteiro) continuam
+listados e restauráveis.
+"""
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from .database import get_gerenciador, get_db_path
+
+PAGINAS_POR_PASSO = 64
+PAUSA_ENTRE_PASSOS = 0.005
+RETENCAO = 7
+BLOCO_LEITURA = 256 * 1024
+MANIFESTO = 'backups.json'
+# Múltiplo do tamanho de página: uma página alterada muda um só bloco
+TAMANHO_BLOCO = 64 * 1024
+PASTA_BLOCOS = 'blocos'
+
+Progresso = Callable[[Dict], None]
+
+
+class MotorBackup:
+    """Copia o banco em passos pequenos, verifica, grava os blocos novos e aplica retenção.
+
+    A cópia usa ``sqlite3.Connection.backup`` com poucas páginas por passo,
+    então pode rodar com o app em uso. Se o conteúdo for idêntico ao último
+    backup, nenhum arquivo novo é gravado.
+    """
+
+    def __init__(self, origem: Optional[str] = None, pasta: Optional[str] = None,
+                 paginas_por_passo: int = PAGINAS_POR_PASSO, retencao: int = RETENCAO,
+                 pausa: float = PAUSA_ENTRE_PASSOS):
+        self.origem = origem or get_gerenciador().caminho or get_db_path()
+        self.pasta = pasta or os.path.join(os.path.dirname(os.path.abspath(self.origem)), 'backups')
+        self.paginas_por_passo = paginas_por_passo
+        self.retencao = retencao
+        self.pausa = pausa
+
+    def executar(self, progresso: Optional[Progresso] = None) -> Dict:
+        """Executa o backup completo e retorna o registro do manifesto."""
+        avisar = progresso or (lambda info: None)
+        os.makedirs(self.pasta, exist_ok=True)
+        
+        fd, temporario = tempfile.mkstemp(suffix='.db', dir=self.pasta)
+        os.close(fd)
+        try:
+            paginas = self._copiar(temporario, avisar)
+            
+            avisar({'etapa': 'verificando', 'percentual': 60, 'mensagem': 'Verificando integridade...'})
+            self._verificar_integridade(temporario)
+            
+            # Só os blocos que nenhum backup tem são compactados e gravados
+            blocos, digest, novos, gravados = self._guardar_blocos(temporario, avisar)
+            
+            registros = self.listar()
+            if registros and registros[-1]['sha256'] == digest:
+                avisar({'etapa': 'concluido', 'percentual': 100, 'mensagem': 'Sem alterações desde o último backup'})
+                return dict(registros[-1], novo=False)
+            
+            arquivo = self._novo_nome(registros)
+            _gravar_atomico(arquivo, '\n'.join(blocos).encode('ascii'))
+            
+            registro = {
+                'arquivo': os.path.basename(arquivo),
+                'data': datetime.now().isoformat(timespec='seconds'),
+                'sha256': digest,
+                'paginas': paginas,
+                'blocos': len(blocos),
+                'blocos_novos': novos,
+                'tamanho': gravados,
+            }
+            registros.append(registro)
+            self._aplicar_retencao(registros)
+            
+            avisar({'etapa': 'concluido', 'percentual': 100, 'mensagem': 'Backup concluído'})
+            return dict(registro, novo=True)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+
+    def restaurar(self, arquivo: str, destino: str) -> str:
+        """Remonta o backup ``arquivo`` em ``destino`` e confere o SHA-256."""
+        registro = next((r for r in self.listar() if r['arquivo'] == arquivo), None)
+        if registro is None:
+            raise FileNotFoundError(f'Backup não encontrado: {arquivo}')
+        
+        digest = hashlib.sha256()
+        temporario = destino + '.tmp'
+        with open(temporario, 'wb') as saida:
+            if arquivo.endswith('.idx'):
+                for chave in self._ler_indice(arquivo):
+                    with gzip.open(self._caminho_bloco(chave), 'rb') as f:
+                        bloco = f.read()
+                    digest.update(bloco)
+                    saida.write(bloco)
+            else:
+                # Formato antigo: o banco inteiro num .db.gz
+                with gzip.open(os.path.join(self.pasta, arquivo), 'rb') as f:
+                    for bloco in iter(lambda: f.read(BLOCO_LEITURA), b''):
+                        digest.update(bloco)
+                        saida.write(bloco)
+        
+        if digest.hexdigest() != registro['sha256']:
+            os.remove(temporario)
+            raise IOError(f'Backup corrompido: {arquivo}')
+        os.replace(temporario, destino)
+        return destino
+
+    def listar(self) -> List[Dict]:
+        """Retorna os backups registrados, do mais antigo ao mais novo."""
+        caminho = os.path.join(self.pasta, MANIFESTO)
+        if not os.path.exists(caminho):
+            return []
+        with open(caminho, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _novo_nome(self, registros: List[Dict]) -> str:
+        """Gera um nome que não existe na pasta nem foi usado por outro backup.
+
+        O horário vai até o microssegundo: backups no mesmo segundo não
+        disputam o nome e um nome já apagado pela retenção, sendo de um
+        instante anterior, não volta a ser gerado.
+        """
+        nome = os.path.splitext(os.path.basename(self.origem))[0]
+        usados = {r['arquivo'] for r in registros}
+        base = f'{nome}_backup_{datetime.now().strftime("%Y%m%d_%H%M%S_%f")}'
+        arquivo = f'{base}.idx'
+        sufixo = 1
+        while arquivo in usados or os.path.exists(os.path.join(self.pasta, arquivo)):
+            sufixo += 1
+            arquivo = f'{base}_{sufixo}.idx'
+        return os.path.join(self.pasta, arquivo)
+
+    def _caminho_bloco(self, chave: str) -> str:
+        return os.path.join(self.pasta, PASTA_BLOCOS, chave[:2], f'{chave}.gz')
+
+    def _ler_indice(self, arquivo: str) -> List[str]:
+        with open(os.path.join(self.pasta, arquivo), 'rb') as f:
+            return f.read().decode('ascii').split()
+
+    def _guardar_blocos(self, caminho: str, avisar: Progresso):
+        """Grava os blocos de ``caminho`` que ainda não existem.
+
+        Retorna (chaves dos blocos, SHA-256 do arquivo, blocos novos,
+        bytes gravados).
+        """
+        total = os.path.getsize(caminho) or 1
+        digest = hashlib.sha256()
+        chaves = []
+        novos = 0
+        gravados = 0
+        with open(caminho, 'rb') as f:
+            for bloco in iter(lambda: f.read(TAMANHO_BLOCO), b''):
+                digest.update(bloco)
+                chave = hashlib.sha256(bloco).hexdigest()
+                chaves.append(chave)
+                destino = self._caminho_bloco(chave)
+                if not os.path.exists(destino):
+                    gravados += _gravar_bloco(destino, bloco, chave)
+                    novos += 1
+                if len(chaves) % 64 == 0:
+                    avisar({'etapa': 'gravando', 'percentual': 65 + int(f.tell() / total * 30),
+                            'mensagem': f'Gravando blocos alterados ({novos} novos)'})
+        return chaves, digest.hexdigest(), novos, gravados
+
+    def _copiar(self, destino: str, avisar: Progresso) -> int:
+        """Copia o banco aos poucos para ``destino``; retorna o total de páginas."""
+        total = {'paginas': 0}
+        
+        def passo(status, restantes, paginas):
+            total['paginas'] = paginas
+            feito = (paginas - restantes) / paginas if paginas else 1
+            avisar({'etapa': 'copiando', 'percentual': int(feito * 50),
+                    'mensagem': f'Copiando {paginas - restantes}/{paginas} páginas'})
+            # Libera o banco para outras conexões entre os passos
+            time.sleep(self.pausa)
+        
+        origem = sqlite3.connect(self.origem, check_same_thread=False)
+        copia = sqlite3.connect(destino)
+        try:
+            origem.backup(copia, pages=self.paginas_por_passo, progress=passo)
+        finally:
+            copia.close()
+            origem.close()
+        return total['paginas']
+
+    @staticmethod
+    def _verificar_integridade(caminho: str):
+        """Roda PRAGMA integrity_check na cópia."""
+        conn = sqlite3.connect(caminho)
+        try:
+            resultado = conn.execute('PRAGMA integrity_check').fetchone()[0]
+        finally:
+            conn.close()
+        if resultado != 'ok':
+            raise sqlite3.DatabaseError(f'Falha de integridade: {resultado}')
+
+    def _aplicar_retencao(self, registros: List[Dict]):
+        """Mantém só os ``retencao`` backups mais novos e grava o manifesto."""
+        excedentes = registros[:-self.retencao] if self.retencao > 0 else []
+        for registro in excedentes:
+            caminho = os.path.join(self.pasta, registro['arquivo'])
+            if os.path.exists(caminho):
+                os.remove(caminho)
+        
+        manter = registros[len(excedentes):]
+        _gravar_atomico(os.path.join(self.pasta, MANIFESTO), json.dumps(manter, indent=2).encode('utf-8'))
+        if excedentes:
+            self._limpar_blocos(manter)
+
+    def _limpar_blocos(self, registros: List[Dict]):
+        """Apaga os blocos que nenhum backup mantido usa."""
+        usados = set()
+        for registro in registros:
+            if registro['arquivo'].endswith('.idx'):
+                usados.update(self._ler_indice(registro['arquivo']))
+        
+        raiz = os.path.join(self.pasta, PASTA_BLOCOS)
+        for prefixo in os.listdir(raiz) if os.path.isdir(raiz) else []:
+            for nome in os.listdir(os.path.join(raiz, prefixo)):
+                if nome[:-len('.gz')] not in usados:
+                    os.remove(os.path.join(raiz, prefixo, nome))
+
+
+def _gravar_atomico(caminho: str, dados: bytes):
+    temporario = caminho + '.tmp'
+    with open(temporario, 'wb') as f:
+        f.write(dados)
+    os.replace(temporario, caminho)
+
+
+def _gravar_bloco(destino: str, bloco: bytes, chave: str) -> int:
+    """Compacta e grava um bloco, conferindo o que foi para o disco."""
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    _gravar_atomico(destino + '.novo', gzip.compress(bloco, compresslevel=6))
+    with gzip.open(destino + '.novo', 'rb') as f:
+        if hashlib.sha256(f.read()).hexdigest() != chave:
+            os.remove(destino + '.novo')
+            raise IOError('Bloco de backup corrompido após compactação')
+    os.replace(destino + '.novo', destino)
+    return os.path.getsize(destino)
@@ -0,0 +1,5 @@
+"""
+Benchmarks do app (rodar a partir da pasta acima de ``app``).
+
+Exemplo: python -m app.benchmarks.bench_conexoes
+"""
@@ -0,0 +1,95 @@
+"""
+Estresse multi-thread da criação de OPs.
+
+Compara o contador antigo (SELECT + UPDATE do valor lido) com o alocador
+atômico de ``RemessaService.criar``: throughput, falhas e IDs duplicados.
+"""
+import sqlite3
+import threading
+import time
+from datetime import date
+
+from app import database
+from app.services import RemessaService
+from app.benchmarks.comum import banco_temporario
+
+THREADS = 8
+OPS_POR_THREAD = 200
+
+DADOS = {'id_cliente': 'C0001', 'modelo': 'Camiseta', 'quantidade': 10, 'custo_unitario': 2.5}
+
+
+def criar_legado(caminho: str) -> bool:
+    """Reproduz o algoritmo antigo (ler, somar um, gravar)."""
+    conn = sqlite3.connect(caminho, timeout=10)
+    try:
+        ultimo = int(conn.execute(
+            "SELECT valor FROM Configuracoes WHERE chave = 'ultimo_id_remessa'"
+        ).fetchone()[0])
+        novo_id = ultimo + 1
+        conn.execute('''
+            INSERT INTO Remessas (id_remessa, id_cliente, modelo, quantidade,
+                                  custo_unitario, saldo_montar, data_criacao)
+            VALUES (?, 'C0001', 'Camiseta', 10, 250, 10, ?)
+        ''', (f"OP-{novo_id:04d}", date.today().isoformat()))
+        conn.execute(
+            "UPDATE Configuracoes SET valor = ? WHERE chave = 'ultimo_id_remessa'",
+            (str(novo_id),)
+        )
+        conn.commit()
+        return True
+    except sqlite3.Error:
+        return False
+    finally:
+        conn.close()
+
+
+def estressar(nome: str, criar) -> None:
+    """Dispara as threads e imprime throughput e consistência."""
+    falhas = []
+    
+    def trabalhador():
+        erros = 0
+        for _ in range(OPS_POR_THREAD):
+            if not criar():
+                erros += 1
+        falhas.append(erros)
+    
+    threads = [threading.Thread(target=trabalhador) for _ in range(THREADS)]
+    inicio = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    duracao = time.perf_counter() - inicio
+    
+    with database.conexao() as conn:
+        total, distintos = conn.execute(
+            'SELECT COUNT(*), COUNT(DISTINCT id_remessa) FROM Remessas'
+        ).fetchone()
+        contador = int(conn.execute(
+            "SELECT valor FROM Configuracoes WHERE chave = 'ultimo_id_remessa'"
+        ).fetchone()[0])
+    
+    tentativas = THREADS * OPS_POR_THREAD
+    print(f"{nome:<12} {tentativas / duracao:>10.0f} OPs/s  "
+          f"criadas={total} falhas={sum(falhas)} contador={contador} "
+          f"ids_distintos={distintos}")
+
+
+def main():
+    print(f"{THREADS} threads x {OPS_POR_THREAD} OPs")
+    
+    with banco_temporario() as caminho:
+        database.configurar(caminho, tamanho_pool=THREADS)
+        database.init_db()
+        estressar('legado', lambda: criar_legado(caminho))
+    
+    with banco_temporario() as caminho:
+        database.configurar(caminho, tamanho_pool=THREADS)
+        database.init_db()
+        estressar('alocador', lambda: RemessaService.criar(DADOS)['sucesso'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Latência de ClienteService.buscar com 50k clientes: índice FTS5 vs. LIKE.
+"""
+import random
+
+from app import database
+from app.services import ClienteService
+from app.benchmarks.comum import banco_temporario, medir, imprimir
+
+TOTAL = 50_000
+PALAVRAS = ['José', 'Maria', 'João', 'Ana', 'Confecções', 'Malharia', 'Ateliê', 'Costura',
+            'Silva', 'Souza', 'Pereira', 'Lima', 'Oliveira', 'Santos', 'Moda', 'Bordados']
+TERMOS = ['j', 'jo', 'jose', 'jose sil', 'conf mal', 'C0123', '98765', 'cliente123@']
+
+
+def popular():
+    random.seed(42)
+    ClienteService.cadastrar_lote([{
+        'id_cliente': f'C{i:05d}',
+        'nome': ' '.join(random.sample(PALAVRAS, 3)),
+        'telefone': f'(11) 9{random.randint(1000, 9999)}-{random.randint(1000, 9999)}',
+        'email': f'cliente{i}@exemplo.com',
+    } for i in range(TOTAL)])
+
+
+def medir_termos(rotulo):
+    return {
+        f'{rotulo} {termo!r}': medir(lambda: ClienteService.buscar(termo, 20), 50)
+        for termo in TERMOS
+    }
+
+
+def main():
+    with banco_temporario():
+        popular()
+        resultados = medir_termos('fts5')
+        
+        with database.conexao() as conn:
+            conn.execute('DROP TABLE ClientesBusca')
+        resultados.update(medir_termos('like'))
+    
+    imprimir(f'ClienteService.buscar com {TOTAL} clientes (ms)', resultados)
+
+
+if __name__ == '__main__':
+    main()
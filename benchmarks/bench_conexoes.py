@@ -0,0 +1,75 @@
+"""
+Latência por consulta: conexão nova a cada chamada vs. pool.
+
+Os dois lados rodam o mesmo SQL (as somas sobre as tabelas, como nos
+services antes dos resumos) direto na conexão, sem passar pelo cache dos
+services, então a diferença é só o custo de abrir a conexão.
+"""
+import sqlite3
+from datetime import date
+
+from app import database
+from app.benchmarks.comum import banco_temporario, medir, imprimir
+
+REPETICOES = 2000
+
+CONSULTAS = {
+    'get_resumo': ('SELECT COUNT(*) FROM Clientes', ()),
+    'get_estatisticas': (
+        'SELECT COUNT(*), SUM(saldo_montar), SUM(saldo_montar * custo_unitario) '
+        'FROM Remessas WHERE saldo_montar > 0', ()
+    ),
+    'get_totais': (
+        "SELECT SUM(CASE WHEN status = 'Pendente' THEN valor_receber ELSE 0 END) "
+        "FROM Financeiro", ()
+    ),
+    'get_monthly_received': (
+        "SELECT SUM(valor_receber) FROM Financeiro "
+        "WHERE status = 'Recebido' AND banco = ? AND substr(data_recebimento, 1, 7) = ?",
+        ('Caixa', date.today().strftime('%Y-%m'))
+    ),
+}
+
+
+def popular():
+    """Insere uma massa pequena de dados."""
+    with database.conexao() as conn:
+        conn.executemany(
+            'INSERT INTO Clientes (id_cliente, nome) VALUES (?, ?)',
+            [(f'C{i:04d}', f'Cliente {i}') for i in range(200)]
+        )
+        conn.executemany('''
+            INSERT INTO Remessas (id_remessa, id_cliente, modelo, quantidade,
+                                  custo_unitario, saldo_montar, data_criacao)
+            VALUES (?, ?, 'Camiseta', 100, 250, ?, ?)
+        ''', [(f'OP-{i:04d}', f'C{i % 200:04d}', i % 100, date.today().isoformat())
+              for i in range(2000)])
+
+
+def main():
+    with banco_temporario() as caminho:
+        popular()
+        
+        def sem_pool(sql, params):
+            def run():
+                conn = sqlite3.connect(caminho)
+                conn.execute(sql, params).fetchall()
+                conn.close()
+            return run
+        
+        def com_pool(sql, params):
+            def run():
+                with database.conexao() as conn:
+                    conn.execute(sql, params).fetchall()
+            return run
+        
+        resultados = {}
+        for nome, (sql, params) in CONSULTAS.items():
+            resultados[f'{nome} (conexão por chamada)'] = medir(sem_pool(sql, params), REPETICOES)
+            resultados[f'{nome} (pool)'] = medir(com_pool(sql, params), REPETICOES)
+    
+    imprimir('Latência por consulta (ms)', resultados)
+
+
+if __name__ == '__main__':
+    main()
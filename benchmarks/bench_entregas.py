@@ -0,0 +1,46 @@
+"""
+Registro de entregas em lote vs. uma chamada por OP.
+"""
+import time
+
+from app import database
+from app.services import RemessaService
+from app.benchmarks.comum import banco_temporario
+
+OPS = 50
+RODADAS = 20
+
+
+def preparar():
+    """Cria as OPs com saldo suficiente para todas as rodadas."""
+    return RemessaService.criar_lote([
+        {'id_cliente': 'C0001', 'modelo': 'Camiseta', 'quantidade': 1000, 'custo_unitario': 2.5}
+        for _ in range(OPS)
+    ])['ids']
+
+
+def main():
+    print(f"{RODADAS} rodadas de {OPS} entregas")
+    
+    for perfil in database.PERFIS_PRAGMA:
+        with banco_temporario():
+            database.definir_perfil(perfil)
+            ids = preparar()
+            
+            inicio = time.perf_counter()
+            for _ in range(RODADAS):
+                for id_remessa in ids:
+                    RemessaService.registrar_entrega(id_remessa, 1)
+            laco = (time.perf_counter() - inicio) / RODADAS * 1000
+            
+            inicio = time.perf_counter()
+            for _ in range(RODADAS):
+                RemessaService.registrar_entregas([(id_remessa, 1) for id_remessa in ids])
+            lote = (time.perf_counter() - inicio) / RODADAS * 1000
+        
+        print(f"{perfil:<12} laço: {laco:8.2f} ms/rodada   lote: {lote:8.2f} ms/rodada   "
+              f"({laco / lote:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
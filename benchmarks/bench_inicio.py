@@ -0,0 +1,114 @@
+"""
+Custo de importação no início a frio: quebra por módulo (``-X importtime``)
+e tempo total de ``import app.main``, comparado com um orçamento.
+
+Cada medição roda num processo novo. Sai com código 1 se a mediana passar
+do orçamento, para servir de verificação no build.
+
+Uso:
+    python -m app.benchmarks.bench_inicio [--orcamento MS] [--modulo app.main]
+
+O orçamento padrão vem de ``ORCAMENTO_INICIO_MS`` (ambiente) ou
+``ORCAMENTO_MS``.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+ORCAMENTO_MS = 1500.0
+REPETICOES = 5
+MAIS_CAROS = 15
+
+# Módulos que o início não deveria carregar (ficam tardios em main.py)
+TARDIOS = (
+    'kivymd.uix.dialog',
+    'kivymd.uix.snackbar',
+    'kivymd.uix.datatables',
+    'kivymd.uix.pickers',
+    'kivymd.uix.expansionpanel',
+    'kivymd.icon_definitions',
+)
+
+_MEDIR = (
+    "import sys, time\n"
+    "t = time.perf_counter()\n"
+    "import {modulo}\n"
+    "print('%.3f' % ((time.perf_counter() - t) * 1000))\n"
+    "print(','.join(m for m in {tardios!r} if m in sys.modules))\n"
+)
+
+
+def _rodar(modulo: str, *opcoes: str) -> subprocess.CompletedProcess:
+    ambiente = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+    codigo = _MEDIR.format(modulo=modulo, tardios=TARDIOS)
+    return subprocess.run(
+        [sys.executable, *opcoes, '-c', codigo],
+        capture_output=True, text=True, env=ambiente, check=True
+    )
+
+
+def ler_importtime(saida: str) -> List[Tuple[str, int, int]]:
+    """Converte a saída de ``-X importtime`` em (módulo, próprio_us, acumulado_us)."""
+    linhas = []
+    for linha in saida.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, acumulado, nome = linha[len('import time:'):].split('|', 2)
+        linhas.append((nome.strip(), int(proprio), int(acumulado)))
+    return linhas
+
+
+def por_pacote(linhas: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Soma o tempo próprio por pacote de topo (kivy, kivymd, app, ...)."""
+    totais: Dict[str, int] = defaultdict(int)
+    for nome, proprio, _ in linhas:
+        totais[nome.split('.')[0]] += proprio
+    return dict(totais)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--modulo', default='app.main')
+    parser.add_argument('--orcamento', type=float,
+                        default=float(os.environ.get('ORCAMENTO_INICIO_MS', ORCAMENTO_MS)))
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES)
+    args = parser.parse_args()
+
+    # Quebra por módulo
+    detalhe = _rodar(args.modulo, '-X', 'importtime')
+    linhas = ler_importtime(detalhe.stderr)
+    print(f"import {args.modulo}: {len(linhas)} módulos carregados\n")
+    print(f"{'módulo':<50} {'próprio':>10} {'acumulado':>10}")
+    for nome, proprio, acumulado in sorted(linhas, key=lambda l: l[1], reverse=True)[:MAIS_CAROS]:
+        print(f"{nome[:50]:<50} {proprio / 1000:>8.1f}ms {acumulado / 1000:>8.1f}ms")
+
+    print(f"\n{'pacote':<20} {'próprio':>10}")
+    for pacote, proprio in sorted(por_pacote(linhas).items(), key=lambda p: p[1], reverse=True)[:10]:
+        print(f"{pacote:<20} {proprio / 1000:>8.1f}ms")
+
+    # Tempo de parede, sem a sobrecarga do importtime
+    tempos = []
+    carregados = ''
+    for _ in range(args.repeticoes):
+        saida = _rodar(args.modulo).stdout.splitlines()
+        tempos.append(float(saida[0]))
+        carregados = saida[1] if len(saida) > 1 else ''
+
+    if carregados:
+        print(f"\naviso: carregados no início, mas deveriam ser tardios: {carregados}")
+
+    mediana = statistics.median(tempos)
+    print(f"\nimport {args.modulo}: mediana={mediana:.1f} ms  min={min(tempos):.1f} ms  "
+          f"orçamento={args.orcamento:.0f} ms")
+    if mediana > args.orcamento:
+        print("FALHOU: início acima do orçamento")
+        sys.exit(1)
+    print("ok")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Tempo de montagem e RSS de uma lista com 10k linhas: MDList com um
+TwoLineListItem por linha vs. ListaVirtual (RecycleView com dicts).
+
+Precisa de Kivy/KivyMD e de uma janela (roda no desktop ou no aparelho).
+"""
+import gc
+import os
+import sys
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from kivy.base import EventLoop
+from kivymd.app import MDApp
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.list import MDList, TwoLineListItem
+from kivymd.uix.scrollview import MDScrollView
+
+from app.main import ListaVirtual
+
+TOTAL = 10_000
+
+
+def rss_mb() -> float:
+    """RSS atual do processo em MB (Linux/Android)."""
+    with open('/proc/self/statm') as f:
+        paginas = int(f.read().split()[1])
+    return paginas * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+def linhas():
+    return [{'text': f'Cliente {i}', 'secondary_text': f'C{i:05d} | (11) 99999-{i % 10000:04d}'}
+            for i in range(TOTAL)]
+
+
+def montar_mdlist(raiz):
+    scroll = MDScrollView()
+    lista = MDList()
+    for linha in linhas():
+        lista.add_widget(TwoLineListItem(**linha))
+    scroll.add_widget(lista)
+    raiz.add_widget(scroll)
+
+
+def montar_virtual(raiz):
+    lista = ListaVirtual()
+    raiz.add_widget(lista)
+    lista.definir(linhas())
+
+
+def medir(nome, montar, raiz):
+    raiz.clear_widgets()
+    gc.collect()
+    antes = rss_mb()
+    inicio = time.perf_counter()
+    montar(raiz)
+    # Até o layout assentar e o primeiro quadro ser desenhado
+    for _ in range(3):
+        EventLoop.idle()
+    duracao = time.perf_counter() - inicio
+    print(f"{nome:<12} montagem={duracao * 1000:>9.1f} ms  RSS +{rss_mb() - antes:>7.1f} MB")
+
+
+class BenchApp(MDApp):
+    def build(self):
+        return MDBoxLayout()
+    
+    def on_start(self):
+        print(f"{TOTAL} linhas")
+        medir('ListaVirtual', montar_virtual, self.root)
+        medir('MDList', montar_mdlist, self.root)
+        self.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(BenchApp().run())
@@ -0,0 +1,86 @@
+"""
+Tempo e memória para carregar 100k Remessas: construção manual (dataclass
+sem slots + __post_init__) vs. mapeador gerado com dataclass slotted.
+"""
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, date
+from typing import Optional
+
+from app import database
+from app.services import RemessaService
+from app.benchmarks.comum import banco_temporario
+
+TOTAL = 100_000
+
+
+@dataclass
+class RemessaLegada:
+    """Cópia do modelo antigo, para comparação."""
+    id_remessa: str
+    id_cliente: str
+    modelo: str
+    quantidade: int
+    custo_unitario: float
+    saldo_montar: int = 0
+    entregue: int = 0
+    prazo_dias: int = 30
+    data_criacao: str = ""
+    cliente_destino: Optional[str] = None
+    data_prevista: Optional[str] = None
+    status: str = "Em Aberto"
+    
+    def __post_init__(self):
+        if not self.data_criacao:
+            self.data_criacao = datetime.now().strftime('%Y-%m-%d')
+        if self.saldo_montar == 0:
+            self.saldo_montar = self.quantidade
+
+
+def listar_legado():
+    """Reproduz o laço antigo de listar_todos."""
+    with database.conexao() as conn:
+        rows = conn.execute('SELECT * FROM Remessas ORDER BY data_criacao DESC').fetchall()
+    return [RemessaLegada(
+        id_remessa=row[0], id_cliente=row[1], modelo=row[2], quantidade=row[3],
+        custo_unitario=row[4] / 100, saldo_montar=row[5], entregue=row[6], prazo_dias=row[7],
+        data_criacao=row[8], cliente_destino=row[9], data_prevista=row[10], status=row[11]
+    ) for row in rows]
+
+
+def medir_carga(nome, funcao):
+    """Mede tempo e memória retida pela lista carregada."""
+    gc.collect()
+    inicio = time.perf_counter()
+    funcao()
+    duracao = time.perf_counter() - inicio
+    
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcao()
+    atual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    print(f"{nome:<28} {duracao * 1000:>9.1f} ms  retido={atual / 1e6:>7.1f} MB  "
+          f"pico={pico / 1e6:>7.1f} MB  ({len(resultado)} objetos)")
+
+
+def main():
+    with banco_temporario():
+        with database.conexao() as conn:
+            hoje = date.today().isoformat()
+            conn.executemany('''
+                INSERT INTO Remessas (id_remessa, id_cliente, modelo, quantidade, custo_unitario,
+                                      saldo_montar, data_criacao, data_prevista)
+                VALUES (?, ?, 'Camiseta', 100, 250, ?, ?, ?)
+            ''', ((f'OP-{i:06d}', f'C{i % 5000:04d}', i % 100, hoje, hoje) for i in range(TOTAL)))
+        
+        print(f"Carga de {TOTAL} Remessas")
+        medir_carga('manual (sem slots)', listar_legado)
+        medir_carga('mapeador (slots)', RemessaService.listar_todos)
+
+
+if __name__ == '__main__':
+    main()
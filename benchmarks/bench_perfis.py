@@ -0,0 +1,34 @@
+"""
+Latência de escrita (criar OP e registrar entrega) em cada perfil de PRAGMA.
+"""
+from app import database
+from app.services import RemessaService
+from app.benchmarks.comum import banco_temporario, medir, imprimir
+
+REPETICOES = 300
+
+
+def main():
+    resultados = {}
+    
+    for perfil in database.PERFIS_PRAGMA:
+        with banco_temporario():
+            database.definir_perfil(perfil)
+            dados = {'id_cliente': 'C0001', 'modelo': 'Camiseta',
+                     'quantidade': 10, 'custo_unitario': 2.5}
+            criadas = []
+            resultados[f'{perfil}: criar'] = medir(
+                lambda: criadas.append(RemessaService.criar(dados)['id']), REPETICOES
+            )
+            
+            ops = iter(criadas)
+            resultados[f'{perfil}: registrar_entrega'] = medir(
+                lambda: RemessaService.registrar_entrega(next(ops), 5),
+                REPETICOES
+            )
+    
+    imprimir('Latência de escrita por perfil (ms)', resultados)
+
+
+if __name__ == '__main__':
+    main()
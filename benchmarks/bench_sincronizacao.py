@@ -0,0 +1,84 @@
+"""
+Sincronização entre dois aparelhos via ServidorSyncLocal: bytes e tempo da
+carga inicial e de um delta pequeno, comparados ao tamanho do banco inteiro
+(o que o backup copiaria). Confere também que os dois bancos convergem.
+"""
+import os
+import tempfile
+import time
+
+from app import database
+from app.cache import cache_servicos
+from app.services import ClienteService, RemessaService
+from app.sincronizacao import Sincronizador, ServidorSyncLocal
+
+CLIENTES = 2_000
+OPS = 5_000
+ALTERADAS = 50
+TABELAS = ('Clientes', 'Modelos', 'Remessas', 'Financeiro', 'ResumoGeral', 'ResumoCliente', 'ResumoBancoMes')
+
+
+def usar(caminho):
+    database.configurar(caminho)
+    cache_servicos.limpar()
+
+
+def conteudo():
+    with database.conexao() as conn:
+        return {t: conn.execute(f'SELECT * FROM {t} ORDER BY 1, 2').fetchall() for t in TABELAS}
+
+
+def sincronizar(servidor, caminho):
+    usar(caminho)
+    inicio = time.perf_counter()
+    resultado = Sincronizador(servidor).sincronizar()
+    resultado['ms'] = (time.perf_counter() - inicio) * 1000
+    return resultado
+
+
+def rodada(titulo, servidor, a, b):
+    antes = servidor.bytes_recebidos + servidor.bytes_enviados
+    r1 = sincronizar(servidor, a)
+    r2 = sincronizar(servidor, b)
+    r3 = sincronizar(servidor, a)
+    trafego = servidor.bytes_recebidos + servidor.bytes_enviados - antes
+    print(f"{titulo:<28} enviadas={r1['enviadas'] + r2['enviadas'] + r3['enviadas']:>6} "
+          f"aplicadas={r1['aplicadas'] + r2['aplicadas'] + r3['aplicadas']:>6} "
+          f"tráfego={trafego / 1024:>8.1f} KiB  tempo={r1['ms'] + r2['ms'] + r3['ms']:>8.1f} ms")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as pasta:
+        a, b = os.path.join(pasta, 'a.db'), os.path.join(pasta, 'b.db')
+        for caminho in (a, b):
+            usar(caminho)
+            database.init_db()
+        
+        usar(a)
+        ClienteService.cadastrar_lote([{'id_cliente': f'C{i:05d}', 'nome': f'Cliente {i}'} for i in range(CLIENTES)])
+        ops = RemessaService.criar_lote([
+            {'id_cliente': f'C{i % CLIENTES:05d}', 'modelo': 'Camiseta', 'quantidade': 20, 'custo_unitario': 2.5}
+            for i in range(OPS)
+        ])['ids']
+        RemessaService.registrar_entregas([(op, 5) for op in ops])
+        
+        servidor = ServidorSyncLocal()
+        print(f"Banco inteiro (backup): {os.path.getsize(a) / 1024:.1f} KiB")
+        rodada('Carga inicial', servidor, a, b)
+        
+        # A primeira sincronização troca as chaves provisórias das OPs
+        usar(a)
+        ops = [r.id_remessa for r in RemessaService.listar_todos()]
+        RemessaService.registrar_entregas([(op, 1) for op in ops[:ALTERADAS]])
+        rodada(f'Delta ({ALTERADAS} entregas)', servidor, a, b)
+        rodada('Sem alterações', servidor, a, b)
+        
+        usar(a)
+        dados_a = conteudo()
+        usar(b)
+        print('Bancos iguais:', dados_a == conteudo())
+    database.configurar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Tempo até o login ficar interativo: telas sob demanda (padrão) vs. todas
+montadas no build, como era antes. Cada modo roda num processo separado,
+já que o Kivy só abre uma janela por processo.
+
+Precisa de Kivy/KivyMD e de uma janela.
+"""
+import os
+import subprocess
+import sys
+import time
+
+REPETICOES = 3
+
+
+def medir_filho(modo: str):
+    """Roda no processo filho: abre o app e sai no primeiro quadro do login."""
+    inicio = time.perf_counter()
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    
+    from app import main
+    
+    main.TELAS_PRECONSTRUIDAS = ()
+    
+    class App(main.FaccaoApp):
+        def build(self):
+            raiz = super().build()
+            if modo == 'tudo':
+                for nome in list(raiz._fabricas):
+                    raiz.obter(nome)
+            return raiz
+        
+        # FaccaoApp.on_start já agenda primeiro_quadro para o primeiro quadro
+        def primeiro_quadro(self, dt):
+            print(f"{(time.perf_counter() - inicio) * 1000:.1f}")
+            self.stop()
+    
+    App().run()
+
+
+def main():
+    for modo in ('sob-demanda', 'tudo'):
+        tempos = []
+        for _ in range(REPETICOES):
+            saida = subprocess.run(
+                [sys.executable, '-m', 'app.benchmarks.bench_telas', '--filho', modo],
+                capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()
+            tempos.append(float(saida[-1]))
+        print(f"{modo:<12} até o login: min={min(tempos):>8.1f} ms  média={sum(tempos) / len(tempos):>8.1f} ms")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == '--filho':
+        medir_filho(sys.argv[2])
+    else:
+        main()
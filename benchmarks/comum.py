@@ -0,0 +1,51 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+"""
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+from app import database
+
+
+@contextmanager
+def banco_temporario():
+    """Cria um banco vazio num diretório temporário e aponta o pool para ele."""
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'bench.db')
+        database.configurar(caminho)
+        database.init_db()
+        try:
+            yield caminho
+        finally:
+            database.configurar()
+
+
+def medir(func: Callable, repeticoes: int = 1000) -> Dict:
+    """Executa ``func`` várias vezes e retorna as latências em ms."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    
+    tempos.sort()
+    return {
+        'n': repeticoes,
+        'media_ms': statistics.fmean(tempos),
+        'p50_ms': tempos[len(tempos) // 2],
+        'p95_ms': tempos[int(len(tempos) * 0.95) - 1],
+        'max_ms': tempos[-1],
+    }
+
+
+def imprimir(titulo: str, resultados: Dict[str, Dict]):
+    """Imprime uma tabela simples com os resultados."""
+    print(f"\n{titulo}")
+    print(f"{'caso':<40} {'média':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+    for nome, r in resultados.items():
+        print(f"{nome:<40} {r['media_ms']:>9.3f} {r['p50_ms']:>9.3f} "
+              f"{r['p95_ms']:>9.3f} {r['max_ms']:>9.3f}")
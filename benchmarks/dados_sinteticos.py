@@ -0,0 +1,215 @@
+"""
+Gerador de bancos sintéticos com distribuições próximas das reais.
+
+- Clientes com atividade concentrada (poucos clientes têm muitas OPs).
+- OPs criadas nos últimos dois anos, mais densas nos meses recentes; as
+  antigas quase sempre entregues, as recentes parcialmente.
+- Cada entrega vira um título com vencimento em 7 dias; títulos vencidos
+  em geral já recebidos, alguns em atraso (para o aging ter o que mostrar).
+
+Os gatilhos (resumos, busca e diário) são retirados durante a carga e
+recriados no fim; os resumos e o índice de busca são reconstruídos de uma
+vez. O diário de sincronização fica vazio.
+
+Uso direto (gera um arquivo para reaproveitar):
+    python -m app.benchmarks.dados_sinteticos destino.db --escala completa
+"""
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+from app import database
+
+ESCALAS = {
+    'pequena': {'clientes': 500, 'remessas': 20_000, 'titulos': 100_000},
+    'media': {'clientes': 2_000, 'remessas': 80_000, 'titulos': 400_000},
+    'completa': {'clientes': 5_000, 'remessas': 200_000, 'titulos': 1_000_000},
+}
+
+NOMES = ('Ana', 'Bruno', 'Carla', 'Daniel', 'Eduarda', 'Fábio', 'Gabriela', 'Henrique',
+         'Isabela', 'João', 'Larissa', 'Marcos', 'Natália', 'Otávio', 'Patrícia', 'Rafael',
+         'Sabrina', 'Thiago', 'Vanessa', 'Wesley')
+SOBRENOMES = ('Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves',
+              'Pereira', 'Lima', 'Gomes', 'Costa', 'Ribeiro', 'Martins', 'Carvalho',
+              'Araújo', 'Melo', 'Barbosa', 'Rocha', 'Dias', 'Nascimento')
+FORMATOS = ('Confecções', 'Modas', 'Malhas', 'Têxtil', 'Facção', 'Jeans')
+PECAS = ('Camiseta', 'Regata', 'Bermuda', 'Calça', 'Vestido', 'Saia', 'Jaqueta',
+         'Moletom', 'Blusa', 'Macacão')
+VARIANTES = ('Básica', 'Gola V', 'Estampada', 'Infantil')
+
+# Peso de cada banco (preferencial do cliente e destino dos recebimentos)
+BANCOS = {'Caixa': 35, 'Banco do Brasil': 20, 'Itaú': 15, 'Bradesco': 10, 'Nubank': 20}
+
+DIAS_HISTORICO = 730
+VENCIMENTO_DIAS = 7
+
+
+def _escolher_banco(rng: random.Random) -> str:
+    return rng.choices(list(BANCOS), weights=list(BANCOS.values()))[0]
+
+
+def _clientes(rng: random.Random, total: int) -> List[tuple]:
+    largura = max(4, len(str(total)))
+    linhas = []
+    for i in range(1, total + 1):
+        pessoa = f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)}"
+        nome = pessoa if rng.random() < 0.4 else f"{pessoa.split()[1]} {rng.choice(FORMATOS)}"
+        usuario = nome.lower().replace(' ', '.')
+        linhas.append((
+            f"C{i:0{largura}d}", nome,
+            f"({rng.randint(11, 99)}) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+            f"{usuario}{i}@exemplo.com.br" if rng.random() < 0.7 else None,
+            _escolher_banco(rng),
+        ))
+    return linhas
+
+
+def _modelos(rng: random.Random) -> Dict[str, int]:
+    """Custo de cada modelo em centavos (R$ 1,50 a R$ 12,00)."""
+    return {f"{peca} {variante}": rng.randint(150, 1200)
+            for peca in PECAS for variante in VARIANTES}
+
+
+def _partes(rng: random.Random, total: int, partes: int) -> List[int]:
+    """Divide ``total`` em ``partes`` inteiros positivos."""
+    if partes <= 1:
+        return [total]
+    cortes = sorted(rng.sample(range(1, total), partes - 1))
+    return [b - a for a, b in zip([0] + cortes, cortes + [total])]
+
+
+def gerar(conn, clientes: int, remessas: int, titulos: int,
+          semente: int = 42, hoje: date = None) -> Dict[str, int]:
+    """Preenche um banco recém-criado por ``init_db`` e retorna as contagens."""
+    rng = random.Random(semente)
+    hoje = hoje or date.today()
+
+    gatilhos = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND sql IS NOT NULL"
+    ).fetchall()
+    for nome, _ in gatilhos:
+        conn.execute(f'DROP TRIGGER "{nome}"')
+
+    linhas_clientes = _clientes(rng, clientes)
+    conn.executemany(
+        'INSERT INTO Clientes (id_cliente, nome, telefone, email, banco_preferencial) VALUES (?, ?, ?, ?, ?)',
+        linhas_clientes
+    )
+    preferencial = {c[0]: c[4] for c in linhas_clientes}
+
+    modelos = _modelos(rng)
+    conn.executemany('INSERT INTO Modelos (modelo, custo_unitario) VALUES (?, ?)', modelos.items())
+
+    # Atividade por cliente com cauda longa
+    ids_clientes = [c[0] for c in linhas_clientes]
+    pesos_clientes = [1 / (posicao + 1) ** 0.8 for posicao in range(clientes)]
+    nomes_modelos = list(modelos)
+
+    ops = []
+    for n in range(1, remessas + 1):
+        idade = min(int(rng.expovariate(1 / 180)), DIAS_HISTORICO)
+        criacao = hoje - timedelta(days=idade)
+        prazo = rng.choice((15, 30, 30, 45))
+        prevista = criacao + timedelta(days=prazo)
+        quantidade = max(10, int(rng.lognormvariate(5.3, 0.6)))
+
+        if prevista < hoje - timedelta(days=15):
+            entregue = quantidade if rng.random() < 0.95 else int(quantidade * rng.uniform(0.5, 0.95))
+        else:
+            progresso = min(idade / prazo, 1.0)
+            entregue = int(quantidade * progresso * rng.uniform(0.3, 1.0))
+
+        modelo = rng.choice(nomes_modelos)
+        ops.append([f"OP-{n:04d}", rng.choices(ids_clientes, weights=pesos_clientes)[0], modelo,
+                    quantidade, modelos[modelo], entregue, prazo, criacao, prevista])
+
+    # Títulos: cada OP com entrega recebe k títulos, somando ``titulos``
+    com_entrega = [op for op in ops if op[5] > 0]
+    rng.shuffle(com_entrega)
+    base, resto = divmod(titulos, max(len(com_entrega), 1))
+    por_op = [base + (i < resto) for i in range(len(com_entrega))]
+    for i in range(0, len(por_op) - 1, 2):
+        troca = rng.randint(0, max(min(por_op[i], por_op[i + 1]) - 1, 0))
+        por_op[i] += troca
+        por_op[i + 1] -= troca
+
+    financeiro = []
+    for op, k in zip(com_entrega, por_op):
+        if k == 0:
+            continue
+        id_remessa, id_cliente, _, quantidade, custo, entregue, _, criacao, prevista = op
+        if entregue < k:
+            entregue = op[5] = k
+            op[3] = quantidade = max(quantidade, k)
+
+        limite = min(hoje, prevista + timedelta(days=10))
+        janela = max((limite - criacao).days, 0)
+        dias = sorted(rng.randint(0, janela) for _ in range(k))
+        for parte, dia in zip(_partes(rng, entregue, k), dias):
+            entrega = criacao + timedelta(days=dia)
+            vencimento = entrega + timedelta(days=VENCIMENTO_DIAS)
+            recebido = rng.random() < (0.92 if vencimento < hoje else 0.15)
+            if recebido:
+                quando = min(vencimento + timedelta(days=rng.randint(-5, 10)), hoje)
+                banco = preferencial[id_cliente] if rng.random() < 0.7 else _escolher_banco(rng)
+                financeiro.append((id_remessa, parte, parte * custo, entrega.isoformat(),
+                                   vencimento.isoformat(), 'Recebido', banco, quando.isoformat()))
+            else:
+                financeiro.append((id_remessa, parte, parte * custo, entrega.isoformat(),
+                                   vencimento.isoformat(), 'Pendente', None, None))
+
+    conn.executemany('''
+        INSERT INTO Remessas (id_remessa, id_cliente, modelo, quantidade, custo_unitario,
+                              saldo_montar, entregue, prazo_dias, data_criacao, data_prevista, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', ((o[0], o[1], o[2], o[3], o[4], o[3] - o[5], o[5], o[6], o[7].isoformat(), o[8].isoformat(),
+           'Entregue' if o[3] == o[5] else 'Em Aberto') for o in ops))
+    conn.executemany('''
+        INSERT INTO Financeiro (id_remessa, quantidade, valor_receber, data_entrega,
+                                data_vencimento, status, banco, data_recebimento)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', financeiro)
+
+    conn.execute("UPDATE Configuracoes SET valor = ? WHERE chave = 'ultimo_id_remessa'", (str(remessas),))
+
+    for _, sql in gatilhos:
+        conn.execute(sql)
+    database.reconstruir_resumos(conn)
+    database.reconstruir_busca_clientes(conn)
+
+    return {'clientes': clientes, 'modelos': len(modelos), 'remessas': remessas, 'titulos': len(financeiro)}
+
+
+def criar_banco(caminho: str, escala: str = 'completa', semente: int = 42) -> Dict[str, int]:
+    """Cria ``caminho`` com o esquema atual e os dados da escala pedida."""
+    database.configurar(caminho)
+    try:
+        database.init_db()
+        # Só para esta carga; não fica gravado em Configuracoes
+        database.get_gerenciador().definir_perfil('bulk-import')
+        with database.conexao() as conn:
+            return gerar(conn, semente=semente, **ESCALAS[escala])
+    finally:
+        database.configurar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera um banco sintético')
+    parser.add_argument('destino')
+    parser.add_argument('--escala', choices=ESCALAS, default='completa')
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+
+    if os.path.exists(args.destino):
+        parser.error(f'{args.destino} já existe')
+
+    inicio = time.perf_counter()
+    contagens = criar_banco(args.destino, args.escala, args.semente)
+    print(f"{args.destino}: {contagens} em {time.perf_counter() - inicio:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""
+Suíte de tempos dos services sobre um banco sintético, sem Kivy.
+
+Mede cada método público de ClienteService, RemessaService,
+FinanceiroService e BackupService (o cache é limpo antes de cada chamada,
+então o tempo é o da consulta), grava o resultado em JSON e compara com
+uma base gravada antes: sai com código 1 se algum caso ficar mais lento
+que a tolerância.
+
+Uso:
+    python -m app.benchmarks.suite_servicos --escala pequena --gravar-base
+    python -m app.benchmarks.suite_servicos --escala pequena
+
+O banco gerado fica em cache (``--banco``) e cada rodada trabalha numa
+cópia, já que os casos de escrita alteram os dados.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from itertools import count
+from typing import Callable, Dict, Iterator, Optional
+
+from app import database
+from app.cache import cache_servicos
+from app.services import BackupService, ClienteService, FinanceiroService, RemessaService
+from app.benchmarks.dados_sinteticos import ESCALAS, criar_banco
+
+SERVICOS = (ClienteService, RemessaService, FinanceiroService, BackupService)
+
+PASTA_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resultados')
+
+REPETICOES = 20
+REPETICOES_PESADAS = 3
+
+# Regressão: p50 acima de base * (1 + TOLERANCIA) e mais lento em pelo
+# menos PISO_MS (diferenças menores são ruído de medição)
+TOLERANCIA = 0.25
+PISO_MS = 1.0
+
+
+class Caso:
+    """Um método medido: ``chamar`` recebe o valor de ``argumentos``."""
+
+    def __init__(self, chamar: Callable, argumentos: Optional[Iterator] = None,
+                 repeticoes: int = REPETICOES):
+        self.chamar = chamar
+        self.argumentos = argumentos
+        self.repeticoes = repeticoes
+
+    def medir(self) -> Dict:
+        tempos = []
+        for _ in range(self.repeticoes):
+            argumento = next(self.argumentos) if self.argumentos is not None else None
+            cache_servicos.limpar()
+            inicio = time.perf_counter()
+            if self.argumentos is not None:
+                self.chamar(argumento)
+            else:
+                self.chamar()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+
+        tempos.sort()
+        return {
+            'n': len(tempos),
+            'media_ms': round(sum(tempos) / len(tempos), 3),
+            'p50_ms': round(tempos[len(tempos) // 2], 3),
+            'p95_ms': round(tempos[max(int(len(tempos) * 0.95) - 1, 0)], 3),
+            'max_ms': round(tempos[-1], 3),
+        }
+
+
+def _consumir(iterador) -> int:
+    return sum(1 for _ in iterador)
+
+
+def montar_casos() -> Dict[str, Caso]:
+    """Casos com argumentos tirados do próprio banco."""
+    with database.conexao() as conn:
+        maior_cliente = conn.execute(
+            'SELECT id_cliente FROM Remessas GROUP BY id_cliente ORDER BY COUNT(*) DESC LIMIT 1'
+        ).fetchone()[0]
+        ids_clientes = [r[0] for r in conn.execute('SELECT id_cliente FROM Clientes ORDER BY random() LIMIT 200')]
+        abertas = [r[0] for r in conn.execute(
+            'SELECT id_remessa FROM Remessas WHERE saldo_montar >= 10 ORDER BY random() LIMIT 500'
+        )]
+        pendentes = [r[0] for r in conn.execute(
+            "SELECT id FROM Financeiro WHERE status = 'Pendente' ORDER BY random() LIMIT 200"
+        )]
+
+    hoje = date.today()
+    novo = count(1)
+
+    def ciclo(valores):
+        while True:
+            yield from valores
+
+    def clientes_novos(quantidade=1):
+        while True:
+            lote = [{'id_cliente': f'BENCH{next(novo):06d}', 'nome': 'Cliente Bench', 'telefone': '(11) 90000-0000'}
+                    for _ in range(quantidade)]
+            yield lote[0] if quantidade == 1 else lote
+
+    def ops_novas(quantidade=1):
+        while True:
+            lote = [{'id_cliente': maior_cliente, 'modelo': 'Camiseta Básica', 'quantidade': 100,
+                     'custo_unitario': 2.5} for _ in range(quantidade)]
+            yield lote[0] if quantidade == 1 else lote
+
+    def reservar(quantidade):
+        with database.conexao(imediata=True) as conn:
+            return RemessaService.reservar_ids(conn, quantidade)
+
+    lotes_entrega = ciclo([[(id_remessa, 1) for id_remessa in abertas[i:i + 50]] for i in range(0, len(abertas), 50)])
+    pesada = REPETICOES_PESADAS
+
+    return {
+        'ClienteService.listar_todos': Caso(ClienteService.listar_todos),
+        'ClienteService.buscar_por_id': Caso(ClienteService.buscar_por_id, ciclo(ids_clientes)),
+        'ClienteService.buscar': Caso(ClienteService.buscar, ciclo(['sil', 'mod', 'ana', 'c00', 'rocha mal'])),
+        'ClienteService.cadastrar': Caso(ClienteService.cadastrar, clientes_novos()),
+        'ClienteService.cadastrar_lote': Caso(ClienteService.cadastrar_lote, clientes_novos(100), pesada),
+        'ClienteService.get_resumo': Caso(ClienteService.get_resumo),
+
+        'RemessaService.listar_todos': Caso(RemessaService.listar_todos, repeticoes=pesada),
+        'RemessaService.listar_pagina': Caso(lambda: RemessaService.listar_pagina(status='Em Aberto', limite=50)),
+        'RemessaService.iter_todos': Caso(lambda: _consumir(RemessaService.iter_todos(id_cliente=maior_cliente)),
+                                          repeticoes=pesada),
+        'RemessaService.get_overdue': Caso(RemessaService.get_overdue, repeticoes=pesada),
+        'RemessaService.reservar_ids': Caso(reservar, ciclo([1, 100])),
+        'RemessaService.criar': Caso(RemessaService.criar, ops_novas()),
+        'RemessaService.criar_lote': Caso(RemessaService.criar_lote, ops_novas(100), pesada),
+        'RemessaService.registrar_entrega': Caso(lambda op: RemessaService.registrar_entrega(op, 1), ciclo(abertas)),
+        'RemessaService.registrar_entregas': Caso(RemessaService.registrar_entregas, lotes_entrega, pesada),
+        'RemessaService.get_estatisticas': Caso(RemessaService.get_estatisticas),
+
+        'FinanceiroService.get_all': Caso(lambda: FinanceiroService.get_all(id_cliente=maior_cliente),
+                                          repeticoes=pesada),
+        'FinanceiroService.get_pagina': Caso(lambda: FinanceiroService.get_pagina(status='Pendente', limite=50)),
+        'FinanceiroService.iter_all': Caso(lambda: _consumir(FinanceiroService.iter_all(status='Pendente')),
+                                           repeticoes=pesada),
+        'FinanceiroService.get_totais': Caso(FinanceiroService.get_totais, ciclo([None, maior_cliente])),
+        'FinanceiroService.get_monthly_received': Caso(
+            lambda: FinanceiroService.get_monthly_received('Caixa', hoje.year, hoje.month)),
+        'FinanceiroService.get_matriz_bancos': Caso(FinanceiroService.get_matriz_bancos),
+        'FinanceiroService.get_aging': Caso(FinanceiroService.get_aging, ciclo([None, maior_cliente])),
+        'FinanceiroService.liquidar': Caso(lambda fin_id: FinanceiroService.liquidar(fin_id, 'Caixa'),
+                                           iter(pendentes)),
+
+        'BackupService.backup': Caso(lambda: BackupService.backup(), repeticoes=1),
+        'BackupService.listar': Caso(BackupService.listar),
+    }
+
+
+def metodos_publicos():
+    """Nomes ``Classe.metodo`` de todos os métodos públicos dos services medidos."""
+    return [f'{cls.__name__}.{nome}' for cls in SERVICOS
+            for nome, atributo in vars(cls).items()
+            if not nome.startswith('_') and isinstance(atributo, staticmethod)]
+
+
+def comparar(atual: Dict, base: Dict, tolerancia: float = TOLERANCIA) -> list:
+    """Lista (caso, base_ms, atual_ms, variação) dos casos que regrediram."""
+    regressoes = []
+    for nome, medida in atual['resultados'].items():
+        anterior = base['resultados'].get(nome)
+        if anterior is None:
+            continue
+        antes, agora = anterior['p50_ms'], medida['p50_ms']
+        if agora > antes * (1 + tolerancia) and agora - antes >= PISO_MS:
+            regressoes.append((nome, antes, agora, agora / antes - 1 if antes else float('inf')))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--escala', choices=ESCALAS, default='completa')
+    parser.add_argument('--banco', help='banco sintético em cache (gerado se não existir)')
+    parser.add_argument('--saida', help='arquivo JSON do resultado')
+    parser.add_argument('--base', help='base para comparação')
+    parser.add_argument('--gravar-base', action='store_true', help='grava o resultado como a nova base')
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA)
+    parser.add_argument('--filtro', default='', help='só os casos que contêm este texto')
+    args = parser.parse_args()
+
+    banco = args.banco or os.path.join(tempfile.gettempdir(), f'faccao-sintetico-{args.escala}.db')
+    base = args.base or os.path.join(PASTA_RESULTADOS, f'base-{args.escala}.json')
+    saida = args.saida or os.path.join(PASTA_RESULTADOS, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{args.escala}.json")
+
+    if not os.path.exists(banco):
+        print(f"Gerando banco sintético ({args.escala}) em {banco}...")
+        inicio = time.perf_counter()
+        print(f"  {criar_banco(banco, args.escala)} em {time.perf_counter() - inicio:.1f} s")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        copia = os.path.join(pasta, 'suite.db')
+        shutil.copyfile(banco, copia)
+        database.configurar(copia)
+        try:
+            database.init_db()
+            casos = montar_casos()
+            faltando = [m for m in metodos_publicos() if m not in casos]
+            if faltando:
+                print(f"aviso: métodos sem caso na suíte: {', '.join(faltando)}")
+
+            resultados = {}
+            print(f"\n{'caso':<42} {'n':>3} {'média':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+            for nome, caso in casos.items():
+                if args.filtro not in nome:
+                    continue
+                r = resultados[nome] = caso.medir()
+                print(f"{nome:<42} {r['n']:>3} {r['media_ms']:>9.2f} {r['p50_ms']:>9.2f} "
+                      f"{r['p95_ms']:>9.2f} {r['max_ms']:>9.2f}")
+        finally:
+            database.configurar()
+
+    atual = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'escala': args.escala,
+        'contagens': ESCALAS[args.escala],
+        'python': sys.version.split()[0],
+        'sqlite': sqlite3.sqlite_version,
+        'plataforma': platform.platform(),
+        'resultados': resultados,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(atual, f, ensure_ascii=False, indent=1)
+    print(f"\nResultado: {saida}")
+
+    if args.gravar_base:
+        os.makedirs(os.path.dirname(os.path.abspath(base)), exist_ok=True)
+        shutil.copyfile(saida, base)
+        print(f"Base gravada: {base}")
+        return
+
+    if not os.path.exists(base):
+        print(f"Sem base em {base}; rode com --gravar-base para criar uma")
+        return
+
+    with open(base, encoding='utf-8') as f:
+        anterior = json.load(f)
+    regressoes = comparar(atual, anterior, args.tolerancia)
+    print(f"Comparado com {base} ({anterior['data']}): {len(regressoes)} regressões")
+    for nome, antes, agora, variacao in regressoes:
+        print(f"  {nome:<42} {antes:>9.2f} -> {agora:>9.2f} ms  (+{variacao:.0%})")
+    if regressoes:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
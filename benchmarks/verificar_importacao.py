@@ -0,0 +1,86 @@
+"""
+Falha se a camada de dados importar o Kivy ou passar do orçamento de tempo.
+
+``database``, ``models``, ``services`` e os módulos que dependem só deles
+precisam carregar num processo Python puro (workers, scripts, testes),
+sem interface e sem Kivy instalado. Cada medição roda num processo novo.
+
+Uso:
+    python -m app.benchmarks.verificar_importacao [--orcamento MS]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+from app.benchmarks.bench_inicio import ler_importtime
+
+MODULOS = (
+    'app.database',
+    'app.models',
+    'app.services',
+    'app.cache',
+    'app.metricas',
+    'app.backup',
+    'app.sincronizacao',
+    'app.importacao',
+)
+
+# Pacotes de interface/plataforma que a camada de dados não pode carregar
+PROIBIDOS = ('kivy', 'kivymd', 'android', 'jnius')
+
+ORCAMENTO_MS = 150.0
+REPETICOES = 5
+
+_MEDIR = (
+    "import sys, time\n"
+    "t = time.perf_counter()\n"
+    "{importacoes}\n"
+    "print('%.3f' % ((time.perf_counter() - t) * 1000))\n"
+    "print(','.join(sorted(m for m in sys.modules if m.split('.')[0] in {proibidos!r})))\n"
+)
+
+
+def _rodar(*opcoes: str) -> subprocess.CompletedProcess:
+    codigo = _MEDIR.format(importacoes='\n'.join(f'import {m}' for m in MODULOS), proibidos=PROIBIDOS)
+    return subprocess.run([sys.executable, *opcoes, '-c', codigo], capture_output=True, text=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--orcamento', type=float, default=ORCAMENTO_MS)
+    args = parser.parse_args()
+
+    falhas = []
+    tempos = []
+    for _ in range(REPETICOES):
+        processo = _rodar()
+        if processo.returncode != 0:
+            print(processo.stderr)
+            print("[FALHA] a camada de dados não importa num processo sem interface")
+            sys.exit(1)
+        tempo, carregados = (processo.stdout.splitlines() + [''])[:2]
+        tempos.append(float(tempo))
+
+    if carregados:
+        falhas.append(f"importou {carregados}")
+        # Quem puxou: os módulos da camada de dados na cadeia até o proibido
+        for nome, _, acumulado in ler_importtime(_rodar('-X', 'importtime').stderr):
+            if nome.split('.')[0] in PROIBIDOS and nome.count('.') == 0:
+                print(f"  {nome}: {acumulado / 1000:.1f} ms acumulados")
+
+    mediana = statistics.median(tempos)
+    if mediana > args.orcamento:
+        falhas.append(f"mediana {mediana:.1f} ms acima do orçamento de {args.orcamento:.0f} ms")
+
+    print(f"import {', '.join(MODULOS)}")
+    print(f"mediana={mediana:.1f} ms  min={min(tempos):.1f} ms  orçamento={args.orcamento:.0f} ms")
+    for falha in falhas:
+        print(f"[FALHA] {falha}")
+    if falhas:
+        sys.exit(1)
+    print("[OK] camada de dados sem Kivy")
+
+
+if __name__ == '__main__':
+    main()
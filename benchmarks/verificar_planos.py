@@ -0,0 +1,117 @@
+"""
+Verifica o plano de execução (EXPLAIN QUERY PLAN) das consultas dos services.
+
+Chama cada método de leitura com as combinações de filtros usadas pelas
+telas, captura o SQL executado e falha (exit 1) se alguma consulta fizer
+varredura completa de tabela ou ordenar a tabela inteira numa B-tree
+temporária (ordenar um subconjunto já filtrado por índice é aceitável).
+
+Uso: python -m app.benchmarks.verificar_planos
+"""
+import sys
+from datetime import date
+from typing import Callable, List, Tuple
+
+from app import database
+from app.cache import cache_servicos
+from app.services import ClienteService, RemessaService, FinanceiroService, DashboardService
+from app.benchmarks.comum import banco_temporario
+
+HOJE = date.today()
+
+# (nome, chamada) de cada caminho de leitura que deve usar índice
+CHAMADAS: List[Tuple[str, Callable]] = [
+    ('ClienteService.listar_todos', lambda: ClienteService.listar_todos()),
+    ('ClienteService.buscar_por_id', lambda: ClienteService.buscar_por_id('C0001')),
+    ('ClienteService.buscar', lambda: ClienteService.buscar('cli 1')),
+    ('RemessaService.listar_todos', lambda: RemessaService.listar_todos()),
+    ('RemessaService.listar_todos(cliente)', lambda: RemessaService.listar_todos(id_cliente='C0001')),
+    ('RemessaService.listar_todos(status)', lambda: RemessaService.listar_todos(status='Em Aberto')),
+    ('RemessaService.listar_todos(cliente, status)',
+     lambda: RemessaService.listar_todos(id_cliente='C0001', status='Em Aberto')),
+    ('RemessaService.listar_pagina', lambda: RemessaService.listar_pagina(
+        continuacao=RemessaService.listar_pagina(limite=5)['continuacao'])),
+    ('RemessaService.listar_pagina(cliente)', lambda: RemessaService.listar_pagina(
+        id_cliente='C0001', continuacao=RemessaService.listar_pagina(id_cliente='C0001', limite=5)['continuacao'])),
+    ('RemessaService.get_overdue', lambda: RemessaService.get_overdue()),
+    ('RemessaService.get_estatisticas', lambda: RemessaService.get_estatisticas()),
+    ('FinanceiroService.get_all', lambda: FinanceiroService.get_all()),
+    ('FinanceiroService.get_all(cliente)', lambda: FinanceiroService.get_all(id_cliente='C0001')),
+    ('FinanceiroService.get_all(status)', lambda: FinanceiroService.get_all(status='Pendente')),
+    ('FinanceiroService.get_all(cliente, status)',
+     lambda: FinanceiroService.get_all(id_cliente='C0001', status='Pendente')),
+    ('FinanceiroService.get_pagina', lambda: FinanceiroService.get_pagina(
+        continuacao=FinanceiroService.get_pagina(limite=5)['continuacao'])),
+    ('FinanceiroService.get_pagina(status)', lambda: FinanceiroService.get_pagina(
+        status='Pendente', continuacao=FinanceiroService.get_pagina(status='Pendente', limite=5)['continuacao'])),
+    ('FinanceiroService.get_totais', lambda: FinanceiroService.get_totais()),
+    ('FinanceiroService.get_totais(cliente)', lambda: FinanceiroService.get_totais(id_cliente='C0001')),
+    ('FinanceiroService.get_monthly_received',
+     lambda: FinanceiroService.get_monthly_received('Caixa', HOJE.year, HOJE.month)),
+    ('FinanceiroService.get_aging', lambda: FinanceiroService.get_aging()),
+    ('FinanceiroService.get_matriz_bancos', lambda: FinanceiroService.get_matriz_bancos()),
+    ('DashboardService.snapshot', lambda: DashboardService.snapshot(top_n=5)),
+]
+
+
+def popular():
+    """Dados mínimos para que as páginas tenham continuação."""
+    ClienteService.cadastrar_lote([{'id_cliente': f'C{i:04d}', 'nome': f'Cliente {i}'} for i in range(5)])
+    ops = RemessaService.criar_lote([
+        {'id_cliente': f'C{i % 5:04d}', 'modelo': 'Camiseta', 'quantidade': 10, 'custo_unitario': 2.5}
+        for i in range(40)
+    ])['ids']
+    RemessaService.registrar_entregas([(op, 5) for op in ops])
+
+
+def problemas_do_plano(conn, sql: str) -> List[str]:
+    """Retorna as linhas do plano que indicam varredura ou ordenação.
+
+    Varreduras de CTEs e subconsultas (já limitadas) não contam.
+    """
+    tabelas = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    detalhes = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}')]
+    detalhes = [d for d in detalhes if not (d.startswith('SCAN') and d.split()[1] not in tabelas)]
+    varre = any(d.startswith('SCAN') for d in detalhes)
+    ruins = []
+    for detalhe in detalhes:
+        if detalhe.startswith('SCAN') and 'INDEX' not in detalhe:
+            ruins.append(detalhe)
+        elif 'USE TEMP B-TREE' in detalhe and varre:
+            ruins.append(detalhe)
+    return ruins
+
+
+def main() -> int:
+    with banco_temporario():
+        database.configurar(database.get_gerenciador().caminho, tamanho_pool=1)
+        database.init_db()
+        popular()
+        
+        capturadas = []
+        with database.conexao() as conn:
+            conn.set_trace_callback(capturadas.append)
+        
+        falhas = 0
+        for nome, chamada in CHAMADAS:
+            capturadas.clear()
+            cache_servicos.limpar()
+            chamada()
+            consultas = [sql for sql in capturadas if sql.lstrip().upper().startswith(('SELECT', 'WITH'))]
+            
+            with database.conexao() as conn:
+                conn.set_trace_callback(None)
+                for sql in consultas:
+                    ruins = problemas_do_plano(conn, sql)
+                    if ruins:
+                        falhas += 1
+                        print(f"[FALHA] {nome}: {'; '.join(ruins)}")
+                    else:
+                        print(f"[OK] {nome}")
+                conn.set_trace_callback(capturadas.append)
+    
+    return 1 if falhas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
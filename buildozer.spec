@@ -22,7 +22,7 @@ source.include_patterns = assets/*, app/*, kv/*
 #source.exclude_exts = spec
 
 # (list) List of directory to exclude (let empty to not exclude anything)
-source.exclude_dirs = tests, bin, venv, __pycache__, .git
+source.exclude_dirs = tests, benchmarks, bin, venv, __pycache__, .git
 
 # (list) List of exclusions using pattern matching
 #source.exclude_patterns = license,images/*/*.jpg
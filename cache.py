@@ -0,0 +1,127 @@
+"""
+Cache de leitura dos services (TTL + LRU) com invalidação por tags.
+"""
+import copy
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple, Union
+
+CAPACIDADE = 256
+TTL_PADRAO = 30.0
+
+Tags = Union[Tuple[str, ...], Callable[..., Iterable[str]]]
+
+
+class CacheLeitura:
+    """Cache LRU com expiração por tempo.
+
+    Cada entrada carrega tags (ex.: ``'financeiro'``, ``'financeiro:C001'``);
+    as escritas invalidam só as tags que afetam. Uma leitura que começou
+    antes de uma invalidação não grava o resultado (evita guardar dado velho).
+    """
+
+    def __init__(self, capacidade: int = CAPACIDADE, ttl: float = TTL_PADRAO,
+                 relogio: Callable[[], float] = time.monotonic):
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self.relogio = relogio
+        self._entradas: "OrderedDict[Hashable, Tuple[float, frozenset, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._geracao = 0
+        self._contadores = dict.fromkeys(
+            ('acertos', 'falhas', 'expirados', 'despejos', 'invalidacoes'), 0
+        )
+
+    def obter(self, chave: Hashable) -> Tuple[bool, object, int]:
+        """Retorna (achou, valor, geração atual)."""
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None:
+                expira, _, valor = entrada
+                if expira > self.relogio():
+                    self._entradas.move_to_end(chave)
+                    self._contadores['acertos'] += 1
+                    return True, valor, self._geracao
+                del self._entradas[chave]
+                self._contadores['expirados'] += 1
+            self._contadores['falhas'] += 1
+            return False, None, self._geracao
+
+    def guardar(self, chave: Hashable, valor, tags: Iterable[str],
+                ttl: Optional[float] = None, geracao: Optional[int] = None):
+        """Guarda o valor, a menos que tenha havido invalidação desde ``geracao``."""
+        with self._lock:
+            if geracao is not None and geracao != self._geracao:
+                return
+            expira = self.relogio() + (self.ttl if ttl is None else ttl)
+            self._entradas[chave] = (expira, frozenset(tags), valor)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.capacidade:
+                self._entradas.popitem(last=False)
+                self._contadores['despejos'] += 1
+
+    def invalidar(self, *tags: str):
+        """Remove as entradas que tenham qualquer uma das tags."""
+        alvo = set(tags)
+        with self._lock:
+            self._geracao += 1
+            for chave in [c for c, (_, t, _) in self._entradas.items() if t & alvo]:
+                del self._entradas[chave]
+                self._contadores['invalidacoes'] += 1
+
+    def limpar(self):
+        """Esvazia o cache (os contadores são mantidos)."""
+        with self._lock:
+            self._geracao += 1
+            self._entradas.clear()
+
+    def estatisticas(self) -> Dict:
+        """Retorna os contadores de acerto/falha e o tamanho atual."""
+        with self._lock:
+            dados = dict(self._contadores, tamanho=len(self._entradas))
+        consultas = dados['acertos'] + dados['falhas']
+        dados['taxa_acerto'] = dados['acertos'] / consultas if consultas else 0.0
+        return dados
+
+
+cache_servicos = CacheLeitura()
+
+
+def cacheado(tags: Tags, ttl: Optional[float] = None, cache: CacheLeitura = None):
+    """Decora um método de leitura para usar o cache.
+
+    A chave é o nome qualificado mais os argumentos normalizados pela
+    assinatura (``f()`` e ``f(x=None)`` caem na mesma entrada). ``tags`` é
+    uma tupla fixa ou uma função que recebe os mesmos argumentos.
+    """
+    def decorador(func):
+        assinatura = inspect.signature(func)
+        
+        @functools.wraps(func)
+        def envolvido(*args, **kwargs):
+            alvo = cache or cache_servicos
+            argumentos = assinatura.bind(*args, **kwargs)
+            argumentos.apply_defaults()
+            chave = (func.__qualname__,) + tuple(argumentos.arguments.items())
+            
+            achou, valor, geracao = alvo.obter(chave)
+            if not achou:
+                valor = func(*args, **kwargs)
+                tags_entrada = tags(*args, **kwargs) if callable(tags) else tags
+                alvo.guardar(chave, valor, tags_entrada, ttl, geracao)
+            return _copia(valor)
+        
+        return envolvido
+    return decorador
+
+
+def _copia(valor):
+    """Cópia profunda para o chamador não alterar o cache.
+
+    Os resultados têm listas e dicts aninhados (alertas do snapshot,
+    clientes do aging), que uma cópia rasa deixaria compartilhados.
+    """
+    return copy.deepcopy(valor)
@@ -2,24 +2,399 @@
 Banco de dados para mobile.
 """
 import os
+import queue
+import re
 import sqlite3
-from kivy.utils import platform
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .metricas import ConexaoMedida, metricas
+from .models import Dinheiro
+from .rastreamento import get_rastreador
 
 DB_NAME = "faccao_mobile.db"
 
+# Pool de conexões
+TAMANHO_POOL = 4
+TIMEOUT_POOL = 10.0
 
-def get_db_path():
-    """Retorna o caminho do banco de dados."""
-    if platform == 'android':
+# Perfis de PRAGMA por conexão (o journal_mode WAL é gravado no arquivo
+# pelo init_db). cache_size negativo é em KiB.
+#
+# Em WAL, synchronous NORMAL só faz fsync no checkpoint, não em cada
+# commit: um crash do app não perde nada, e uma queda de energia pode
+# desfazer só os últimos commits (o banco continua íntegro). FULL custaria
+# um fsync por criar/registrar_entrega. bulk-import (OFF) pode corromper o
+# banco numa queda de energia e só serve para cargas que dá para refazer.
+PERFIS_PRAGMA = {
+    'mobile-safe': {
+        'synchronous': 'NORMAL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000,
+    },
+    'throughput': {
+        'synchronous': 'NORMAL',
+        'cache_size': -8000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    'bulk-import': {
+        'synchronous': 'OFF',
+        'cache_size': -32000,
+        'mmap_size': 128 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+    },
+}
+PERFIL_PADRAO = 'mobile-safe'
+
+
+# Quem decide onde fica o arquivo do banco. None usa caminho_padrao;
+# ferramentas e workers podem trocar com definir_provedor_caminho.
+_provedor_caminho: Optional[Callable[[], str]] = None
+
+
+def no_android() -> bool:
+    """Detecta o Android pelas variáveis que o python-for-android define.
+
+    São as mesmas que ``kivy.utils.platform`` consulta, sem importar o Kivy.
+    """
+    return (os.environ.get('KIVY_BUILD') == 'android'
+            or 'P4A_BOOTSTRAP' in os.environ
+            or 'ANDROID_ARGUMENT' in os.environ)
+
+
+def caminho_padrao() -> str:
+    """No Android, a pasta privada do app; nos demais, DB_NAME na pasta atual."""
+    if no_android():
         from android.storage import app_storage_path
         return os.path.join(app_storage_path(), DB_NAME)
-    else:
-        return DB_NAME
+    return DB_NAME
+
+
+def definir_provedor_caminho(provedor: Optional[Callable[[], str]]):
+    """Troca a função que resolve o caminho do banco (None volta ao padrão).
+
+    Vale para as conexões abertas depois; use ``configurar()`` para
+    descartar as que já estão no pool.
+    """
+    global _provedor_caminho
+    _provedor_caminho = provedor
+
+
+def get_db_path():
+    """Retorna o caminho do banco de dados."""
+    return (_provedor_caminho or caminho_padrao)()
+
+
+class GerenciadorConexoes:
+    """Pool de conexões SQLite de longa duração.
+
+    As conexões ficam abertas num pool limitado e são emprestadas por
+    ``conexao()``. Dentro de um bloco a thread usa sempre a mesma conexão:
+    blocos aninhados reaproveitam a conexão da thread e viram SAVEPOINTs.
+    """
+
+    def __init__(self, caminho: Optional[str] = None, tamanho: int = TAMANHO_POOL,
+                 timeout: float = TIMEOUT_POOL, perfil: str = PERFIL_PADRAO):
+        self.caminho = caminho
+        self.tamanho = tamanho
+        self.timeout = timeout
+        self.perfil = perfil
+        self._geracao_perfil = 0
+        self._perfil_aplicado = {}
+        self._livres = queue.LifoQueue()
+        self._vagas = threading.BoundedSemaphore(tamanho)
+        self._local = threading.local()
+        self._fechado = False
+
+    def _abrir(self) -> sqlite3.Connection:
+        """Abre uma nova conexão física."""
+        return sqlite3.connect(
+            self.caminho or get_db_path(),
+            timeout=self.timeout,
+            check_same_thread=False,
+            factory=ConexaoMedida if metricas.ativo else sqlite3.Connection
+        )
+
+    def _obter(self) -> sqlite3.Connection:
+        """Pega uma conexão livre ou abre outra se houver vaga."""
+        if self._fechado:
+            raise sqlite3.ProgrammingError('Pool de conexões fechado')
+        try:
+            return self._preparar(self._livres.get_nowait())
+        except queue.Empty:
+            pass
+        
+        if self._vagas.acquire(blocking=False):
+            try:
+                return self._preparar(self._abrir())
+            except Exception:
+                self._vagas.release()
+                raise
+        
+        try:
+            return self._preparar(self._livres.get(timeout=self.timeout))
+        except queue.Empty:
+            raise sqlite3.OperationalError('Pool de conexões esgotado')
+
+    def _preparar(self, conn: sqlite3.Connection) -> sqlite3.Connection:
+        """Aplica o perfil de PRAGMA se a conexão estiver desatualizada."""
+        geracao = self._geracao_perfil
+        if self._perfil_aplicado.get(id(conn)) != geracao:
+            for pragma, valor in PERFIS_PRAGMA[self.perfil].items():
+                conn.execute(f'PRAGMA {pragma} = {valor}')
+            self._perfil_aplicado[id(conn)] = geracao
+        return conn
+
+    def definir_perfil(self, perfil: str):
+        """Troca o perfil; cada conexão o recebe no próximo empréstimo."""
+        if perfil not in PERFIS_PRAGMA:
+            raise ValueError(f'Perfil desconhecido: {perfil}')
+        self.perfil = perfil
+        self._geracao_perfil += 1
+
+    def _devolver(self, conn: sqlite3.Connection):
+        """Devolve a conexão ao pool (ou fecha, se o pool foi encerrado ou
+        se a coleta de métricas mudou desde que ela foi aberta)."""
+        if conn.in_transaction:
+            conn.rollback()
+        if self._fechado or isinstance(conn, ConexaoMedida) != metricas.ativo:
+            self._perfil_aplicado.pop(id(conn), None)
+            conn.close()
+            self._vagas.release()
+        else:
+            self._livres.put(conn)
+
+    @contextmanager
+    def conexao(self, imediata: bool = False):
+        """Empresta uma conexão com commit ao sair e rollback em erro.
+
+        Com ``imediata=True`` o bloco externo abre ``BEGIN IMMEDIATE``,
+        reservando a escrita logo no início (em blocos aninhados é ignorado).
+        """
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        
+        if conn is not None:
+            # Bloco aninhado: mesma conexão, protegido por SAVEPOINT
+            local.nivel += 1
+            savepoint = f'sp_{local.nivel}'
+            conn.execute(f'SAVEPOINT {savepoint}')
+            try:
+                yield conn
+                conn.execute(f'RELEASE {savepoint}')
+            except BaseException:
+                conn.execute(f'ROLLBACK TO {savepoint}')
+                conn.execute(f'RELEASE {savepoint}')
+                raise
+            finally:
+                local.nivel -= 1
+            return
+        
+        conn = self._obter()
+        local.conn = conn
+        local.nivel = 0
+        try:
+            if imediata:
+                conn.execute('BEGIN IMMEDIATE')
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            local.conn = None
+            self._devolver(conn)
+
+    def fechar(self):
+        """Fecha as conexões livres; as emprestadas fecham ao voltar."""
+        self._fechado = True
+        self.reciclar()
+
+    def reciclar(self):
+        """Fecha as conexões livres; as próximas são abertas de novo."""
+        while True:
+            try:
+                conn = self._livres.get_nowait()
+            except queue.Empty:
+                break
+            self._perfil_aplicado.pop(id(conn), None)
+            conn.close()
+            self._vagas.release()
+
+
+_gerenciador: Optional[GerenciadorConexoes] = None
+_gerenciador_lock = threading.Lock()
+
+
+def get_gerenciador() -> GerenciadorConexoes:
+    """Retorna o gerenciador de conexões global."""
+    global _gerenciador
+    if _gerenciador is None:
+        with _gerenciador_lock:
+            if _gerenciador is None:
+                _gerenciador = GerenciadorConexoes()
+    return _gerenciador
+
+
+def configurar(caminho: Optional[str] = None, tamanho_pool: int = TAMANHO_POOL) -> GerenciadorConexoes:
+    """Recria o gerenciador global (ex.: apontando para outro arquivo)."""
+    global _gerenciador
+    with _gerenciador_lock:
+        if _gerenciador is not None:
+            _gerenciador.fechar()
+        _gerenciador = GerenciadorConexoes(caminho, tamanho_pool)
+    return _gerenciador
+
+
+def conexao(imediata: bool = False):
+    """Empresta uma conexão do pool global (context manager)."""
+    return get_gerenciador().conexao(imediata)
+
+
+def reservar_sequencia(conn: sqlite3.Connection, chave: str, quantidade: int = 1) -> range:
+    """Reserva ``quantidade`` números consecutivos do contador ``chave``.
+
+    O incremento é um único UPDATE, então duas transações nunca recebem o
+    mesmo bloco. Use dentro de ``conexao(imediata=True)`` para que o bloco
+    seja descartado junto com a transação em caso de erro.
+    """
+    if quantidade < 1:
+        raise ValueError('quantidade deve ser >= 1')
+    
+    conn.execute(
+        'UPDATE Configuracoes SET valor = CAST(valor AS INTEGER) + ? WHERE chave = ?',
+        (quantidade, chave)
+    )
+    row = conn.execute('SELECT valor FROM Configuracoes WHERE chave = ?', (chave,)).fetchone()
+    if row is None:
+        raise KeyError(f'Contador inexistente: {chave}')
+    
+    fim = int(row[0])
+    return range(fim - quantidade + 1, fim + 1)
+
+
+# Chaves criadas num aparelho não podem colidir com as de outro. O servidor
+# de sincronização dá a cada aparelho um número único (SyncContexto.numero):
+# as OPs levam o sufixo ``N<número>`` e os ids de Financeiro ficam na faixa
+# dele (bits altos = número, bits baixos = contador local). Até o primeiro
+# contato com o servidor o aparelho usa a identidade provisória, e
+# ``registrar_aparelho`` troca essas chaves pelas definitivas.
+BITS_CONTADOR_FINANCEIRO = 40
+# 23 bits: a base mais o contador continuam abaixo de 2**63
+NUMERO_PROVISORIO = (1 << 23) - 1
+SUFIXO_PROVISORIO = 'P'
+
+
+def numero_aparelho(conn: sqlite3.Connection) -> Optional[int]:
+    """Número dado pelo servidor a este aparelho, ou None se ainda não houver."""
+    return conn.execute('SELECT numero FROM SyncContexto WHERE id = 1').fetchone()[0]
+
+
+def identidade_aparelho(conn: sqlite3.Connection) -> Tuple[str, int]:
+    """Retorna (sufixo das OPs, base dos ids de Financeiro) deste aparelho."""
+    numero = numero_aparelho(conn)
+    if numero is None:
+        return SUFIXO_PROVISORIO, NUMERO_PROVISORIO << BITS_CONTADOR_FINANCEIRO
+    return f'N{numero}', numero << BITS_CONTADOR_FINANCEIRO
+
+
+def registrar_aparelho(conn: sqlite3.Connection, numero: int):
+    """Grava o número dado pelo servidor e troca as chaves provisórias.
+
+    Roda antes do primeiro envio, então as chaves provisórias nunca saíram
+    do aparelho: as linhas mudam de chave e o diário fica só com as novas.
+    """
+    if not 0 < numero < NUMERO_PROVISORIO:
+        raise ValueError(f'Número de aparelho inválido: {numero}')
+    
+    provisoria = NUMERO_PROVISORIO << BITS_CONTADOR_FINANCEIRO
+    conn.execute('UPDATE SyncContexto SET numero = ? WHERE id = 1', (numero,))
+    sufixo, base = identidade_aparelho(conn)
+    
+    for tabela in ('Remessas', 'Financeiro'):
+        conn.execute(f"""
+            UPDATE {tabela} SET id_remessa = substr(id_remessa, 1, length(id_remessa) - 1) || ?
+            WHERE id_remessa LIKE 'OP-%-{SUFIXO_PROVISORIO}'
+        """, (sufixo,))
+    conn.execute('UPDATE Financeiro SET id = id - ? + ? WHERE id >= ?', (provisoria, base, provisoria))
+    conn.execute(f"""
+        DELETE FROM Alteracoes
+        WHERE (tabela = 'Remessas' AND chave LIKE 'OP-%-{SUFIXO_PROVISORIO}')
+           OR (tabela = 'Financeiro' AND chave >= ?)
+    """, (provisoria,))
+    # Os gatilhos de resumo acham o cliente pela OP, que mudou de chave no meio
+    reconstruir_resumos(conn)
+
+
+def reservar_ids_financeiro(conn: sqlite3.Connection, quantidade: int = 1) -> range:
+    """Reserva ``quantidade`` ids de Financeiro consecutivos na faixa do aparelho."""
+    base = identidade_aparelho(conn)[1]
+    bloco = reservar_sequencia(conn, 'ultimo_id_financeiro', quantidade)
+    return range(base + bloco.start, base + bloco.stop)
+
+
+def numero_op(id_remessa: str) -> Optional[int]:
+    """Número de uma OP (``OP-0042`` ou ``OP-0042-3FA2``), ou None."""
+    m = re.match(r'OP-(\d+)', id_remessa or '')
+    return int(m.group(1)) if m else None
+
+
+def avancar_contador_op(conn: sqlite3.Connection, numero: int):
+    """Garante que as próximas OPs deste aparelho fiquem acima de ``numero``."""
+    conn.execute(
+        "UPDATE Configuracoes SET valor = MAX(CAST(valor AS INTEGER), ?) WHERE chave = 'ultimo_id_remessa'",
+        (numero,)
+    )
 
 
 def init_db():
     """Inicializa o banco de dados."""
-    conn = sqlite3.connect(get_db_path())
+    rastreador = get_rastreador()
+    with conexao() as conn:
+        # WAL: leitores não bloqueiam o escritor e o commit não regrava o journal
+        conn.execute('PRAGMA journal_mode = WAL')
+        with rastreador.span('init_db.criar_tabelas'):
+            _criar_tabelas(conn)
+        with rastreador.span('init_db.migracoes'):
+            aplicar_migracoes(conn)
+        perfil = get_perfil(conn)
+    
+    get_gerenciador().definir_perfil(perfil)
+
+
+def get_perfil(conn: sqlite3.Connection) -> str:
+    """Retorna o perfil de PRAGMA salvo em Configuracoes."""
+    row = conn.execute(
+        "SELECT valor FROM Configuracoes WHERE chave = 'perfil_pragma'"
+    ).fetchone()
+    if row and row[0] in PERFIS_PRAGMA:
+        return row[0]
+    return PERFIL_PADRAO
+
+
+def definir_perfil(perfil: str):
+    """Salva o perfil de PRAGMA em Configuracoes e aplica no pool."""
+    if perfil not in PERFIS_PRAGMA:
+        raise ValueError(f'Perfil desconhecido: {perfil}')
+    
+    with conexao() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO Configuracoes (chave, valor) VALUES ('perfil_pragma', ?)",
+            (perfil,)
+        )
+    
+    get_gerenciador().definir_perfil(perfil)
+
+
+def _criar_tabelas(conn: sqlite3.Connection):
+    """Cria as tabelas e os registros padrão."""
     cursor = conn.cursor()
     
     # Clientes
@@ -37,7 +412,7 @@ def init_db():
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS Modelos (
             modelo TEXT PRIMARY KEY,
-            custo_unitario REAL NOT NULL
+            custo_unitario INTEGER NOT NULL
         )
     ''')
     
@@ -48,7 +423,7 @@ def init_db():
             id_cliente TEXT NOT NULL,
             modelo TEXT NOT NULL,
             quantidade INTEGER NOT NULL,
-            custo_unitario REAL NOT NULL,
+            custo_unitario INTEGER NOT NULL,
             saldo_montar INTEGER DEFAULT 0,
             entregue INTEGER DEFAULT 0,
             prazo_dias INTEGER DEFAULT 30,
@@ -65,7 +440,7 @@ def init_db():
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             id_remessa TEXT NOT NULL,
             quantidade INTEGER NOT NULL,
-            valor_receber REAL NOT NULL,
+            valor_receber INTEGER NOT NULL,
             data_entrega TEXT NOT NULL,
             data_vencimento TEXT,
             status TEXT DEFAULT 'Pendente',
@@ -82,10 +457,13 @@ def init_db():
         )
     ''')
     
-    # Inserir contador de OP
+    # Inserir contadores de OP e de títulos
     cursor.execute('''
         INSERT OR IGNORE INTO Configuracoes (chave, valor) VALUES ('ultimo_id_remessa', '0')
     ''')
+    cursor.execute('''
+        INSERT OR IGNORE INTO Configuracoes (chave, valor) VALUES ('ultimo_id_financeiro', '0')
+    ''')
     
     # Usuários
     cursor.execute('''
@@ -102,22 +480,593 @@ def init_db():
         VALUES ('admin', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/X4.VTtYA.qGZvKG6G')
     ''')
     
-    # Bancos
+    # Bancos (limite em centavos, como todos os valores)
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS Bancos (
             nome TEXT PRIMARY KEY,
-            limite_mensal REAL DEFAULT 5000
+            limite_mensal INTEGER DEFAULT 500000
         )
     ''')
     
     bancos = ['Caixa', 'Banco do Brasil', 'Itaú', 'Bradesco', 'Nubank']
     for b in bancos:
         cursor.execute('INSERT OR IGNORE INTO Bancos (nome) VALUES (?)', (b,))
+
+
+# Tabelas de resumo mantidas por gatilhos. Guardam os totais do dashboard
+# e do financeiro para que os services não precisem somar as tabelas inteiras.
+# Valores em centavos: as somas são inteiras e batem exatamente com os dados.
+TABELAS_RESUMO = [
+    '''CREATE TABLE IF NOT EXISTS ResumoGeral (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        ops_abertas INTEGER NOT NULL DEFAULT 0,
+        saldo_montar INTEGER NOT NULL DEFAULT 0,
+        valor_saldo INTEGER NOT NULL DEFAULT 0,
+        pendente INTEGER NOT NULL DEFAULT 0,
+        recebido INTEGER NOT NULL DEFAULT 0
+    )''',
+    '''CREATE TABLE IF NOT EXISTS ResumoCliente (
+        id_cliente TEXT PRIMARY KEY,
+        pendente INTEGER NOT NULL DEFAULT 0,
+        recebido INTEGER NOT NULL DEFAULT 0
+    )''',
+    '''CREATE TABLE IF NOT EXISTS ResumoBancoMes (
+        banco TEXT NOT NULL,
+        mes TEXT NOT NULL,
+        recebido INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (banco, mes)
+    )''',
+]
+
+
+def _resumo_remessa(ref: str, sinal: str) -> str:
+    """SQL que soma (ou subtrai) uma remessa dos totais de produção."""
+    return f'''
+        UPDATE ResumoGeral SET
+            ops_abertas = ops_abertas {sinal} ({ref}.saldo_montar > 0),
+            saldo_montar = saldo_montar {sinal} MAX({ref}.saldo_montar, 0),
+            valor_saldo = valor_saldo {sinal} MAX({ref}.saldo_montar, 0) * {ref}.custo_unitario
+        WHERE id = 1;
+    '''
+
+
+def _resumo_titulos_da_remessa(ref: str, sinal: str) -> str:
+    """SQL que atribui (ou retira) os títulos de uma remessa do seu cliente."""
+    return f'''
+        INSERT INTO ResumoCliente (id_cliente, pendente, recebido)
+        SELECT {ref}.id_cliente,
+               {sinal}COALESCE(SUM(CASE WHEN f.status = 'Pendente' THEN f.valor_receber END), 0),
+               {sinal}COALESCE(SUM(CASE WHEN f.status = 'Recebido' THEN f.valor_receber END), 0)
+        FROM Financeiro f WHERE f.id_remessa = {ref}.id_remessa
+        GROUP BY f.id_remessa
+        ON CONFLICT (id_cliente) DO UPDATE SET
+            pendente = pendente + excluded.pendente,
+            recebido = recebido + excluded.recebido;
+    '''
+
+
+def _resumo_titulo(ref: str, sinal: str) -> str:
+    """SQL que soma (ou subtrai) um título dos totais financeiros."""
+    pendente = f"(CASE WHEN {ref}.status = 'Pendente' THEN {ref}.valor_receber ELSE 0 END)"
+    recebido = f"(CASE WHEN {ref}.status = 'Recebido' THEN {ref}.valor_receber ELSE 0 END)"
+    return f'''
+        UPDATE ResumoGeral SET
+            pendente = pendente + {sinal}{pendente},
+            recebido = recebido + {sinal}{recebido}
+        WHERE id = 1;
+        INSERT INTO ResumoCliente (id_cliente, pendente, recebido)
+        SELECT r.id_cliente, {sinal}{pendente}, {sinal}{recebido}
+        FROM Remessas r WHERE r.id_remessa = {ref}.id_remessa
+        ON CONFLICT (id_cliente) DO UPDATE SET
+            pendente = pendente + excluded.pendente,
+            recebido = recebido + excluded.recebido;
+        INSERT INTO ResumoBancoMes (banco, mes, recebido)
+        SELECT COALESCE({ref}.banco, ''), substr({ref}.data_recebimento, 1, 7), {sinal}{ref}.valor_receber
+        WHERE {ref}.status = 'Recebido'
+        ON CONFLICT (banco, mes) DO UPDATE SET recebido = recebido + excluded.recebido;
+    '''
+
+
+def gatilhos_resumo() -> list:
+    """Retorna os CREATE TRIGGER que mantêm as tabelas de resumo."""
+    return [
+        f'''CREATE TRIGGER IF NOT EXISTS trg_resumo_remessa_ins AFTER INSERT ON Remessas BEGIN
+            {_resumo_remessa('NEW', '+')}
+            {_resumo_titulos_da_remessa('NEW', '')}
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_resumo_remessa_del AFTER DELETE ON Remessas BEGIN
+            {_resumo_remessa('OLD', '-')}
+            {_resumo_titulos_da_remessa('OLD', '-')}
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_resumo_remessa_upd
+            AFTER UPDATE OF saldo_montar, custo_unitario ON Remessas BEGIN
+            {_resumo_remessa('OLD', '-')}
+            {_resumo_remessa('NEW', '+')}
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_resumo_remessa_cliente
+            AFTER UPDATE OF id_cliente ON Remessas BEGIN
+            {_resumo_titulos_da_remessa('OLD', '-')}
+            {_resumo_titulos_da_remessa('NEW', '')}
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_resumo_financeiro_ins AFTER INSERT ON Financeiro BEGIN
+            {_resumo_titulo('NEW', '')}
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_resumo_financeiro_del AFTER DELETE ON Financeiro BEGIN
+            {_resumo_titulo('OLD', '-')}
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_resumo_financeiro_upd
+            AFTER UPDATE OF id_remessa, valor_receber, status, banco, data_recebimento ON Financeiro BEGIN
+            {_resumo_titulo('OLD', '-')}
+            {_resumo_titulo('NEW', '')}
+        END''',
+    ]
+
+
+def criar_resumos(conn: sqlite3.Connection):
+    """Cria as tabelas de resumo, os gatilhos e calcula os totais atuais."""
+    for sql in TABELAS_RESUMO + gatilhos_resumo():
+        conn.execute(sql)
+    reconstruir_resumos(conn)
+
+
+def recriar_gatilhos_resumo(conn: sqlite3.Connection):
+    """Troca os gatilhos de resumo gravados no banco pela versão atual."""
+    for sql in gatilhos_resumo():
+        nome = re.search(r'IF NOT EXISTS (\w+)', sql).group(1)
+        conn.execute(f'DROP TRIGGER IF EXISTS {nome}')
+        conn.execute(sql)
+
+
+def _resumos_calculados(conn: sqlite3.Connection) -> Dict:
+    """Calcula os totais direto das tabelas (referência para rebuild/verify)."""
+    geral = conn.execute('''
+        SELECT
+            (SELECT COUNT(*) FROM Remessas WHERE saldo_montar > 0),
+            (SELECT COALESCE(SUM(saldo_montar), 0) FROM Remessas WHERE saldo_montar > 0),
+            (SELECT COALESCE(SUM(saldo_montar * custo_unitario), 0) FROM Remessas WHERE saldo_montar > 0),
+            (SELECT COALESCE(SUM(valor_receber), 0) FROM Financeiro WHERE status = 'Pendente'),
+            (SELECT COALESCE(SUM(valor_receber), 0) FROM Financeiro WHERE status = 'Recebido')
+    ''').fetchone()
+    clientes = conn.execute('''
+        SELECT r.id_cliente,
+               COALESCE(SUM(CASE WHEN f.status = 'Pendente' THEN f.valor_receber END), 0),
+               COALESCE(SUM(CASE WHEN f.status = 'Recebido' THEN f.valor_receber END), 0)
+        FROM Financeiro f JOIN Remessas r ON r.id_remessa = f.id_remessa
+        GROUP BY r.id_cliente
+    ''').fetchall()
+    bancos = conn.execute('''
+        SELECT COALESCE(banco, ''), substr(data_recebimento, 1, 7), SUM(valor_receber)
+        FROM Financeiro WHERE status = 'Recebido'
+        GROUP BY 1, 2
+    ''').fetchall()
+    return {
+        'geral': tuple(geral),
+        'clientes': {row[0]: (row[1], row[2]) for row in clientes},
+        'bancos': {(row[0], row[1]): row[2] for row in bancos},
+    }
+
+
+def reconstruir_resumos(conn: sqlite3.Connection):
+    """Recalcula todas as tabelas de resumo a partir dos dados."""
+    calculado = _resumos_calculados(conn)
+    conn.execute('DELETE FROM ResumoGeral')
+    conn.execute('DELETE FROM ResumoCliente')
+    conn.execute('DELETE FROM ResumoBancoMes')
+    conn.execute(
+        'INSERT INTO ResumoGeral (id, ops_abertas, saldo_montar, valor_saldo, pendente, recebido) '
+        'VALUES (1, ?, ?, ?, ?, ?)', calculado['geral']
+    )
+    conn.executemany(
+        'INSERT INTO ResumoCliente (id_cliente, pendente, recebido) VALUES (?, ?, ?)',
+        [(cliente,) + valores for cliente, valores in calculado['clientes'].items()]
+    )
+    conn.executemany(
+        'INSERT INTO ResumoBancoMes (banco, mes, recebido) VALUES (?, ?, ?)',
+        [chave + (valor,) for chave, valor in calculado['bancos'].items()]
+    )
+
+
+def verificar_resumos(conn: sqlite3.Connection, tolerancia: int = 0) -> List[str]:
+    """Compara os resumos com os dados e lista as divergências encontradas."""
+    calculado = _resumos_calculados(conn)
+    divergencias = []
+    
+    def difere(a, b):
+        return abs((a or 0) - (b or 0)) > tolerancia
+    
+    geral = conn.execute(
+        'SELECT ops_abertas, saldo_montar, valor_saldo, pendente, recebido FROM ResumoGeral WHERE id = 1'
+    ).fetchone() or (0, 0, 0, 0, 0)
+    nomes = ('ops_abertas', 'saldo_montar', 'valor_saldo', 'pendente', 'recebido')
+    for nome, salvo, esperado in zip(nomes, geral, calculado['geral']):
+        if difere(salvo, esperado):
+            divergencias.append(f'ResumoGeral.{nome}: {salvo} != {esperado}')
+    
+    salvos = {row[0]: (row[1], row[2]) for row in conn.execute(
+        'SELECT id_cliente, pendente, recebido FROM ResumoCliente')}
+    for cliente in set(salvos) | set(calculado['clientes']):
+        salvo = salvos.get(cliente, (0, 0))
+        esperado = calculado['clientes'].get(cliente, (0, 0))
+        if difere(salvo[0], esperado[0]) or difere(salvo[1], esperado[1]):
+            divergencias.append(f'ResumoCliente[{cliente}]: {salvo} != {esperado}')
+    
+    salvos = {(row[0], row[1]): row[2] for row in conn.execute(
+        'SELECT banco, mes, recebido FROM ResumoBancoMes')}
+    for chave in set(salvos) | set(calculado['bancos']):
+        if difere(salvos.get(chave), calculado['bancos'].get(chave)):
+            divergencias.append(
+                f'ResumoBancoMes{list(chave)}: {salvos.get(chave)} != {calculado["bancos"].get(chave)}'
+            )
+    
+    return divergencias
+
+
+# Índice textual dos clientes (FTS5 com conteúdo externo: o índice aponta
+# para o rowid de Clientes e os gatilhos o mantêm em dia). Em builds do
+# SQLite sem FTS5 a tabela não é criada e a busca cai no LIKE.
+COLUNAS_BUSCA_CLIENTES = ('id_cliente', 'nome', 'telefone', 'email')
+
+
+def fts5_disponivel(conn: sqlite3.Connection) -> bool:
+    """Indica se o SQLite em uso foi compilado com FTS5."""
+    try:
+        conn.execute('CREATE VIRTUAL TABLE temp._teste_fts5 USING fts5(x)')
+        conn.execute('DROP TABLE temp._teste_fts5')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def busca_clientes_disponivel(conn: sqlite3.Connection) -> bool:
+    """Indica se o índice ClientesBusca existe neste banco."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'ClientesBusca'"
+    ).fetchone() is not None
+
+
+def gatilhos_busca_clientes() -> List[str]:
+    """Gatilhos que espelham Clientes no índice ClientesBusca."""
+    colunas = ', '.join(COLUNAS_BUSCA_CLIENTES)
+    
+    def valores(ref):
+        return ', '.join(f'{ref}.{c}' for c in COLUNAS_BUSCA_CLIENTES)
+    
+    inserir = f'INSERT INTO ClientesBusca (rowid, {colunas}) VALUES (new.rowid, {valores("new")});'
+    remover = (f"INSERT INTO ClientesBusca (ClientesBusca, rowid, {colunas}) "
+               f"VALUES ('delete', old.rowid, {valores('old')});")
+    return [
+        f'''CREATE TRIGGER IF NOT EXISTS trg_busca_clientes_ins AFTER INSERT ON Clientes
+            BEGIN {inserir} END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_busca_clientes_del AFTER DELETE ON Clientes
+            BEGIN {remover} END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_busca_clientes_upd AFTER UPDATE ON Clientes
+            BEGIN {remover} {inserir} END''',
+    ]
+
+
+def criar_busca_clientes(conn: sqlite3.Connection):
+    """Cria o índice FTS5 dos clientes, os gatilhos e indexa os atuais."""
+    if not fts5_disponivel(conn):
+        return
+    
+    conn.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS ClientesBusca USING fts5(
+            {', '.join(COLUNAS_BUSCA_CLIENTES)},
+            content = 'Clientes', content_rowid = 'rowid',
+            tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3'
+        )
+    ''')
+    for sql in gatilhos_busca_clientes():
+        conn.execute(sql)
+    reconstruir_busca_clientes(conn)
+
+
+def reconstruir_busca_clientes(conn: sqlite3.Connection):
+    """Reindexa todos os clientes (ex.: depois de um VACUUM, que pode mudar rowids)."""
+    if busca_clientes_disponivel(conn):
+        conn.execute("INSERT INTO ClientesBusca (ClientesBusca) VALUES ('rebuild')")
+
+
+# Diário de alterações para a sincronização entre aparelhos. Os gatilhos
+# registram (tabela, chave, operação) com carimbo UTC e o aparelho de
+# origem; os valores são lidos da própria tabela na hora de exportar.
+# SyncContexto guarda o aparelho local e, durante uma importação, o
+# carimbo/origem remotos, para que o diário preserve quem fez a alteração.
+TABELAS_SYNC = {
+    'Clientes': 'id_cliente',
+    'Modelos': 'modelo',
+    'Remessas': 'id_remessa',
+    'Financeiro': 'id',
+}
+
+TABELAS_DIARIO = [
+    '''CREATE TABLE IF NOT EXISTS Alteracoes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        tabela TEXT NOT NULL,
+        chave NOT NULL,
+        operacao TEXT NOT NULL CHECK (operacao IN ('U', 'D')),
+        carimbo TEXT NOT NULL,
+        dispositivo TEXT NOT NULL,
+        par TEXT
+    )''',
+    'CREATE INDEX IF NOT EXISTS idx_alteracoes_chave ON Alteracoes (tabela, chave, seq)',
+    '''CREATE TABLE IF NOT EXISTS SyncContexto (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        dispositivo TEXT NOT NULL,
+        origem TEXT,
+        carimbo TEXT,
+        par TEXT
+    )''',
+    '''CREATE TABLE IF NOT EXISTS SyncCursores (
+        par TEXT PRIMARY KEY,
+        enviado INTEGER NOT NULL DEFAULT 0,
+        recebido INTEGER NOT NULL DEFAULT 0,
+        ultima_sincronizacao TEXT
+    )''',
+]
+
+
+def _registro_diario(tabela: str, ref: str, operacao: str) -> str:
+    """SQL que anota uma alteração no diário com a origem do SyncContexto."""
+    chave = TABELAS_SYNC[tabela]
+    return f'''
+        INSERT INTO Alteracoes (tabela, chave, operacao, carimbo, dispositivo, par)
+        SELECT '{tabela}', {ref}.{chave}, '{operacao}',
+               COALESCE(s.carimbo, strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+               COALESCE(s.origem, s.dispositivo), s.par
+        FROM SyncContexto s WHERE s.id = 1;
+    '''
+
+
+def gatilhos_diario() -> List[str]:
+    """Gatilhos que alimentam o diário de alterações."""
+    gatilhos = []
+    for tabela, chave in TABELAS_SYNC.items():
+        nome = tabela.lower()
+        gatilhos += [
+            f'''CREATE TRIGGER IF NOT EXISTS trg_diario_{nome}_ins AFTER INSERT ON {tabela}
+                BEGIN {_registro_diario(tabela, 'new', 'U')} END''',
+            f'''CREATE TRIGGER IF NOT EXISTS trg_diario_{nome}_upd AFTER UPDATE ON {tabela}
+                BEGIN {_registro_diario(tabela, 'new', 'U')} END''',
+            f'''CREATE TRIGGER IF NOT EXISTS trg_diario_{nome}_chave AFTER UPDATE OF {chave} ON {tabela}
+                WHEN old.{chave} IS NOT new.{chave}
+                BEGIN {_registro_diario(tabela, 'old', 'D')} END''',
+            f'''CREATE TRIGGER IF NOT EXISTS trg_diario_{nome}_del AFTER DELETE ON {tabela}
+                BEGIN {_registro_diario(tabela, 'old', 'D')} END''',
+        ]
+    return gatilhos
+
+
+def criar_diario(conn: sqlite3.Connection):
+    """Cria o diário, identifica o aparelho e registra as linhas já existentes."""
+    for sql in TABELAS_DIARIO + gatilhos_diario():
+        conn.execute(sql)
+    
+    conn.execute(
+        'INSERT OR IGNORE INTO SyncContexto (id, dispositivo) VALUES (1, ?)',
+        (uuid.uuid4().hex,)
+    )
+    # O que já existe entra no diário para ir na primeira sincronização
+    for tabela, chave in TABELAS_SYNC.items():
+        conn.execute(f'''
+            INSERT INTO Alteracoes (tabela, chave, operacao, carimbo, dispositivo)
+            SELECT '{tabela}', t.{chave}, 'U', strftime('%Y-%m-%dT%H:%M:%fZ', 'now'), s.dispositivo
+            FROM {tabela} t, SyncContexto s WHERE s.id = 1
+        ''')
+
+
+# Colunas de dinheiro, guardadas em centavos (INTEGER). Bancos antigos
+# tinham REAL em reais; a migração 8 reconstrói essas tabelas.
+COLUNAS_CENTAVOS = {
+    'Modelos': ('custo_unitario',),
+    'Remessas': ('custo_unitario',),
+    'Financeiro': ('valor_receber',),
+    'Bancos': ('limite_mensal',),
+}
+
+
+def _colunas_em_reais(conn: sqlite3.Connection, tabela: str, colunas) -> List[str]:
+    """Colunas de ``colunas`` que ainda estão declaradas como REAL."""
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({tabela})')
+            if row[1] in colunas and row[2].upper() == 'REAL']
+
+
+def _reconstruir_em_centavos(conn: sqlite3.Connection, tabela: str, colunas: List[str]):
+    """Recria ``tabela`` com ``colunas`` em INTEGER, convertendo reais para centavos."""
+    ddl = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,)
+    ).fetchone()[0]
+    indices = [row[0] for row in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (tabela,)
+    )]
+    nova = f'{tabela}__centavos'
+
+    def converter_coluna(m):
+        padrao = m.group(3)
+        if padrao is not None:
+            padrao = f' DEFAULT {round(float(padrao) * 100)}'
+        return f'{m.group(1)} INTEGER{m.group(2)}{padrao or ""}'
+
+    for coluna in colunas:
+        ddl = re.sub(rf'\b({coluna})\s+REAL\b([^,)]*?)(?:\s+DEFAULT\s+([\d.]+))?(?=\s*[,)])',
+                     converter_coluna, ddl, count=1, flags=re.IGNORECASE)
+    ddl = re.sub(rf'^\s*CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?"?{tabela}"?', f'CREATE TABLE {nova}',
+                 ddl, count=1, flags=re.IGNORECASE)
+
+    todas = [row[1] for row in conn.execute(f'PRAGMA table_info({tabela})')]
+    valores = [f'_centavos({c})' if c in colunas else c for c in todas]
+    conn.execute(ddl)
+    conn.execute(f'INSERT INTO {nova} ({", ".join(todas)}) SELECT {", ".join(valores)} FROM {tabela}')
+
+    sequencia = conn.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = ?", (tabela,)
+    ).fetchone() if 'AUTOINCREMENT' in ddl.upper() else None
+    conn.execute(f'DROP TABLE {tabela}')
+    conn.execute(f'ALTER TABLE {nova} RENAME TO {tabela}')
+    if sequencia is not None:
+        conn.execute('DELETE FROM sqlite_sequence WHERE name = ?', (tabela,))
+        conn.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)', (tabela, sequencia[0]))
+    for sql in indices:
+        conn.execute(sql)
+
+
+def converter_centavos(conn: sqlite3.Connection):
+    """Passa os valores de reais (REAL) para centavos (INTEGER).
+
+    Bancos criados já em centavos não têm nada a converter. Os gatilhos
+    saem durante a cópia (nada vai para o diário: os outros aparelhos
+    migram os próprios dados) e voltam na versão atual, com somas inteiras.
+    """
+    pendentes = {tabela: _colunas_em_reais(conn, tabela, colunas)
+                 for tabela, colunas in COLUNAS_CENTAVOS.items()}
+    pendentes = {tabela: colunas for tabela, colunas in pendentes.items() if colunas}
+    resumos_em_reais = bool(_colunas_em_reais(conn, 'ResumoGeral', ('valor_saldo', 'pendente', 'recebido')))
+    if not pendentes and not resumos_em_reais:
+        return
+
+    gatilhos = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND sql IS NOT NULL"
+    ).fetchall()
+    for nome, _ in gatilhos:
+        conn.execute(f'DROP TRIGGER "{nome}"')
+
+    # Mesmo arredondamento dos services (1.005 vira 101, não 100,49...)
+    conn.create_function(
+        '_centavos', 1, lambda v: None if v is None else int(Dinheiro.de_reais(v)), deterministic=True
+    )
+    for tabela, colunas in pendentes.items():
+        _reconstruir_em_centavos(conn, tabela, colunas)
+
+    # Os resumos são derivados: basta recriá-los em INTEGER e recalcular
+    indices_resumo = [row[0] for row in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+        "AND tbl_name IN ('ResumoGeral', 'ResumoCliente', 'ResumoBancoMes')"
+    )]
+    for tabela in ('ResumoGeral', 'ResumoCliente', 'ResumoBancoMes'):
+        conn.execute(f'DROP TABLE IF EXISTS {tabela}')
+    for sql in TABELAS_RESUMO + indices_resumo:
+        conn.execute(sql)
+
+    atuais = gatilhos_resumo() + gatilhos_diario()
+    if busca_clientes_disponivel(conn):
+        atuais += gatilhos_busca_clientes()
+    for sql in atuais:
+        conn.execute(sql)
+    # Gatilhos que não são destes conjuntos voltam como estavam
+    for nome, sql in gatilhos:
+        existe = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (nome,)
+        ).fetchone()
+        if existe is None:
+            conn.execute(sql)
+    reconstruir_resumos(conn)
+
+
+# Migrações de schema, controladas por PRAGMA user_version.
+# Cada item é (versão, descrição, passos); um passo é um SQL ou uma função
+# que recebe a conexão. Nunca altere uma migração já publicada: acrescente
+# uma nova no fim da lista.
+MIGRACOES = [
+    (1, 'Índices das consultas dos services', [
+        # ClienteService.listar_todos (ORDER BY nome)
+        'CREATE INDEX IF NOT EXISTS idx_clientes_nome ON Clientes (nome)',
+        # RemessaService.listar_todos (filtros + ORDER BY data_criacao)
+        'CREATE INDEX IF NOT EXISTS idx_remessas_data ON Remessas (data_criacao)',
+        'CREATE INDEX IF NOT EXISTS idx_remessas_cliente_data ON Remessas (id_cliente, data_criacao)',
+        'CREATE INDEX IF NOT EXISTS idx_remessas_status_data ON Remessas (status, data_criacao)',
+        # RemessaService.get_overdue
+        """CREATE INDEX IF NOT EXISTS idx_remessas_atrasadas ON Remessas (data_prevista)
+           WHERE saldo_montar > 0 AND status != 'Entregue'""",
+        # RemessaService.get_estatisticas (cobre a soma do saldo)
+        """CREATE INDEX IF NOT EXISTS idx_remessas_saldo ON Remessas (saldo_montar, custo_unitario)
+           WHERE saldo_montar > 0""",
+        # FinanceiroService.get_all / get_totais (join por remessa e ordenação)
+        'CREATE INDEX IF NOT EXISTS idx_financeiro_remessa ON Financeiro (id_remessa, status, valor_receber)',
+        'CREATE INDEX IF NOT EXISTS idx_financeiro_vencimento ON Financeiro (data_vencimento)',
+        'CREATE INDEX IF NOT EXISTS idx_financeiro_status_venc ON Financeiro (status, data_vencimento)',
+        'CREATE INDEX IF NOT EXISTS idx_financeiro_status_valor ON Financeiro (status, valor_receber)',
+        # FinanceiroService.get_monthly_received
+        """CREATE INDEX IF NOT EXISTS idx_financeiro_recebido
+           ON Financeiro (banco, data_recebimento, valor_receber)
+           WHERE status = 'Recebido'""",
+    ]),
+    (2, 'Desempate por id_remessa na ordenação/paginação de Remessas', [
+        'DROP INDEX IF EXISTS idx_remessas_data',
+        'DROP INDEX IF EXISTS idx_remessas_cliente_data',
+        'DROP INDEX IF EXISTS idx_remessas_status_data',
+        'CREATE INDEX IF NOT EXISTS idx_remessas_data ON Remessas (data_criacao, id_remessa)',
+        'CREATE INDEX IF NOT EXISTS idx_remessas_cliente_data ON Remessas (id_cliente, data_criacao, id_remessa)',
+        'CREATE INDEX IF NOT EXISTS idx_remessas_status_data ON Remessas (status, data_criacao, id_remessa)',
+    ]),
+    (3, 'Tabelas de resumo mantidas por gatilhos', [
+        criar_resumos,
+    ]),
+    (4, 'Busca textual de clientes (FTS5)', [
+        criar_busca_clientes,
+    ]),
+    (5, 'Índice do aging de recebíveis', [
+        # FinanceiroService.get_aging (cobre remessa, vencimento e valor dos pendentes)
+        """CREATE INDEX IF NOT EXISTS idx_financeiro_aging
+           ON Financeiro (status, id_remessa, data_vencimento, valor_receber)""",
+    ]),
+    (6, 'Índice por mês dos recebimentos por banco', [
+        # FinanceiroService.get_matriz_bancos e o faturamento do dashboard
+        'CREATE INDEX IF NOT EXISTS idx_resumo_banco_mes ON ResumoBancoMes (mes, banco, recebido)',
+    ]),
+    (7, 'Diário de alterações para sincronização', [
+        criar_diario,
+    ]),
+    (8, 'Valores em centavos (INTEGER)', [
+        converter_centavos,
+    ]),
+    (9, 'Contador de OPs acima das OPs já gravadas', [
+        # Aparelhos que importaram OPs de outro ficaram com o contador para trás
+        """UPDATE Configuracoes SET valor = MAX(CAST(valor AS INTEGER), (
+               SELECT COALESCE(MAX(CAST(substr(id_remessa, 4) AS INTEGER)), 0)
+               FROM Remessas WHERE id_remessa LIKE 'OP-%'))
+           WHERE chave = 'ultimo_id_remessa'""",
+    ]),
+    (10, 'Gatilhos de resumo sem HAVING sem GROUP BY (SQLite < 3.39)', [
+        recriar_gatilhos_resumo,
+    ]),
+    (11, 'Número do aparelho dado pelo servidor de sincronização', [
+        'ALTER TABLE SyncContexto ADD COLUMN numero INTEGER',
+    ]),
+]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Retorna a versão de schema gravada no banco."""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def aplicar_migracoes(conn: sqlite3.Connection) -> int:
+    """Aplica as migrações pendentes, cada uma em sua própria transação."""
+    versao = get_schema_version(conn)
+    
+    for numero, descricao, passos in MIGRACOES:
+        if numero <= versao:
+            continue
+        
+        conn.execute('SAVEPOINT migracao')
+        try:
+            for passo in passos:
+                if callable(passo):
+                    passo(conn)
+                else:
+                    conn.execute(passo)
+            conn.execute(f'PRAGMA user_version = {numero}')
+        except Exception:
+            conn.execute('ROLLBACK TO migracao')
+            conn.execute('RELEASE migracao')
+            raise
+        conn.execute('RELEASE migracao')
+        versao = numero
     
-    conn.commit()
-    conn.close()
+    return versao
 
 
 def get_connection():
-    """Retorna uma conexão com o banco."""
+    """Retorna uma conexão avulsa, fora do pool (prefira ``conexao()``)."""
     return sqlite3.connect(get_db_path())
@@ -0,0 +1,136 @@
+"""
+Executor de serviços em segundo plano.
+
+As telas submetem chamadas de service aqui em vez de executá-las na thread
+da interface; o resultado volta para a thread do Kivy via
+``Clock.schedule_once``. Cada submissão pertence a um grupo (normalmente a
+tela): uma nova submissão no mesmo grupo, ou ``cancelar(grupo)``, torna as
+anteriores obsoletas e seus resultados são descartados.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+TRABALHADORES = 2
+
+
+def _agendar_kivy(funcao: Callable[[], None]):
+    """Executa ``funcao`` no próximo quadro da thread do Kivy."""
+    from kivy.clock import Clock
+    Clock.schedule_once(lambda dt: funcao(), 0)
+
+
+class Tarefa:
+    """Submissão feita ao executor."""
+
+    __slots__ = ('grupo', 'geracao', 'future', '_executor')
+
+    def __init__(self, executor: 'ExecutorServicos', grupo: str, geracao: int):
+        self._executor = executor
+        self.grupo = grupo
+        self.geracao = geracao
+        self.future: Optional[Future] = None
+
+    @property
+    def obsoleta(self) -> bool:
+        """Indica se outra submissão (ou um cancelamento) substituiu esta."""
+        return self._executor._geracao_atual(self.grupo) != self.geracao
+
+    def cancelar(self):
+        """Cancela esta tarefa, se ainda for a mais recente do grupo."""
+        if not self.obsoleta:
+            self._executor.cancelar(self.grupo)
+
+
+class ExecutorServicos:
+    """Pool de threads para chamadas de service fora da thread da interface.
+
+    ``agendar`` entrega os callbacks na thread da interface (padrão:
+    ``Clock.schedule_once``); pode ser trocado em scripts e testes.
+    """
+
+    def __init__(self, trabalhadores: int = TRABALHADORES,
+                 agendar: Callable[[Callable[[], None]], None] = None):
+        self._pool = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix='servicos')
+        self._agendar = agendar or _agendar_kivy
+        self._geracoes: Dict[str, int] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _geracao_atual(self, grupo: str) -> int:
+        with self._lock:
+            return self._geracoes.get(grupo, 0)
+
+    def submeter(self, grupo: str, funcao: Callable, *args,
+                 ao_concluir: Callable = None, ao_falhar: Callable = None, **kwargs) -> Tarefa:
+        """Executa ``funcao(*args, **kwargs)`` em segundo plano.
+
+        ``ao_concluir(resultado)`` ou ``ao_falhar(erro)`` rodam na thread da
+        interface, e só se a tarefa ainda for a mais recente do grupo.
+        """
+        with self._lock:
+            geracao = self._geracoes.get(grupo, 0) + 1
+            self._geracoes[grupo] = geracao
+            anterior = self._futures.pop(grupo, None)
+        if anterior is not None:
+            anterior.cancel()
+
+        tarefa = Tarefa(self, grupo, geracao)
+
+        def executar():
+            # Descartada antes de começar: nem toca no banco
+            if tarefa.obsoleta:
+                return
+            try:
+                resultado = funcao(*args, **kwargs)
+            except Exception as e:
+                if ao_falhar is not None:
+                    self._entregar(tarefa, ao_falhar, e)
+                return
+            if ao_concluir is not None:
+                self._entregar(tarefa, ao_concluir, resultado)
+
+        future = self._pool.submit(executar)
+        tarefa.future = future
+        with self._lock:
+            if self._geracoes.get(grupo) == geracao:
+                self._futures[grupo] = future
+        return tarefa
+
+    def _entregar(self, tarefa: Tarefa, callback: Callable, valor):
+        """Agenda o callback na thread da interface, rechecando a validade lá."""
+        def entregar():
+            if not tarefa.obsoleta:
+                callback(valor)
+
+        self._agendar(entregar)
+
+    def cancelar(self, grupo: str):
+        """Torna obsoletas as submissões pendentes do grupo."""
+        with self._lock:
+            self._geracoes[grupo] = self._geracoes.get(grupo, 0) + 1
+            future = self._futures.pop(grupo, None)
+        if future is not None:
+            future.cancel()
+
+    def encerrar(self, esperar: bool = False):
+        """Encerra o pool, descartando o que ainda não começou."""
+        with self._lock:
+            for grupo in self._geracoes:
+                self._geracoes[grupo] += 1
+            self._futures.clear()
+        self._pool.shutdown(wait=esperar, cancel_futures=True)
+
+
+_executor: Optional[ExecutorServicos] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ExecutorServicos:
+    """Retorna o executor global, criando-o no primeiro uso."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ExecutorServicos()
+    return _executor
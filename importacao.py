@@ -0,0 +1,159 @@
+"""
+Importação de CSV em lotes (Clientes, Modelos e Remessas).
+"""
+import csv
+import io
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .services import ClienteService, ModeloService, RemessaService
+
+TAMANHO_LOTE = 500
+
+# tipo -> (função de lote, colunas obrigatórias, colunas numéricas)
+IMPORTADORES = {
+    'clientes': (ClienteService.cadastrar_lote, ('id_cliente', 'nome'), ()),
+    'modelos': (ModeloService.salvar_lote, ('modelo', 'custo_unitario'), ('custo_unitario',)),
+    'remessas': (
+        RemessaService.criar_lote,
+        ('id_cliente', 'modelo', 'quantidade'),
+        ('quantidade', 'custo_unitario', 'prazo_dias', 'saldo_montar'),
+    ),
+}
+
+# Contagens e dias: aceitam só inteiros, com '.' como separador de milhar
+COLUNAS_INTEIRAS = ('quantidade', 'prazo_dias', 'saldo_montar')
+_INTEIRO = re.compile(r'(\d{1,3}(?:\.\d{3})+|\d+)(?:,0*)?')
+
+
+def importar_csv(arquivo, tipo: str, tamanho_lote: int = TAMANHO_LOTE,
+                 progresso: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """Importa um CSV lendo e gravando um lote por vez.
+
+    ``arquivo`` pode ser um caminho ou um arquivo texto já aberto. Cada lote
+    é gravado numa transação; linhas inválidas entram em ``erros`` (com o
+    número da linha no CSV) sem interromper o restante da importação.
+    """
+    if tipo not in IMPORTADORES:
+        return {'sucesso': False, 'mensagem': f'Tipo desconhecido: {tipo}', 'importados': 0, 'erros': []}
+    
+    if isinstance(arquivo, str):
+        with open(arquivo, newline='', encoding='utf-8-sig') as f:
+            return importar_csv(f, tipo, tamanho_lote, progresso)
+    
+    salvar_lote, obrigatorias, numericas = IMPORTADORES[tipo]
+    importados = 0
+    lidas = 0
+    erros = []
+    
+    try:
+        leitor = _leitor(arquivo)
+        faltando = [c for c in obrigatorias if c not in (leitor.fieldnames or [])]
+        if faltando:
+            return {'sucesso': False, 'mensagem': f"Colunas ausentes: {', '.join(faltando)}",
+                    'importados': 0, 'erros': []}
+        
+        for lote in _lotes(leitor, tamanho_lote):
+            registros = []
+            linhas_csv = []
+            for linha, registro in lote:
+                try:
+                    vazias = [c for c in obrigatorias if not registro.get(c)]
+                    if vazias:
+                        raise ValueError(f"Campo obrigatório vazio: {', '.join(vazias)}")
+                    for coluna in numericas:
+                        if registro.get(coluna) not in (None, ''):
+                            converter = _inteiro if coluna in COLUNAS_INTEIRAS else _numero
+                            registro[coluna] = converter(registro[coluna])
+                    registros.append(registro)
+                    linhas_csv.append(linha)
+                except ValueError as e:
+                    erros.append({'linha': linha, 'erro': str(e)})
+            
+            resultado = salvar_lote(registros)
+            if not resultado['sucesso']:
+                erros.extend({'linha': n, 'erro': resultado['mensagem']} for n in linhas_csv)
+            else:
+                importados += resultado['importados']
+                erros.extend({'linha': linhas_csv[e['indice']], 'erro': e['erro']} for e in resultado['erros'])
+            
+            lidas += len(lote)
+            if progresso:
+                progresso({'lidas': lidas, 'importados': importados, 'erros': len(erros)})
+    
+    except (csv.Error, UnicodeDecodeError) as e:
+        return {'sucesso': False, 'mensagem': f'CSV inválido: {e}', 'importados': importados, 'erros': erros}
+    
+    erros.sort(key=lambda e: e['linha'])
+    return {
+        'sucesso': True,
+        'mensagem': f'{importados} de {lidas} linhas importadas',
+        'importados': importados,
+        'erros': erros
+    }
+
+
+def _leitor(arquivo) -> csv.DictReader:
+    """Cria o leitor detectando ';' ou ',' como separador."""
+    amostra = arquivo.read(4096)
+    try:
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=';,\t')
+    except csv.Error:
+        dialeto = csv.excel
+    
+    # Reaproveita a amostra já lida sem exigir seek (funciona com streams)
+    leitor = csv.DictReader(_concatenar(amostra, arquivo), dialect=dialeto)
+    leitor.fieldnames = [c.strip().lower() for c in (leitor.fieldnames or [])]
+    return leitor
+
+
+def _concatenar(amostra: str, arquivo) -> Iterator[str]:
+    """Devolve as linhas da amostra seguidas do resto do arquivo."""
+    buffer = io.StringIO(amostra)
+    linha_parcial = ''
+    for linha in buffer:
+        if linha.endswith('\n'):
+            yield linha_parcial + linha
+            linha_parcial = ''
+        else:
+            linha_parcial += linha
+    for linha in arquivo:
+        yield linha_parcial + linha
+        linha_parcial = ''
+    if linha_parcial:
+        yield linha_parcial
+
+
+def _lotes(leitor: csv.DictReader, tamanho: int) -> Iterator[List[Tuple[int, Dict]]]:
+    """Agrupa as linhas do CSV em lotes de (número da linha, registro)."""
+    lote = []
+    for registro in leitor:
+        registro = {k: (v.strip() if isinstance(v, str) else v) for k, v in registro.items() if k}
+        if not any(registro.values()):
+            continue
+        lote.append((leitor.line_num, registro))
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _inteiro(valor: str) -> int:
+    """Converte '1.234' ou '1234' em inteiro; recusa valores com fração."""
+    casado = _INTEIRO.fullmatch(valor.strip())
+    if not casado:
+        raise ValueError(f'Valor inteiro inválido: {valor}')
+    return int(casado.group(1).replace('.', ''))
+
+
+def _numero(valor: str) -> float:
+    """Converte '1.234,56' ou '1234.56' em número."""
+    texto = valor.replace('R$', '').strip()
+    if ',' in texto:
+        texto = texto.replace('.', '').replace(',', '.')
+    try:
+        numero = float(texto)
+    except ValueError:
+        raise ValueError(f'Valor numérico inválido: {valor}')
+    return int(numero) if numero.is_integer() else numero
@@ -2,66 +2,62 @@
 G.A. Facção - Sistema Mobile para Android
 Versão 2.0 Mobile - Kivy
 """
+import json
 import os
 import sys
+import time
+from datetime import date
 from pathlib import Path
 
 # Configurar path
 BASE_DIR = Path(__file__).parent
 sys.path.insert(0, str(BASE_DIR))
 
+# Primeiro import: marca o início das fases rastreadas
+from app.rastreamento import INICIO_PROCESSO, get_rastreador, listar_lancamentos
+
 from kivy.config import Config
 Config.set('graphics', 'width', '360')
 Config.set('graphics', 'height', '640')
 Config.set('graphics', 'resizable', False)
 
 from kivy.app import App
-from kivy.uix.screenmanager import ScreenManager, Screen, SlideTransition
-from kivy.core.window import Window
+from kivy.uix.screenmanager import ScreenManager, SlideTransition
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.metrics import dp
-from kivy.properties import StringProperty, ObjectProperty, ListProperty
 from kivy.clock import Clock
-from kivy.utils import platform
 
-# KivyMD
+# KivyMD: só o que o login usa e as classes base dos widgets deste módulo
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.card import MDCard
-from kivymd.uix.list import MDList, OneLineListItem, TwoLineListItem
-from kivymd.uix.button import MDRaisedButton, MDIconButton
+from kivymd.uix.button import MDRaisedButton, MDIconButton, MDFloatingActionButton
 from kivymd.uix.textfield import MDTextField
-from kivymd.uix.dialog import MDDialog
-from kivymd.uix.snackbar import Snackbar
-from kivymd.uix.menu import MDDropdownMenu
-from kivymd.uix.pickers import MDDatePicker
-from kivymd.uix.datatables import MDDataTable
-from kivymd.uix.toolbar import MDTopAppBar
-from kivymd.uix.bottomnavigation import MDBottomNavigation, MDBottomNavigationItem
 from kivymd.uix.boxlayout import MDBoxLayout
-from kivymd.uix.gridlayout import MDGridLayout
-from kivymd.uix.scrollview import MDScrollView
-from kivymd.uix.label import MDLabel
-from kivymd.uix.chip import MDChip
-from kivymd.uix.badge import MDBadge
-from kivymd.uix.expansionpanel import MDExpansionPanel, MDExpansionPanelOneLine
 from kivymd.uix.floatlayout import MDFloatLayout
-from kivymd.uix.relativelayout import MDRelativeLayout
-from kivymd.uix.anchorlayout import MDAnchorLayout
+from kivymd.uix.label import MDLabel
 from kivymd.uix.tab import MDTabs, MDTabsBase
-from kivymd.uix.chip import MDChip
-from kivymd.uix.progressbar import MDProgressBar
-from kivymd.uix.selectioncontrol import MDSwitch
-from kivymd.uix.list import IRightBodyTouch, OneLineAvatarIconListItem
-from kivymd.icon_definitions import md_icons
-from kivymd.font_definitions import theme_font_styles
-from kivymd.theming import ThemableBehavior
-from kivymd.color_definitions import colors
 
 # Importar lógica do sistema
-from app.database import init_db, get_db_path
-from app.models import Cliente, Remessa, Financeiro
-from app.services import ClienteService, RemessaService, FinanceiroService, BackupService
-from app.utils import Logger, format_currency, format_date
+from app.database import init_db
+from app.services import ClienteService, RemessaService, FinanceiroService, BackupService, DashboardService
+from app.executor import get_executor
+from app.utils import ImportacaoTardia, format_currency, tardio
+
+# KivyMD: o resto só é importado quando uma tela usa pela primeira vez
+MDList, OneLineListItem, TwoLineListItem = tardio('kivymd.uix.list', 'MDList', 'OneLineListItem', 'TwoLineListItem')
+MDDialog = tardio('kivymd.uix.dialog', 'MDDialog')
+Snackbar = tardio('kivymd.uix.snackbar', 'Snackbar')
+MDTopAppBar = tardio('kivymd.uix.toolbar', 'MDTopAppBar')
+MDBottomNavigation, MDBottomNavigationItem = tardio(
+    'kivymd.uix.bottomnavigation', 'MDBottomNavigation', 'MDBottomNavigationItem'
+)
+MDGridLayout = tardio('kivymd.uix.gridlayout', 'MDGridLayout')
+MDScrollView = tardio('kivymd.uix.scrollview', 'MDScrollView')
+MDProgressBar = tardio('kivymd.uix.progressbar', 'MDProgressBar')
+
+get_rastreador().registrar('importacoes', INICIO_PROCESSO)
 
 # Cores do tema
 PRIMARY_COLOR = [0.129, 0.588, 0.953, 1]  # #2196F3
@@ -69,6 +65,127 @@ SUCCESS_COLOR = [0.298, 0.686, 0.314, 1]  # #4CAF50
 WARNING_COLOR = [1, 0.596, 0, 1]          # #FF9800
 DANGER_COLOR = [0.957, 0.263, 0.212, 1]   # #F44336
 
+# Uso do limite mensal do banco a partir do qual o dashboard alerta
+ALERTA_LIMITE_BANCO = 0.8
+
+# Espera após a última tecla antes de consultar a busca (segundos)
+ATRASO_BUSCA = 0.25
+
+# Linhas por página nas listas paginadas
+TAMANHO_PAGINA = 100
+
+# Telas montadas em segundo plano depois que o login aparece (vazio desliga)
+TELAS_PRECONSTRUIDAS = ('main',)
+ATRASO_PRECONSTRUCAO = 1.0
+
+# Segundos após o primeiro quadro em que o início segue sendo rastreado;
+# RASTRO_INICIO=<arquivo> também grava o rastro nesse arquivo
+JANELA_RASTREAMENTO = 10.0
+
+
+def criar_indicador():
+    """Barra de carregamento fina, invisível quando parada."""
+    return MDProgressBar(type='indeterminate', size_hint_y=None, height=dp(4), opacity=0)
+
+
+class ListaVirtual(RecycleView):
+    """Lista reciclada: as linhas são dicts e só as visíveis viram widgets.
+
+    Cada dict traz as propriedades do ``viewclass`` (``text``,
+    ``secondary_text``, ``on_release``...). ``ao_chegar_ao_fim`` é chamado
+    quando a rolagem chega perto do fim, para carregar a próxima página.
+    """
+    
+    MARGEM_FIM = 0.05
+    
+    def __init__(self, viewclass=TwoLineListItem, altura_linha=dp(72), ao_chegar_ao_fim=None, **kwargs):
+        super().__init__(**kwargs)
+        if isinstance(viewclass, ImportacaoTardia):
+            viewclass = viewclass.resolver()
+        self.viewclass = viewclass
+        self.ao_chegar_ao_fim = ao_chegar_ao_fim
+        
+        layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, altura_linha),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        layout.bind(minimum_height=layout.setter('height'))
+        self.add_widget(layout)
+        self.bind(scroll_y=self._verificar_fim)
+    
+    def definir(self, linhas):
+        """Troca todas as linhas e volta ao topo."""
+        self.data = list(linhas)
+        self.scroll_y = 1
+    
+    def acrescentar(self, linhas):
+        """Acrescenta linhas no fim (próxima página)."""
+        self.data.extend(linhas)
+    
+    def mostrar_erro(self, erro):
+        self.definir([{'text': 'Erro ao carregar', 'secondary_text': str(erro)}])
+    
+    def _verificar_fim(self, instance, valor):
+        if self.ao_chegar_ao_fim is not None and self.data and valor <= self.MARGEM_FIM:
+            self.ao_chegar_ao_fim()
+
+
+class CarregamentoMixin:
+    """Executa as cargas de dados no executor, fora da thread da interface.
+
+    Cada widget é um grupo do executor: uma carga nova descarta a anterior
+    e ``cancelar_cargas`` descarta a que estiver pendente (ao sair da tela).
+    """
+    
+    indicador = None
+    carregando = False
+    
+    @property
+    def grupo_carga(self):
+        return f'{type(self).__name__}:{id(self)}'
+    
+    def carregar(self, funcao, ao_concluir, *args, **kwargs):
+        """Executa ``funcao`` em segundo plano e entrega o resultado a ``ao_concluir``."""
+        self.mostrar_carregando(True)
+        rastreador = get_rastreador()
+        inicio = time.perf_counter()
+        nome = f'carga:{type(self).__name__}.{getattr(funcao, "__name__", "?")}'
+        
+        def concluir(resultado):
+            rastreador.registrar(nome, inicio, categoria='carga')
+            self.mostrar_carregando(False)
+            ao_concluir(resultado)
+        
+        def falhar(erro):
+            rastreador.registrar(nome, inicio, categoria='carga', erro=str(erro))
+            self.mostrar_carregando(False)
+            self.erro_carga(erro)
+        
+        return get_executor().submeter(
+            self.grupo_carga, funcao, *args,
+            ao_concluir=concluir, ao_falhar=falhar, **kwargs
+        )
+    
+    def cancelar_cargas(self, *args):
+        """Descarta a carga pendente deste widget."""
+        get_executor().cancelar(self.grupo_carga)
+        self.mostrar_carregando(False)
+    
+    def mostrar_carregando(self, ativo):
+        self.carregando = ativo
+        if self.indicador is None:
+            return
+        self.indicador.opacity = 1 if ativo else 0
+        if ativo:
+            self.indicador.start()
+        else:
+            self.indicador.stop()
+    
+    def erro_carga(self, erro):
+        print(f"Erro ao carregar dados: {erro}")
+
 
 class LoginScreen(MDScreen):
     """Tela de login."""
@@ -161,7 +278,7 @@ class LoginScreen(MDScreen):
         Snackbar(text=message, bg_color=DANGER_COLOR).open()
 
 
-class DashboardScreen(MDScreen):
+class DashboardScreen(CarregamentoMixin, MDScreen):
     """Tela principal com dashboard."""
     
     def __init__(self, **kwargs):
@@ -181,6 +298,9 @@ class DashboardScreen(MDScreen):
         )
         layout.add_widget(toolbar)
         
+        self.indicador = criar_indicador()
+        layout.add_widget(self.indicador)
+        
         # Conteúdo scrollável
         scroll = MDScrollView()
         content = MDBoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10), size_hint_y=None)
@@ -191,8 +311,8 @@ class DashboardScreen(MDScreen):
         
         self.card_clientes = self.create_kpi_card("Clientes", "0", "account-group", PRIMARY_COLOR)
         self.card_producao = self.create_kpi_card("Em Produção", "0", "factory", WARNING_COLOR)
-        self.card_receber = self.create_kpi_card("A Receber", "R$ 0,00", "cash-remove", DANGER_COLOR)
-        self.card_faturamento = self.create_kpi_card("Faturamento", "R$ 0,00", "chart-line", SUCCESS_COLOR)
+        self.card_receber = self.create_kpi_card("A Receber", format_currency(0), "cash-remove", DANGER_COLOR)
+        self.card_faturamento = self.create_kpi_card("Faturamento", format_currency(0), "chart-line", SUCCESS_COLOR)
         
         self.kpi_layout.add_widget(self.card_clientes)
         self.kpi_layout.add_widget(self.card_producao)
@@ -269,51 +389,51 @@ class DashboardScreen(MDScreen):
     
     def load_data(self, *args):
         """Carrega dados do dashboard."""
-        try:
-            # Clientes
-            from app.services import ClienteService
-            resumo = ClienteService.get_resumo()
-            self.card_clientes.value_label.text = str(resumo.get('total', 0))
-            
-            # Produção
-            from app.services import RemessaService
-            stats = RemessaService.get_estatisticas()
-            self.card_producao.value_label.text = str(stats.get('total_saldo', 0))
-            
-            # A receber
-            from app.services import FinanceiroService
-            totais = FinanceiroService.get_totais()
-            self.card_receber.value_label.text = f"R$ {totais.get('pendente', 0):,.2f}"
-            
-            # Faturamento
-            from datetime import date
-            hoje = date.today()
-            recebido = FinanceiroService.get_monthly_received("Caixa", hoje.year, hoje.month)
-            self.card_faturamento.value_label.text = f"R$ {recebido:,.2f}"
-            
-            # Alertas
-            self.load_alerts()
-            
-        except Exception as e:
-            print(f"Erro ao carregar dashboard: {e}")
+        mes = date.today().strftime('%Y-%m')
+        self.carregar(
+            lambda: (DashboardService.snapshot(top_n=3), FinanceiroService.get_matriz_bancos(mes, mes)),
+            self.mostrar_dados
+        )
     
-    def load_alerts(self):
+    def mostrar_dados(self, dados):
+        """Preenche os cards com o snapshot."""
+        dados, matriz = dados
+        self.card_clientes.value_label.text = str(dados['clientes'])
+        self.card_producao.value_label.text = str(dados['saldo_montar'])
+        self.card_receber.value_label.text = format_currency(dados['pendente'])
+        self.card_faturamento.value_label.text = format_currency(dados['faturamento_mes'])
+        
+        # Alertas
+        self.load_alerts(dados['alertas'], matriz['bancos'])
+    
+    def on_leave(self, *args):
+        self.cancelar_cargas()
+    
+    def load_alerts(self, atrasadas, bancos):
         """Carrega alertas."""
         self.alerts_layout.clear_widgets()
         
-        # Verificar remessas atrasadas
-        from app.dao import RemessaDAO
-        atrasadas = RemessaDAO.get_overdue()
-        
-        if atrasadas:
-            for r in atrasadas[:3]:  # Mostrar apenas 3
-                item = OneLineListItem(
-                    text=f"⚠️ OP {r.id_remessa} atrasada",
-                    theme_text_color='Custom',
-                    text_color=DANGER_COLOR
-                )
-                self.alerts_layout.add_widget(item)
-        else:
+        for r in atrasadas:
+            item = OneLineListItem(
+                text=f"⚠️ OP {r['id_remessa']} atrasada",
+                theme_text_color='Custom',
+                text_color=DANGER_COLOR
+            )
+            self.alerts_layout.add_widget(item)
+        
+        # Bancos perto do limite mensal (matriz só do mês atual)
+        perto_do_limite = [
+            b for b in bancos
+            if (b['celulas'][0]['utilizacao'] or 0) >= ALERTA_LIMITE_BANCO
+        ]
+        for b in perto_do_limite:
+            self.alerts_layout.add_widget(OneLineListItem(
+                text=f"⚠️ {b['banco']}: {b['celulas'][0]['utilizacao']:.0%} do limite mensal",
+                theme_text_color='Custom',
+                text_color=WARNING_COLOR
+            ))
+        
+        if not atrasadas and not perto_do_limite:
             self.alerts_layout.add_widget(MDLabel(
                 text="Nenhum alerta",
                 theme_text_color='Secondary',
@@ -329,7 +449,7 @@ class DashboardScreen(MDScreen):
         self.manager.current = screen_name
 
 
-class ClientesScreen(MDScreen):
+class ClientesScreen(CarregamentoMixin, MDScreen):
     """Tela de clientes."""
     
     def __init__(self, **kwargs):
@@ -356,42 +476,54 @@ class ClientesScreen(MDScreen):
             size_hint_y=None,
             height=dp(50)
         )
-        self.txt_busca.bind(on_text_validate=self.search)
+        self.txt_busca.bind(on_text_validate=self.search, text=self.agendar_busca)
+        self._busca_adiada = Clock.create_trigger(self.executar_busca, ATRASO_BUSCA)
         layout.add_widget(self.txt_busca)
         
+        self.indicador = criar_indicador()
+        layout.add_widget(self.indicador)
+        
         # Lista
-        scroll = MDScrollView()
-        self.lista = MDList()
-        scroll.add_widget(self.lista)
-        layout.add_widget(scroll)
+        self.lista = ListaVirtual()
+        layout.add_widget(self.lista)
         
         self.add_widget(layout)
         Clock.schedule_once(self.load_clientes, 0.5)
     
     def load_clientes(self, *args):
         """Carrega lista de clientes."""
-        self.lista.clear_widgets()
-        
-        try:
-            from app.services import ClienteService
-            clientes = ClienteService.listar_todos()
-            
-            for c in clientes:
-                item = TwoLineListItem(
-                    text=c.nome,
-                    secondary_text=f"{c.id_cliente} | {c.telefone or 'Sem telefone'}",
-                    on_release=lambda x, cid=c.id_cliente: self.view_cliente(cid)
-                )
-                self.lista.add_widget(item)
-                
-        except Exception as e:
-            self.lista.add_widget(OneLineListItem(text=f"Erro: {e}"))
+        self.carregar(ClienteService.listar_todos, self.mostrar_clientes)
+    
+    def mostrar_clientes(self, clientes):
+        """Preenche a lista de clientes."""
+        self.lista.definir({
+            'text': c.nome,
+            'secondary_text': f"{c.id_cliente} | {c.telefone or 'Sem telefone'}",
+            'on_release': lambda cid=c.id_cliente: self.view_cliente(cid)
+        } for c in clientes)
+    
+    def erro_carga(self, erro):
+        self.lista.mostrar_erro(erro)
+    
+    def on_leave(self, *args):
+        self.cancelar_cargas()
+    
+    def agendar_busca(self, instance, texto):
+        """Reagenda a busca a cada tecla (debounce)."""
+        self._busca_adiada.cancel()
+        self._busca_adiada()
     
     def search(self, instance):
-        """Busca clientes."""
-        termo = instance.text
-        # Implementar busca
-        pass
+        """Busca clientes (Enter: sem esperar o atraso)."""
+        self._busca_adiada.cancel()
+        self.executar_busca()
+    
+    def executar_busca(self, *args):
+        termo = self.txt_busca.text.strip()
+        if termo:
+            self.carregar(ClienteService.buscar, self.mostrar_clientes, termo, 50)
+        else:
+            self.load_clientes()
     
     def add_cliente(self):
         """Abre formulário de novo cliente."""
@@ -427,10 +559,10 @@ class ProducaoScreen(MDScreen):
         # Tabs
         tabs = MDTabs()
         
-        tab_abertas = TabProducaoAbertas(title="Em Aberto")
+        self.tab_abertas = TabProducaoAbertas(title="Em Aberto")
         tab_entregues = TabProducaoEntregues(title="Entregues")
         
-        tabs.add_widget(tab_abertas)
+        tabs.add_widget(self.tab_abertas)
         tabs.add_widget(tab_entregues)
         
         layout.add_widget(tabs)
@@ -440,11 +572,14 @@ class ProducaoScreen(MDScreen):
         """Cria nova OP."""
         pass
     
+    def on_leave(self, *args):
+        self.tab_abertas.cancelar_cargas()
+    
     def go_back(self):
         self.manager.current = 'main'
 
 
-class TabProducaoAbertas(MDFloatLayout, MDTabsBase):
+class TabProducaoAbertas(CarregamentoMixin, MDFloatLayout, MDTabsBase):
     """Tab de OPs em aberto."""
     
     def __init__(self, **kwargs):
@@ -452,28 +587,44 @@ class TabProducaoAbertas(MDFloatLayout, MDTabsBase):
         Clock.schedule_once(self.build_ui, 0)
     
     def build_ui(self, *args):
-        scroll = MDScrollView()
-        self.lista = MDList()
-        scroll.add_widget(self.lista)
-        self.add_widget(scroll)
+        self.continuacao = None
+        self.lista = ListaVirtual(ao_chegar_ao_fim=self.proxima_pagina)
+        self.add_widget(self.lista)
+        
+        self.indicador = criar_indicador()
+        self.indicador.pos_hint = {'top': 1}
+        self.add_widget(self.indicador)
         self.load_ops()
     
     def load_ops(self):
-        """Carrega OPs em aberto."""
-        try:
-            from app.dao import RemessaDAO
-            remessas = RemessaDAO.get_all()
-            
-            for r in remessas:
-                if r.saldo_montar > 0:
-                    item = TwoLineListItem(
-                        text=f"{r.id_remessa} - {r.modelo}",
-                        secondary_text=f"Saldo: {r.saldo_montar} | Cliente: {r.id_cliente}",
-                        on_release=lambda x, rid=r.id_remessa: self.registrar_entrega(rid)
-                    )
-                    self.lista.add_widget(item)
-        except Exception as e:
-            self.lista.add_widget(OneLineListItem(text=f"Erro: {e}"))
+        """Carrega a primeira página de OPs em aberto."""
+        self.carregar(self.buscar_pagina, self.mostrar_ops, None)
+    
+    def proxima_pagina(self):
+        """Carrega a próxima página, se houver e se nenhuma estiver a caminho."""
+        if self.continuacao and not self.carregando:
+            self.carregar(self.buscar_pagina, self.mostrar_ops, self.continuacao)
+    
+    def buscar_pagina(self, continuacao):
+        """Roda no executor: busca a página e já monta as linhas."""
+        pagina = RemessaService.listar_pagina(status='Em Aberto', limite=TAMANHO_PAGINA, continuacao=continuacao)
+        linhas = [{
+            'text': f"{r.id_remessa} - {r.modelo}",
+            'secondary_text': f"Saldo: {r.saldo_montar} | Cliente: {r.id_cliente}",
+            'on_release': lambda rid=r.id_remessa: self.registrar_entrega(rid)
+        } for r in pagina['itens']]
+        return continuacao, linhas, pagina['continuacao']
+    
+    def mostrar_ops(self, resultado):
+        """Preenche (ou estende) a lista de OPs."""
+        continuacao, linhas, self.continuacao = resultado
+        if continuacao is None:
+            self.lista.definir(linhas)
+        else:
+            self.lista.acrescentar(linhas)
+    
+    def erro_carga(self, erro):
+        self.lista.mostrar_erro(erro)
     
     def registrar_entrega(self, op_id):
         """Registra entrega da OP."""
@@ -494,7 +645,7 @@ class TabProducaoEntregues(MDFloatLayout, MDTabsBase):
         self.add_widget(scroll)
 
 
-class FinanceiroScreen(MDScreen):
+class FinanceiroScreen(CarregamentoMixin, MDScreen):
     """Tela financeira."""
     
     def __init__(self, **kwargs):
@@ -511,13 +662,16 @@ class FinanceiroScreen(MDScreen):
         )
         layout.add_widget(toolbar)
         
+        self.indicador = criar_indicador()
+        layout.add_widget(self.indicador)
+        
         # Resumo
         card = MDCard(orientation='vertical', padding=dp(15), elevation=2)
         card.add_widget(MDLabel(text="Resumo", font_style='H6'))
         
-        self.lbl_pendente = MDLabel(text="A Receber: R$ 0,00", theme_text_color='Custom', text_color=WARNING_COLOR)
-        self.lbl_vencido = MDLabel(text="Vencido: R$ 0,00", theme_text_color='Custom', text_color=DANGER_COLOR)
-        self.lbl_recebido = MDLabel(text="Recebido: R$ 0,00", theme_text_color='Custom', text_color=SUCCESS_COLOR)
+        self.lbl_pendente = MDLabel(text=f"A Receber: {format_currency(0)}", theme_text_color='Custom', text_color=WARNING_COLOR)
+        self.lbl_vencido = MDLabel(text=f"Vencido: {format_currency(0)}", theme_text_color='Custom', text_color=DANGER_COLOR)
+        self.lbl_recebido = MDLabel(text=f"Recebido: {format_currency(0)}", theme_text_color='Custom', text_color=SUCCESS_COLOR)
         
         card.add_widget(self.lbl_pendente)
         card.add_widget(self.lbl_vencido)
@@ -526,38 +680,57 @@ class FinanceiroScreen(MDScreen):
         layout.add_widget(card)
         
         # Lista
-        scroll = MDScrollView()
-        self.lista = MDList()
-        scroll.add_widget(self.lista)
-        layout.add_widget(scroll)
+        self.continuacao = None
+        self.lista = ListaVirtual(ao_chegar_ao_fim=self.proxima_pagina)
+        layout.add_widget(self.lista)
         
         self.add_widget(layout)
         Clock.schedule_once(self.load_data, 0.5)
     
     def load_data(self, *args):
-        """Carrega dados financeiros."""
-        try:
-            from app.services import FinanceiroService
-            totais = FinanceiroService.get_totais()
-            
-            self.lbl_pendente.text = f"A Receber: R$ {totais.get('pendente', 0):,.2f}"
-            self.lbl_recebido.text = f"Recebido: R$ {totais.get('recebido', 0):,.2f}"
-            
-            # Carregar títulos
-            from app.dao import FinanceiroDAO
-            titulos = FinanceiroDAO.get_all()
-            
-            for t in titulos:
-                if t['status'] == 'Pendente':
-                    item = TwoLineListItem(
-                        text=f"R$ {t['valor_receber']:,.2f} - {t.get('cliente_nome', 'N/A')}",
-                        secondary_text=f"Venc: {t['data_vencimento']}",
-                        on_release=lambda x, tid=t['id']: self.liquidar(tid)
-                    )
-                    self.lista.add_widget(item)
-                    
-        except Exception as e:
-            print(f"Erro: {e}")
+        """Carrega o resumo e a primeira página de títulos pendentes."""
+        self.carregar(
+            lambda: (
+                FinanceiroService.get_totais(),
+                FinanceiroService.get_aging(),
+                self.buscar_pagina(None)
+            ),
+            self.mostrar_dados
+        )
+    
+    def proxima_pagina(self):
+        """Carrega a próxima página de títulos, se houver."""
+        if self.continuacao and not self.carregando:
+            self.carregar(self.buscar_pagina, self.mostrar_titulos, self.continuacao)
+    
+    def buscar_pagina(self, continuacao):
+        """Roda no executor: busca a página e já monta as linhas."""
+        pagina = FinanceiroService.get_pagina(status='Pendente', limite=TAMANHO_PAGINA, continuacao=continuacao)
+        linhas = [{
+            'text': f"{format_currency(t['valor_receber'])} - {t.get('cliente_nome') or 'N/A'}",
+            'secondary_text': f"Venc: {t['data_vencimento']}",
+            'on_release': lambda tid=t['id']: self.liquidar(tid)
+        } for t in pagina['itens']]
+        return continuacao, linhas, pagina['continuacao']
+    
+    def mostrar_dados(self, dados):
+        """Preenche o resumo e a lista de títulos pendentes."""
+        totais, aging, pagina = dados
+        
+        self.lbl_pendente.text = f"A Receber: {format_currency(totais.get('pendente', 0))}"
+        self.lbl_vencido.text = f"Vencido: {format_currency(aging['total']['vencido'])}"
+        self.lbl_recebido.text = f"Recebido: {format_currency(totais.get('recebido', 0))}"
+        self.mostrar_titulos(pagina)
+    
+    def mostrar_titulos(self, resultado):
+        continuacao, linhas, self.continuacao = resultado
+        if continuacao is None:
+            self.lista.definir(linhas)
+        else:
+            self.lista.acrescentar(linhas)
+    
+    def on_leave(self, *args):
+        self.cancelar_cargas()
     
     def liquidar(self, fin_id):
         """Liquida título."""
@@ -577,59 +750,44 @@ class MainScreen(MDScreen):
     def build_ui(self):
         layout = MDBoxLayout(orientation='vertical')
         
-        # Bottom Navigation
+        # Bottom Navigation: só a aba inicial é montada agora; as outras,
+        # na primeira vez que forem abertas
         bottom_nav = MDBottomNavigation()
+        self.conteudos = {}
+        
+        abas = [
+            ('dash', 'Início', 'home', DashboardContent),
+            ('clientes', 'Clientes', 'account-group', ClientesContent),
+            ('producao', 'Produção', 'factory', ProducaoContent),
+            ('financeiro', 'Financeiro', 'cash-multiple', FinanceiroContent),
+            ('mais', 'Mais', 'dots-horizontal', MaisContent),
+        ]
         
-        # Aba Dashboard
-        dash_item = MDBottomNavigationItem(
-            name='dash',
-            text='Início',
-            icon='home'
-        )
-        dash_item.add_widget(DashboardContent())
-        bottom_nav.add_widget(dash_item)
-        
-        # Aba Clientes
-        cli_item = MDBottomNavigationItem(
-            name='clientes',
-            text='Clientes',
-            icon='account-group'
-        )
-        cli_item.add_widget(ClientesContent())
-        bottom_nav.add_widget(cli_item)
-        
-        # Aba Produção
-        prod_item = MDBottomNavigationItem(
-            name='producao',
-            text='Produção',
-            icon='factory'
-        )
-        prod_item.add_widget(ProducaoContent())
-        bottom_nav.add_widget(prod_item)
-        
-        # Aba Financeiro
-        fin_item = MDBottomNavigationItem(
-            name='financeiro',
-            text='Financeiro',
-            icon='cash-multiple'
-        )
-        fin_item.add_widget(FinanceiroContent())
-        bottom_nav.add_widget(fin_item)
-        
-        # Aba Mais
-        mais_item = MDBottomNavigationItem(
-            name='mais',
-            text='Mais',
-            icon='dots-horizontal'
-        )
-        mais_item.add_widget(MaisContent())
-        bottom_nav.add_widget(mais_item)
+        for nome, texto, icone, classe in abas:
+            item = MDBottomNavigationItem(name=nome, text=texto, icon=icone)
+            item.bind(on_pre_enter=lambda item, c=classe: self.montar_aba(item, c))
+            bottom_nav.add_widget(item)
+            if nome == 'dash':
+                self.montar_aba(item, classe)
         
         layout.add_widget(bottom_nav)
         self.add_widget(layout)
+    
+    def montar_aba(self, item, classe):
+        """Cria o conteúdo da aba na primeira visita; depois só o reaproveita."""
+        if item.name in self.conteudos:
+            return self.conteudos[item.name]
+        
+        with get_rastreador().span(f'aba:{item.name}'):
+            conteudo = classe()
+            item.add_widget(conteudo)
+        if isinstance(conteudo, CarregamentoMixin):
+            item.bind(on_leave=conteudo.cancelar_cargas)
+        self.conteudos[item.name] = conteudo
+        return conteudo
 
 
-class DashboardContent(MDBoxLayout):
+class DashboardContent(CarregamentoMixin, MDBoxLayout):
     """Conteúdo da aba Dashboard."""
     
     def __init__(self, **kwargs):
@@ -641,13 +799,21 @@ class DashboardContent(MDBoxLayout):
         content = MDBoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10), size_hint_y=None)
         content.bind(minimum_height=content.setter('height'))
         
+        self.indicador = criar_indicador()
+        self.add_widget(self.indicador)
+        
         # KPIs
         kpi_grid = MDGridLayout(cols=2, spacing=dp(10), size_hint_y=None, height=dp(200))
         
-        kpi_grid.add_widget(self.create_kpi_card("Clientes", "0", "account-group", PRIMARY_COLOR))
-        kpi_grid.add_widget(self.create_kpi_card("Produção", "0", "package-variant", WARNING_COLOR))
-        kpi_grid.add_widget(self.create_kpi_card("A Receber", "R$ 0", "cash-remove", DANGER_COLOR))
-        kpi_grid.add_widget(self.create_kpi_card("Faturamento", "R$ 0", "trending-up", SUCCESS_COLOR))
+        self.card_clientes = self.create_kpi_card("Clientes", "0", "account-group", PRIMARY_COLOR)
+        self.card_producao = self.create_kpi_card("Produção", "0", "package-variant", WARNING_COLOR)
+        self.card_receber = self.create_kpi_card("A Receber", format_currency(0), "cash-remove", DANGER_COLOR)
+        self.card_faturamento = self.create_kpi_card("Faturamento", format_currency(0), "trending-up", SUCCESS_COLOR)
+        
+        kpi_grid.add_widget(self.card_clientes)
+        kpi_grid.add_widget(self.card_producao)
+        kpi_grid.add_widget(self.card_receber)
+        kpi_grid.add_widget(self.card_faturamento)
         
         content.add_widget(kpi_grid)
         
@@ -664,6 +830,19 @@ class DashboardContent(MDBoxLayout):
         
         scroll.add_widget(content)
         self.add_widget(scroll)
+        
+        self.load_data()
+    
+    def load_data(self, *args):
+        """Carrega os KPIs do dashboard."""
+        self.carregar(DashboardService.snapshot, self.mostrar_dados)
+    
+    def mostrar_dados(self, dados):
+        """Preenche os cards com o snapshot."""
+        self.card_clientes.value_label.text = str(dados['clientes'])
+        self.card_producao.value_label.text = str(dados['saldo_montar'])
+        self.card_receber.value_label.text = format_currency(dados['pendente'])
+        self.card_faturamento.value_label.text = format_currency(dados['faturamento_mes'])
     
     def create_kpi_card(self, title, value, icon, color):
         card = MDCard(orientation='vertical', padding=dp(10), elevation=2, size_hint_y=None, height=dp(90))
@@ -673,11 +852,13 @@ class DashboardContent(MDBoxLayout):
         box.add_widget(MDIconButton(icon=icon, theme_text_color='Custom', text_color=color))
         
         vbox = MDBoxLayout(orientation='vertical')
-        vbox.add_widget(MDLabel(text=value, font_style='H5', theme_text_color='Primary'))
+        lbl_value = MDLabel(text=value, font_style='H5', theme_text_color='Primary')
+        vbox.add_widget(lbl_value)
         vbox.add_widget(MDLabel(text=title, font_style='Caption', theme_text_color='Secondary'))
         box.add_widget(vbox)
         
         card.add_widget(box)
+        card.value_label = lbl_value
         return card
     
     def create_action_btn(self, text, icon, screen):
@@ -690,11 +871,10 @@ class DashboardContent(MDBoxLayout):
     
     def change_screen(self, screen):
         """Muda para tela específica."""
-        # Navegar para tela
-        pass
+        App.get_running_app().root.current = screen
 
 
-class ClientesContent(MDBoxLayout):
+class ClientesContent(CarregamentoMixin, MDBoxLayout):
     """Conteúdo da aba Clientes."""
     
     def __init__(self, **kwargs):
@@ -709,13 +889,16 @@ class ClientesContent(MDBoxLayout):
             mode="rectangle",
             size_hint_y=None
         )
+        self.txt_busca.bind(on_text_validate=self.executar_busca, text=self.agendar_busca)
+        self._busca_adiada = Clock.create_trigger(self.executar_busca, ATRASO_BUSCA)
         self.add_widget(self.txt_busca)
         
+        self.indicador = criar_indicador()
+        self.add_widget(self.indicador)
+        
         # Lista
-        scroll = MDScrollView()
-        self.lista = MDList()
-        scroll.add_widget(self.lista)
-        self.add_widget(scroll)
+        self.lista = ListaVirtual()
+        self.add_widget(self.lista)
         
         # FAB
         fab = MDFloatingActionButton(
@@ -729,18 +912,27 @@ class ClientesContent(MDBoxLayout):
     
     def load_clientes(self):
         """Carrega clientes."""
-        try:
-            from app.services import ClienteService
-            clientes = ClienteService.listar_todos()
-            
-            for c in clientes:
-                item = TwoLineListItem(
-                    text=c.nome,
-                    secondary_text=c.id_cliente
-                )
-                self.lista.add_widget(item)
-        except Exception as e:
-            self.lista.add_widget(OneLineListItem(text=f"Erro: {e}"))
+        self.carregar(ClienteService.listar_todos, self.mostrar_clientes)
+    
+    def mostrar_clientes(self, clientes):
+        """Preenche a lista de clientes."""
+        self.lista.definir({'text': c.nome, 'secondary_text': c.id_cliente} for c in clientes)
+    
+    def erro_carga(self, erro):
+        self.lista.mostrar_erro(erro)
+    
+    def agendar_busca(self, instance, texto):
+        """Reagenda a busca a cada tecla (debounce)."""
+        self._busca_adiada.cancel()
+        self._busca_adiada()
+    
+    def executar_busca(self, *args):
+        self._busca_adiada.cancel()
+        termo = self.txt_busca.text.strip()
+        if termo:
+            self.carregar(ClienteService.buscar, self.mostrar_clientes, termo, 50)
+        else:
+            self.load_clientes()
     
     def novo_cliente(self):
         """Abre formulário."""
@@ -777,7 +969,7 @@ class TabEntregues(MDFloatLayout, MDTabsBase):
     pass
 
 
-class FinanceiroContent(MDBoxLayout):
+class FinanceiroContent(CarregamentoMixin, MDBoxLayout):
     """Conteúdo da aba Financeiro."""
     
     def __init__(self, **kwargs):
@@ -790,27 +982,50 @@ class FinanceiroContent(MDBoxLayout):
         card.add_widget(MDLabel(text="Resumo do Mês", font_style='H6'))
         
         grid = MDGridLayout(cols=3)
-        grid.add_widget(self.create_resumo_item("A Receber", "R$ 0", WARNING_COLOR))
-        grid.add_widget(self.create_resumo_item("Vencido", "R$ 0", DANGER_COLOR))
-        grid.add_widget(self.create_resumo_item("Recebido", "R$ 0", SUCCESS_COLOR))
+        self.item_pendente = self.create_resumo_item("A Receber", format_currency(0), WARNING_COLOR)
+        self.item_vencido = self.create_resumo_item("Vencido", format_currency(0), DANGER_COLOR)
+        self.item_recebido = self.create_resumo_item("Recebido", format_currency(0), SUCCESS_COLOR)
+        grid.add_widget(self.item_pendente)
+        grid.add_widget(self.item_vencido)
+        grid.add_widget(self.item_recebido)
         card.add_widget(grid)
         
         self.add_widget(card)
         
+        self.indicador = criar_indicador()
+        self.add_widget(self.indicador)
+        
         # Lista
         scroll = MDScrollView()
         self.lista = MDList()
         scroll.add_widget(self.lista)
         self.add_widget(scroll)
+        
+        self.load_data()
+    
+    def load_data(self, *args):
+        """Carrega o resumo financeiro."""
+        self.carregar(
+            lambda: (FinanceiroService.get_totais(), FinanceiroService.get_aging()),
+            self.mostrar_dados
+        )
+    
+    def mostrar_dados(self, dados):
+        totais, aging = dados
+        self.item_pendente.value_label.text = format_currency(totais.get('pendente', 0))
+        self.item_vencido.value_label.text = format_currency(aging['total']['vencido'])
+        self.item_recebido.value_label.text = format_currency(totais.get('recebido', 0))
     
     def create_resumo_item(self, label, value, color):
         box = MDBoxLayout(orientation='vertical')
-        box.add_widget(MDLabel(text=value, halign='center', theme_text_color='Custom', text_color=color))
+        lbl_value = MDLabel(text=value, halign='center', theme_text_color='Custom', text_color=color)
+        box.add_widget(lbl_value)
         box.add_widget(MDLabel(text=label, halign='center', font_style='Caption'))
+        box.value_label = lbl_value
         return box
 
 
-class MaisContent(MDBoxLayout):
+class MaisContent(CarregamentoMixin, MDBoxLayout):
     """Conteúdo da aba Mais."""
     
     def __init__(self, **kwargs):
@@ -826,6 +1041,8 @@ class MaisContent(MDBoxLayout):
             ("Despesas", "cash-minus", 'despesas'),
             ("Relatórios", "chart-bar", 'relatorios'),
             ("Backup", "cloud-upload", 'backup'),
+            ("Tempo de início", "timer-outline", 'inicio'),
+            ("Métricas do banco", "database-clock", 'metricas'),
             ("Configurações", "cog", 'config'),
             ("Sobre", "information", 'sobre'),
             ("Sair", "logout", 'sair'),
@@ -843,37 +1060,257 @@ class MaisContent(MDBoxLayout):
     
     def on_item_click(self, action):
         """Trata clique no item."""
-        if action == 'sair':
+        if action == 'backup':
+            self.fazer_backup()
+        elif action == 'relatorios':
+            self.abrir_relatorio_bancos()
+        elif action == 'inicio':
+            self.abrir_tempos_inicio()
+        elif action == 'metricas':
+            self.abrir_metricas_banco()
+        elif action == 'config':
+            self.abrir_configuracoes()
+        elif action == 'sair':
             App.get_running_app().stop()
+    
+    def fazer_backup(self):
+        """Roda o backup em segundo plano mostrando o progresso."""
+        conteudo = MDBoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None, height=dp(60))
+        self.lbl_backup = MDLabel(text="Iniciando...", theme_text_color='Secondary')
+        self.barra_backup = MDProgressBar(value=0)
+        conteudo.add_widget(self.lbl_backup)
+        conteudo.add_widget(self.barra_backup)
+        
+        self.dialog = MDDialog(title="Backup", type="custom", content_cls=conteudo, auto_dismiss=False)
+        self.dialog.open()
+        
+        def progresso(info):
+            Clock.schedule_once(lambda dt: self.mostrar_progresso_backup(info))
+        
+        get_executor().submeter(
+            'backup', BackupService.backup, progresso,
+            ao_concluir=self.concluir_backup,
+            ao_falhar=lambda erro: self.concluir_backup({'sucesso': False, 'mensagem': str(erro)})
+        )
+    
+    def mostrar_progresso_backup(self, info):
+        """Atualiza a barra de progresso do backup."""
+        self.barra_backup.value = info['percentual']
+        self.lbl_backup.text = info['mensagem']
+    
+    def concluir_backup(self, resultado):
+        """Fecha o diálogo e mostra o resultado do backup."""
+        self.dialog.dismiss()
+        cor = SUCCESS_COLOR if resultado['sucesso'] else DANGER_COLOR
+        Snackbar(text=resultado['mensagem'], bg_color=cor).open()
+    
+    def abrir_relatorio_bancos(self):
+        """Mostra o recebido por banco nos últimos meses e o uso do limite."""
+        self.carregar(FinanceiroService.get_matriz_bancos, self.mostrar_relatorio_bancos)
+    
+    def mostrar_relatorio_bancos(self, matriz):
+        itens = []
+        for b in matriz['bancos']:
+            atual = b['celulas'][-1]
+            uso = f" ({atual['utilizacao']:.0%} do limite)" if atual['utilizacao'] is not None else ""
+            historico = " | ".join(f"{c['mes'][5:]}/{c['mes'][2:4]}: {format_currency(c['recebido'])}" for c in b['celulas'][:-1])
+            itens.append(TwoLineListItem(
+                text=f"{b['banco']}: {format_currency(atual['recebido'])}{uso}",
+                secondary_text=historico
+            ))
+        
+        self.dialog = MDDialog(title="Recebido por banco", type="simple", items=itens)
+        self.dialog.open()
+    
+    def abrir_tempos_inicio(self):
+        """Compara os últimos lançamentos do app, fase a fase."""
+        self.carregar(listar_lancamentos, self.mostrar_tempos_inicio)
+    
+    def mostrar_tempos_inicio(self, lancamentos):
+        itens = []
+        for l in lancamentos:
+            fases = sorted(l['fases'].items(), key=lambda f: f[1], reverse=True)[:3]
+            itens.append(TwoLineListItem(
+                text=f"{l['data'] or l['arquivo']}: {l['total_ms']:,.0f} ms",
+                secondary_text=" | ".join(f"{nome} {ms:,.0f}" for nome, ms in fases)
+            ))
+        if not itens:
+            itens.append(OneLineListItem(text="Nenhum lançamento registrado"))
+        
+        self.dialog = MDDialog(title="Tempo de início", type="simple", items=itens)
+        self.dialog.open()
+    
+    def abrir_metricas_banco(self):
+        """Mostra os services e consultas mais caros e as consultas lentas."""
+        from app.services import ConfiguracaoService
+        self.carregar(ConfiguracaoService.get_metricas_banco, self.mostrar_metricas_banco)
+    
+    def mostrar_metricas_banco(self, resumo):
+        itens = [OneLineListItem(
+            text="Desligar coleta" if resumo['ativo'] else "Ligar coleta",
+            on_release=lambda x: self.definir_metricas_banco(not resumo['ativo'])
+        ), OneLineListItem(
+            text=f"Exportar para arquivo ({len(resumo['lentas'])} lentas)",
+            on_release=lambda x: self.exportar_metricas_banco()
+        )]
+        for s in resumo['servicos'][:5]:
+            itens.append(TwoLineListItem(
+                text=s['servico'],
+                secondary_text=f"{s['contagem']}x  p50 {s['p50_ms']:.1f}  p95 {s['p95_ms']:.1f}  máx {s['max_ms']:.1f} ms"
+            ))
+        for c in resumo['consultas'][:5]:
+            itens.append(TwoLineListItem(
+                text=c['sql'][:60],
+                secondary_text=f"{c['contagem']}x  p95 {c['p95_ms']:.1f} ms  {c['linhas']} linhas"
+            ))
+        
+        self.dialog = MDDialog(title="Métricas do banco", type="simple", items=itens)
+        self.dialog.open()
+    
+    def definir_metricas_banco(self, ativo):
+        from app.services import ConfiguracaoService
+        self.dialog.dismiss()
+        self.carregar(ConfiguracaoService.definir_metricas_banco, self.mostrar_resultado_metricas, ativo)
+    
+    def exportar_metricas_banco(self):
+        from app.services import ConfiguracaoService
+        self.dialog.dismiss()
+        self.carregar(ConfiguracaoService.exportar_metricas_banco, self.mostrar_resultado_metricas)
+    
+    def mostrar_resultado_metricas(self, resultado):
+        cor = SUCCESS_COLOR if resultado['sucesso'] else DANGER_COLOR
+        Snackbar(text=resultado['mensagem'], bg_color=cor).open()
+    
+    def abrir_configuracoes(self):
+        """Mostra a escolha do perfil do banco de dados."""
+        from app.services import ConfiguracaoService
+        self.carregar(ConfiguracaoService.get_perfil_banco, self.mostrar_configuracoes)
+    
+    def mostrar_configuracoes(self, atual):
+        from app.services import ConfiguracaoService
+        itens = []
+        for perfil in ConfiguracaoService.listar_perfis_banco():
+            marcador = "● " if perfil == atual else ""
+            itens.append(OneLineListItem(
+                text=f"{marcador}{perfil}",
+                on_release=lambda x, p=perfil: self.escolher_perfil(p)
+            ))
+        
+        self.dialog = MDDialog(title="Perfil do banco de dados", type="simple", items=itens)
+        self.dialog.open()
+    
+    def escolher_perfil(self, perfil):
+        """Aplica o perfil escolhido."""
+        from app.services import ConfiguracaoService
+        self.dialog.dismiss()
+        self.carregar(ConfiguracaoService.definir_perfil_banco, self.mostrar_resultado_perfil, perfil)
+    
+    def mostrar_resultado_perfil(self, resultado):
+        cor = SUCCESS_COLOR if resultado['sucesso'] else DANGER_COLOR
+        Snackbar(text=resultado['mensagem'], bg_color=cor).open()
+
+
+class GerenciadorTelas(ScreenManager):
+    """ScreenManager que cria cada tela na primeira navegação.
+
+    As telas são registradas com uma fábrica; ``current = nome`` (o que o
+    resto do app já usa) monta a tela se ela ainda não existir, e ela fica
+    em memória depois disso. ``preconstruir`` monta telas aos poucos, uma
+    por quadro, enquanto o usuário ainda está no login.
+    """
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._fabricas = {}
+    
+    def registrar(self, nome, fabrica):
+        self._fabricas[nome] = fabrica
+    
+    def obter(self, nome):
+        """Retorna a tela, criando-a se for preciso."""
+        if not self.has_screen(nome):
+            with get_rastreador().span(f'tela:{nome}'):
+                self.add_widget(self._fabricas[nome](name=nome))
+        return self.get_screen(nome)
+    
+    def on_current(self, instance, value):
+        if value is not None and value in self._fabricas:
+            self.obter(value)
+        super().on_current(instance, value)
+    
+    def preconstruir(self, nomes, intervalo=0.1):
+        """Monta as telas em ``nomes`` em quadros separados, sem travar a interface."""
+        pendentes = [n for n in nomes if not self.has_screen(n)]
+        
+        def proxima(dt):
+            if pendentes:
+                self.obter(pendentes.pop(0))
+                Clock.schedule_once(proxima, intervalo)
+        
+        Clock.schedule_once(proxima, intervalo)
 
 
 class FaccaoApp(MDApp):
     """App principal."""
     
     def build(self):
-        self.theme_cls.primary_palette = 'Blue'
-        self.theme_cls.accent_palette = 'Green'
-        self.theme_cls.theme_style = 'Light'
-        
-        # Inicializar banco
-        self.init_database()
-        
-        # Criar screen manager
-        sm = ScreenManager()
-        sm.add_widget(LoginScreen(name='login'))
-        sm.add_widget(MainScreen(name='main'))
-        sm.add_widget(ClientesScreen(name='clientes'))
-        sm.add_widget(ProducaoScreen(name='producao'))
-        sm.add_widget(FinanceiroScreen(name='financeiro'))
+        rastreador = get_rastreador()
+        with rastreador.span('build'):
+            self.theme_cls.primary_palette = 'Blue'
+            self.theme_cls.accent_palette = 'Green'
+            self.theme_cls.theme_style = 'Light'
+            
+            # Inicializar banco
+            self.init_database()
+            
+            # Criar screen manager: só o login agora, o resto sob demanda
+            sm = GerenciadorTelas()
+            sm.registrar('login', LoginScreen)
+            sm.registrar('main', MainScreen)
+            sm.registrar('clientes', ClientesScreen)
+            sm.registrar('producao', ProducaoScreen)
+            sm.registrar('financeiro', FinanceiroScreen)
+            sm.current = 'login'
         
         return sm
     
+    def on_start(self):
+        Clock.schedule_once(self.primeiro_quadro, 0)
+        
+        # A tela principal fica pronta enquanto o usuário digita a senha
+        if TELAS_PRECONSTRUIDAS:
+            Clock.schedule_once(lambda dt: self.root.preconstruir(TELAS_PRECONSTRUIDAS), ATRASO_PRECONSTRUCAO)
+    
+    def primeiro_quadro(self, dt):
+        get_rastreador().marcar('primeiro_quadro')
+        Clock.schedule_once(self.finalizar_rastreamento, JANELA_RASTREAMENTO)
+    
+    def finalizar_rastreamento(self, *args):
+        """Encerra o rastro do início e guarda em disco para comparação."""
+        rastreador = get_rastreador()
+        if not rastreador.ativo:
+            return
+        rastreador.encerrar()
+        try:
+            rastreador.salvar()
+            destino = os.environ.get('RASTRO_INICIO')
+            if destino:
+                with open(destino, 'w', encoding='utf-8') as f:
+                    json.dump(rastreador.exportar(), f, indent=1)
+        except OSError as e:
+            print(f"Erro ao salvar rastro do início: {e}")
+    
     def init_database(self):
         """Inicializa banco de dados."""
         try:
-            init_db()
+            with get_rastreador().span('init_db'):
+                init_db()
         except Exception as e:
             print(f"Erro ao inicializar DB: {e}")
+    
+    def on_stop(self):
+        self.finalizar_rastreamento()
+        get_executor().encerrar()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,328 @@
+"""
+Métricas do banco: tempo por consulta e por método de service.
+
+Com a coleta ligada, as conexões do pool são ``ConexaoMedida`` e os
+cursores ``CursorMedido``: cada comando é cronometrado no ``execute`` e nos
+``fetch*``, com a contagem de linhas lidas por ``fetch*`` e de passos da VM
+do SQLite (pelo progress handler). O SQL é agrupado já normalizado, sem
+literais, e o log de consultas lentas guarda só os tipos dos parâmetros,
+nunca os valores.
+
+A coleta é desligada por padrão (o pool abre conexões ``sqlite3`` comuns);
+liga com ``METRICAS_BANCO=1`` no ambiente ou pela tela de métricas.
+"""
+import functools
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, Optional
+
+# Consultas acima disso (ms) entram no log de lentas
+LIMITE_LENTA_MS = 50.0
+LENTAS_GUARDADAS = 100
+
+# Amostras guardadas por histograma (as mais recentes) para os percentis
+AMOSTRAS = 512
+
+# Consultas distintas acompanhadas; as demais caem em OUTRAS
+MAX_CONSULTAS = 500
+OUTRAS = '<outras consultas>'
+
+# O progress handler roda a cada tantas instruções da VM
+PASSOS_PROGRESSO = 1000
+
+_ESPACOS = re.compile(r'\s+')
+_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_NUMERO = re.compile(r'\b\d+(?:\.\d+)?\b')
+_LISTA = re.compile(r'\?(?:\s*,\s*\?)+')
+
+
+def normalizar_sql(sql: str) -> str:
+    """SQL numa linha só, sem literais e com listas ``?, ?, ?`` colapsadas."""
+    sql = _ESPACOS.sub(' ', sql).strip()
+    sql = _TEXTO.sub('?', sql)
+    sql = _NUMERO.sub('?', sql)
+    return _LISTA.sub('?, ...', sql)
+
+
+def redigir_parametros(parametros) -> object:
+    """Troca os valores dos parâmetros pelos seus tipos."""
+    if isinstance(parametros, dict):
+        return {nome: type(valor).__name__ for nome, valor in parametros.items()}
+    try:
+        return [type(valor).__name__ for valor in parametros]
+    except TypeError:
+        return type(parametros).__name__
+
+
+class Histograma:
+    """Contagem, total e máximo exatos; p50/p95 sobre as amostras recentes."""
+
+    __slots__ = ('contagem', 'total', 'maximo', '_amostras')
+
+    def __init__(self, amostras: int = AMOSTRAS):
+        self.contagem = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self._amostras: Deque[float] = deque(maxlen=amostras)
+
+    def adicionar(self, valor: float):
+        self.contagem += 1
+        self.total += valor
+        if valor > self.maximo:
+            self.maximo = valor
+        self._amostras.append(valor)
+
+    def percentil(self, p: float) -> float:
+        if not self._amostras:
+            return 0.0
+        ordenadas = sorted(self._amostras)
+        return ordenadas[min(int(len(ordenadas) * p), len(ordenadas) - 1)]
+
+    def resumo(self) -> Dict:
+        return {
+            'contagem': self.contagem,
+            'p50_ms': round(self.percentil(0.50), 3),
+            'p95_ms': round(self.percentil(0.95), 3),
+            'max_ms': round(self.maximo, 3),
+            'total_ms': round(self.total, 3),
+        }
+
+
+class MetricasBanco:
+    """Acumula as medições das consultas e dos services."""
+
+    def __init__(self, ativo: bool = True, limite_lenta_ms: float = LIMITE_LENTA_MS):
+        self.ativo = ativo
+        self.limite_lenta_ms = limite_lenta_ms
+        self._lock = threading.Lock()
+        self.limpar()
+
+    def limpar(self):
+        """Zera todas as métricas."""
+        with self._lock:
+            self._consultas: Dict[str, Histograma] = {}
+            self._linhas: Dict[str, int] = {}
+            self._passos: Dict[str, int] = {}
+            self._servicos: Dict[str, Histograma] = {}
+            self._lentas: Deque[Dict] = deque(maxlen=LENTAS_GUARDADAS)
+            self._desde = datetime.now().isoformat(timespec='seconds')
+
+    def registrar_consulta(self, sql: str, duracao_ms: float, linhas: int = 0,
+                           parametros=(), passos: int = 0):
+        """Registra um comando executado."""
+        chave = normalizar_sql(sql)
+        with self._lock:
+            if chave not in self._consultas and len(self._consultas) >= MAX_CONSULTAS:
+                chave = OUTRAS
+            histograma = self._consultas.get(chave)
+            if histograma is None:
+                histograma = self._consultas[chave] = Histograma()
+            histograma.adicionar(duracao_ms)
+            self._linhas[chave] = self._linhas.get(chave, 0) + linhas
+            self._passos[chave] = self._passos.get(chave, 0) + passos
+
+            if duracao_ms >= self.limite_lenta_ms:
+                self._lentas.append({
+                    'quando': datetime.now().isoformat(timespec='seconds'),
+                    'sql': chave,
+                    'parametros': redigir_parametros(parametros),
+                    'duracao_ms': round(duracao_ms, 3),
+                    'linhas': linhas,
+                    'passos_vm': passos,
+                })
+
+    def registrar_servico(self, nome: str, duracao_ms: float):
+        """Registra uma chamada de método de service."""
+        with self._lock:
+            histograma = self._servicos.get(nome)
+            if histograma is None:
+                histograma = self._servicos[nome] = Histograma()
+            histograma.adicionar(duracao_ms)
+
+    def resumo(self) -> Dict:
+        """Métricas atuais, do maior tempo total para o menor."""
+        with self._lock:
+            consultas = [
+                dict(sql=sql, linhas=self._linhas[sql], passos_vm=self._passos[sql], **h.resumo())
+                for sql, h in self._consultas.items()
+            ]
+            servicos = [dict(servico=nome, **h.resumo()) for nome, h in self._servicos.items()]
+            lentas = list(self._lentas)
+            desde = self._desde
+
+        consultas.sort(key=lambda c: c['total_ms'], reverse=True)
+        servicos.sort(key=lambda s: s['total_ms'], reverse=True)
+        return {
+            'ativo': self.ativo,
+            'desde': desde,
+            'limite_lenta_ms': self.limite_lenta_ms,
+            'consultas': consultas,
+            'servicos': servicos,
+            'lentas': lentas,
+        }
+
+    def exportar(self, caminho: str) -> str:
+        """Grava o resumo em JSON."""
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(self.resumo(), f, ensure_ascii=False, indent=1)
+        return caminho
+
+
+metricas = MetricasBanco(ativo=os.environ.get('METRICAS_BANCO', '0') == '1')
+
+
+class CursorMedido(sqlite3.Cursor):
+    """Cursor que cronometra cada comando e conta as linhas lidas.
+
+    A medição vai do ``execute`` até o fim da leitura: esgotar as linhas,
+    o próximo ``execute``, ``close()`` ou o cursor ser descartado. Linhas
+    lidas iterando o cursor não são contadas nem cronometradas, para não
+    rodar Python a cada linha.
+    """
+
+    _medicao: Optional[list] = None
+
+    def _iniciar(self, executar: Callable, sql: str, parametros):
+        self._fechar_medicao()
+        if not metricas.ativo:
+            return executar()
+        passos = getattr(self.connection, 'passos', 0)
+        inicio = time.perf_counter()
+        try:
+            return executar()
+        finally:
+            # [sql, parametros, passos no início, segundos, linhas]
+            self._medicao = [sql, parametros, passos, time.perf_counter() - inicio, 0]
+
+    def _fechar_medicao(self):
+        medicao = self._medicao
+        if medicao is None:
+            return
+        self._medicao = None
+        sql, parametros, passos, segundos, linhas = medicao
+        passos = (getattr(self.connection, 'passos', 0) - passos) * PASSOS_PROGRESSO
+        metricas.registrar_consulta(sql, segundos * 1000, linhas, parametros, passos)
+
+    def execute(self, sql, parametros=()):
+        return self._iniciar(lambda: super(CursorMedido, self).execute(sql, parametros), sql, parametros)
+
+    def executemany(self, sql, sequencia):
+        if not isinstance(sequencia, (list, tuple)):
+            sequencia = list(sequencia)
+        resultado = self._iniciar(lambda: super(CursorMedido, self).executemany(sql, sequencia),
+                                  sql, sequencia[0] if sequencia else ())
+        self._fechar_medicao()
+        return resultado
+
+    def executescript(self, script):
+        resultado = self._iniciar(lambda: super(CursorMedido, self).executescript(script), script, ())
+        self._fechar_medicao()
+        return resultado
+
+    def fetchone(self):
+        medicao = self._medicao
+        if medicao is None:
+            return super().fetchone()
+        inicio = time.perf_counter()
+        linha = super().fetchone()
+        medicao[3] += time.perf_counter() - inicio
+        if linha is None:
+            self._fechar_medicao()
+        else:
+            medicao[4] += 1
+        return linha
+
+    def fetchmany(self, size=None):
+        medicao = self._medicao
+        tamanho = self.arraysize if size is None else size
+        if medicao is None:
+            return super().fetchmany(tamanho)
+        inicio = time.perf_counter()
+        linhas = super().fetchmany(tamanho)
+        medicao[3] += time.perf_counter() - inicio
+        medicao[4] += len(linhas)
+        if len(linhas) < tamanho:
+            self._fechar_medicao()
+        return linhas
+
+    def fetchall(self):
+        medicao = self._medicao
+        if medicao is None:
+            return super().fetchall()
+        inicio = time.perf_counter()
+        linhas = super().fetchall()
+        medicao[3] += time.perf_counter() - inicio
+        medicao[4] += len(linhas)
+        self._fechar_medicao()
+        return linhas
+
+    def close(self):
+        self._fechar_medicao()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._fechar_medicao()
+        except Exception:
+            pass
+
+
+class ConexaoMedida(sqlite3.Connection):
+    """Conexão cujos cursores são ``CursorMedido``.
+
+    O progress handler conta blocos de ``PASSOS_PROGRESSO`` instruções da
+    VM, dando uma medida do trabalho de cada consulta que não depende do
+    relógio do aparelho.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.passos = 0
+        self.set_progress_handler(self._contar_passos, PASSOS_PROGRESSO)
+
+    def _contar_passos(self) -> int:
+        self.passos += 1
+        return 0
+
+    def cursor(self, factory=None):
+        # Coleta desligada depois de abrir a conexão: cursor comum
+        if factory is None:
+            factory = CursorMedido if metricas.ativo else sqlite3.Cursor
+        return super().cursor(factory)
+
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, sequencia):
+        return self.cursor().executemany(sql, sequencia)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
+
+def medir_servicos(cls):
+    """Decorador de classe: cronometra os métodos estáticos públicos."""
+    for nome, atributo in list(vars(cls).items()):
+        if nome.startswith('_') or not isinstance(atributo, staticmethod):
+            continue
+        setattr(cls, nome, staticmethod(_cronometrar(f'{cls.__name__}.{nome}', atributo.__func__)))
+    return cls
+
+
+def _cronometrar(nome: str, funcao: Callable) -> Callable:
+    @functools.wraps(funcao)
+    def medido(*args, **kwargs):
+        if not metricas.ativo:
+            return funcao(*args, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            metricas.registrar_servico(nome, (time.perf_counter() - inicio) * 1000)
+    return medido
@@ -1,12 +1,74 @@
 """
 Models simplificados para mobile.
 """
-from dataclasses import dataclass
-from typing import Optional
+import sys
+from dataclasses import dataclass, fields, MISSING
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Callable, Dict, Optional, Sequence, Tuple
 from datetime import datetime
 
+from .utils import format_currency
 
-@dataclass
+# __slots__ reduz a memória por objeto (dataclass(slots=True) exige 3.10+)
+modelo = dataclass(slots=True) if sys.version_info >= (3, 10) else dataclass
+
+
+class Dinheiro(int):
+    """Valor monetário em centavos.
+
+    É o que o banco grava (INTEGER), então somas e comparações são exatas.
+    Fica na camada de dados: os services recebem e devolvem reais (float),
+    tanto nos dicts quanto nos models, e a conversão fica em
+    ``de_reais``/``reais`` e no ``mapeador``.
+    """
+    
+    __slots__ = ()
+    
+    @classmethod
+    def de_reais(cls, valor) -> 'Dinheiro':
+        """Converte reais (float, int, str ou Decimal), arredondando o meio centavo para cima."""
+        try:
+            centavos = (Decimal(str(valor)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+        except InvalidOperation:
+            raise ValueError(f'Valor monetário inválido: {valor}')
+        return cls(centavos)
+    
+    @property
+    def reais(self) -> float:
+        return int(self) / 100
+    
+    def __add__(self, outro):
+        return Dinheiro(int(self) + outro) if isinstance(outro, int) else NotImplemented
+    
+    __radd__ = __add__
+    
+    def __sub__(self, outro):
+        return Dinheiro(int(self) - outro) if isinstance(outro, int) else NotImplemented
+    
+    def __mul__(self, fator):
+        return Dinheiro(int(self) * fator) if isinstance(fator, int) else NotImplemented
+    
+    __rmul__ = __mul__
+    
+    def __neg__(self):
+        return Dinheiro(-int(self))
+    
+    def __repr__(self):
+        return f"Dinheiro({int(self)})"
+    
+    def __str__(self):
+        return format_currency(self.reais)
+
+
+# Colunas gravadas em centavos; o mapeador as devolve em reais, tanto nos
+# models quanto nos dicts.
+COLUNAS_DINHEIRO = frozenset({
+    'custo_unitario', 'valor_receber', 'limite_mensal',
+    'valor_saldo', 'pendente', 'recebido',
+})
+
+
+@modelo
 class Cliente:
     id_cliente: str
     nome: str
@@ -15,13 +77,13 @@ class Cliente:
     banco_preferencial: str = "Caixa"
 
 
-@dataclass
+@modelo
 class Modelo:
     modelo: str
     custo_unitario: float
 
 
-@dataclass
+@modelo
 class Remessa:
     id_remessa: str
     id_cliente: str
@@ -43,13 +105,14 @@ class Remessa:
             self.saldo_montar = self.quantidade
     
     def calcular_valor_total(self) -> float:
-        return self.quantidade * self.custo_unitario
+        # Em centavos, para não acumular erro de float
+        return (Dinheiro.de_reais(self.custo_unitario) * self.quantidade).reais
     
     def calcular_saldo_valor(self) -> float:
-        return self.saldo_montar * self.custo_unitario
+        return (Dinheiro.de_reais(self.custo_unitario) * self.saldo_montar).reais
 
 
-@dataclass
+@modelo
 class Financeiro:
     id: int
     id_remessa: str
@@ -62,8 +125,74 @@ class Financeiro:
     data_recebimento: Optional[str] = None
 
 
-@dataclass
+@modelo
 class Usuario:
     id: int
     usuario: str
     senha_hash: str
+
+
+# Cache de mapeadores: (classe, colunas) -> função linha -> objeto
+_MAPEADORES: Dict[Tuple[type, Tuple[str, ...]], Callable] = {}
+
+
+def mapeador(cls: type, descricao: Sequence) -> Callable[[tuple], object]:
+    """Retorna a função que converte uma linha do cursor em ``cls``.
+
+    A função é gerada uma única vez por classe e layout de colunas
+    (``cursor.description``). Os campos são atribuídos direto pelo índice,
+    sem passar por ``__init__``/``__post_init__``: a linha já vem do banco
+    e não deve receber os valores padrão de objetos novos. Com ``cls=dict``
+    gera um dicionário com os nomes das colunas. As colunas de
+    ``COLUNAS_DINHEIRO`` saem em reais nos dois casos.
+    """
+    colunas = tuple(c[0] for c in descricao)
+    chave = (cls, colunas)
+    funcao = _MAPEADORES.get(chave)
+    if funcao is None:
+        funcao = _MAPEADORES[chave] = _compilar_mapeador(cls, colunas)
+    return funcao
+
+
+def _compilar_mapeador(cls: type, colunas: Tuple[str, ...]) -> Callable[[tuple], object]:
+    """Gera o código do mapeador para um layout de colunas."""
+    indices = {nome: i for i, nome in enumerate(colunas)}
+    ambiente = {'_cls': cls, '_novo': object.__new__}
+    
+    if cls is dict:
+        itens = ', '.join(
+            f'{nome!r}: (None if row[{i}] is None else row[{i}] / 100)' if nome in COLUNAS_DINHEIRO
+            else f'{nome!r}: row[{i}]'
+            for nome, i in indices.items()
+        )
+        codigo = f'def _mapear(row):\n    return {{{itens}}}\n'
+    else:
+        linhas = ['def _mapear(row):', '    obj = _novo(_cls)']
+        for campo in fields(cls):
+            if campo.default_factory is not MISSING:
+                ambiente[f'_fabrica_{campo.name}'] = campo.default_factory
+                padrao = f'_fabrica_{campo.name}()'
+            elif campo.default is not MISSING and campo.default is not None:
+                ambiente[f'_padrao_{campo.name}'] = campo.default
+                padrao = f'_padrao_{campo.name}'
+            else:
+                padrao = None
+            
+            i = indices.get(campo.name)
+            if i is None:
+                linhas.append(f'    obj.{campo.name} = {padrao}')
+            elif campo.name in COLUNAS_DINHEIRO:
+                linhas.append(f'    v = row[{i}]')
+                linhas.append(f'    obj.{campo.name} = None if v is None else v / 100')
+            elif padrao is None:
+                linhas.append(f'    obj.{campo.name} = row[{i}]')
+            else:
+                # NULL no banco vira o padrão do campo (ex.: banco_preferencial)
+                linhas.append(f'    v = row[{i}]')
+                linhas.append(f'    obj.{campo.name} = {padrao} if v is None else v')
+        linhas.append('    return obj')
+        codigo = '\n'.join(linhas) + '\n'
+    
+    exec(compile(codigo, f'<mapeador {cls.__name__}>', 'exec'), ambiente)
+    return ambiente['_mapear']
+
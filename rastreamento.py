@@ -0,0 +1,178 @@
+"""
+Rastreamento das fases do início do app.
+
+Spans nomeados (importações, ``init_db``, montagem das telas, primeiras
+cargas) são gravados em memória e exportados no formato de trace do
+Chrome (``chrome://tracing`` / Perfetto). Ao fim da janela de início o
+rastro é salvo em disco e só os últimos ``LANCAMENTOS_GUARDADOS`` ficam,
+para comparar um lançamento com o outro.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List
+
+# Referência de tempo: o import deste módulo é o primeiro passo do main.py
+INICIO_PROCESSO = time.perf_counter()
+
+LANCAMENTOS_GUARDADOS = 10
+MAX_EVENTOS = 5000
+PASTA_RASTROS = 'rastros'
+PREFIXO_ARQUIVO = 'inicio-'
+
+
+class Rastreador:
+    """Coleta spans de duração (``ph: X``) e marcos (``ph: i``)."""
+
+    def __init__(self, inicio: float = None):
+        self.inicio = INICIO_PROCESSO if inicio is None else inicio
+        self.ativo = True
+        self._eventos: List[Dict] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def _us(self, instante: float) -> float:
+        return round((instante - self.inicio) * 1_000_000, 1)
+
+    def _gravar(self, evento: Dict):
+        thread = threading.current_thread()
+        evento.setdefault('tid', thread.ident)
+        evento['pid'] = os.getpid()
+        with self._lock:
+            if not self.ativo or len(self._eventos) >= MAX_EVENTOS:
+                return
+            self._threads.setdefault(evento['tid'], thread.name)
+            self._eventos.append(evento)
+
+    def registrar(self, nome: str, inicio: float, fim: float = None,
+                  categoria: str = 'inicio', **args):
+        """Grava um span já medido (instantes de ``time.perf_counter``)."""
+        if not self.ativo:
+            return
+        fim = time.perf_counter() if fim is None else fim
+        evento = {'name': nome, 'cat': categoria, 'ph': 'X',
+                  'ts': self._us(inicio), 'dur': round((fim - inicio) * 1_000_000, 1)}
+        if args:
+            evento['args'] = args
+        self._gravar(evento)
+
+    @contextmanager
+    def span(self, nome: str, categoria: str = 'inicio', **args):
+        """Mede o bloco como um span."""
+        if not self.ativo:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nome, inicio, categoria=categoria, **args)
+
+    def marcar(self, nome: str, categoria: str = 'inicio', **args):
+        """Grava um marco instantâneo (ex.: primeiro quadro desenhado)."""
+        if not self.ativo:
+            return
+        evento = {'name': nome, 'cat': categoria, 'ph': 'i', 's': 'g',
+                  'ts': self._us(time.perf_counter())}
+        if args:
+            evento['args'] = args
+        self._gravar(evento)
+
+    def exportar(self) -> Dict:
+        """Retorna o rastro no formato JSON do trace do Chrome."""
+        with self._lock:
+            eventos = list(self._eventos)
+            threads = dict(self._threads)
+
+        pid = os.getpid()
+        nomes = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': nome}}
+                 for tid, nome in threads.items()]
+        return {
+            'traceEvents': nomes + sorted(eventos, key=lambda e: e['ts']),
+            'displayTimeUnit': 'ms',
+            'otherData': {'data': datetime.now().isoformat(timespec='seconds')},
+        }
+
+    def fases(self) -> Dict[str, float]:
+        """Duração (ms) de cada span, somando os de mesmo nome."""
+        totais: Dict[str, float] = {}
+        with self._lock:
+            for e in self._eventos:
+                if e['ph'] == 'X':
+                    totais[e['name']] = totais.get(e['name'], 0.0) + e['dur'] / 1000
+        return totais
+
+    def encerrar(self):
+        """Para de gravar (o que já foi gravado continua exportável)."""
+        with self._lock:
+            self.ativo = False
+
+    def salvar(self, pasta: str = None, guardar: int = LANCAMENTOS_GUARDADOS) -> str:
+        """Salva o rastro em ``pasta`` e apaga os lançamentos mais antigos."""
+        pasta = pasta or pasta_rastros()
+        os.makedirs(pasta, exist_ok=True)
+        nome = f"{PREFIXO_ARQUIVO}{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.json"
+        caminho = os.path.join(pasta, nome)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(self.exportar(), f)
+
+        arquivos = _arquivos(pasta)
+        for antigo in arquivos[:max(len(arquivos) - guardar, 0)]:
+            os.remove(os.path.join(pasta, antigo))
+        return caminho
+
+
+def pasta_rastros() -> str:
+    """Pasta dos rastros, ao lado do arquivo do banco."""
+    from .database import get_db_path
+    return os.path.join(os.path.dirname(os.path.abspath(get_db_path())), PASTA_RASTROS)
+
+
+def _arquivos(pasta: str) -> List[str]:
+    if not os.path.isdir(pasta):
+        return []
+    return sorted(n for n in os.listdir(pasta) if n.startswith(PREFIXO_ARQUIVO) and n.endswith('.json'))
+
+
+def listar_lancamentos(pasta: str = None) -> List[Dict]:
+    """Resumo dos lançamentos salvos, do mais recente ao mais antigo.
+
+    Cada item traz ``arquivo``, ``data``, ``total_ms`` (fim do último span)
+    e ``fases`` (ms por nome de span).
+    """
+    pasta = pasta or pasta_rastros()
+    lancamentos = []
+    for nome in reversed(_arquivos(pasta)):
+        try:
+            with open(os.path.join(pasta, nome), encoding='utf-8') as f:
+                rastro = json.load(f)
+        except (OSError, ValueError):
+            continue
+
+        fases: Dict[str, float] = {}
+        fim = 0.0
+        for e in rastro.get('traceEvents', []):
+            if e.get('ph') == 'X':
+                fases[e['name']] = fases.get(e['name'], 0.0) + e['dur'] / 1000
+                fim = max(fim, (e['ts'] + e['dur']) / 1000)
+            elif e.get('ph') == 'i':
+                fim = max(fim, e['ts'] / 1000)
+
+        lancamentos.append({
+            'arquivo': nome,
+            'data': rastro.get('otherData', {}).get('data'),
+            'total_ms': fim,
+            'fases': fases,
+        })
+    return lancamentos
+
+
+_rastreador = Rastreador()
+
+
+def get_rastreador() -> Rastreador:
+    """Retorna o rastreador global do início."""
+    return _rastreador
@@ -1,104 +1,297 @@
 """
 Services para mobile.
 """
+import base64
+import json
+import os
+import re
 import sqlite3
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict
+from typing import Iterator, List, Optional, Dict, Tuple
 
-from app.database import get_connection
-from app.models import Cliente, Remessa, Financeiro
+from . import database
+from .database import conexao
+from .cache import cache_servicos, cacheado
+from .metricas import medir_servicos, metricas
+from .models import Cliente, Dinheiro, Modelo, Remessa, mapeador
 
 
+# Acima disso ClienteService.buscar não ordena por relevância
+LIMITE_RANKING = 2000
+
+# Sem FTS, o LIKE de ClienteService.buscar trata estes caracteres como
+# separadores de palavra (o tokenizer do FTS separa em toda pontuação)
+SEPARADORES_BUSCA = '.@-()/,'
+
+
+# Faixas de FinanceiroService.get_aging, em dias de atraso:
+# a vencer, 1-7, 8-30, 31-90 e acima de 90
+FAIXAS_AGING = ('a_vencer', 'ate_7', 'ate_30', 'ate_90', 'acima_90')
+
+
+def _meses_entre(inicio: str, fim: str) -> List[str]:
+    """Lista os meses ``'AAAA-MM'`` de ``inicio`` a ``fim`` (inclusive)."""
+    atual = int(inicio[:4]) * 12 + int(inicio[5:7]) - 1
+    ultimo = int(fim[:4]) * 12 + int(fim[5:7]) - 1
+    return [f"{m // 12}-{m % 12 + 1:02d}" for m in range(atual, ultimo + 1)]
+
+
+def _faixas_vazias() -> Dict[str, float]:
+    return dict.fromkeys(FAIXAS_AGING + ('vencido',), 0.0)
+
+
+def _palavras_sql(coluna: str) -> str:
+    """Expressão SQL com a coluna separada em palavras por espaços, precedida de um espaço."""
+    expressao = coluna
+    for separador in SEPARADORES_BUSCA:
+        expressao = f"replace({expressao}, '{separador}', ' ')"
+    return f"' ' || {expressao}"
+
+
+def _reais(centavos: Optional[int]) -> float:
+    """Centavos do banco para os reais que os services devolvem."""
+    return (centavos or 0) / 100
+
+
+def _executar_lote(conn: sqlite3.Connection, sql: str, linhas: List[Tuple[int, tuple]]) -> Tuple[int, List[Dict]]:
+    """Insere um lote com executemany; se falhar, isola as linhas com erro.
+
+    ``linhas`` são pares (índice, parâmetros). Cada tentativa roda num
+    SAVEPOINT, então linhas ruins não desfazem as boas.
+    """
+    if not linhas:
+        return 0, []
+    
+    try:
+        with conexao() as sp:
+            sp.executemany(sql, [params for _, params in linhas])
+        return len(linhas), []
+    except sqlite3.Error:
+        pass
+    
+    importados = 0
+    erros = []
+    for indice, params in linhas:
+        try:
+            with conexao() as sp:
+                sp.execute(sql, params)
+            importados += 1
+        except sqlite3.Error as e:
+            erros.append({'indice': indice, 'erro': str(e)})
+    return importados, erros
+
+
+def _gerar_continuacao(*chave) -> str:
+    """Codifica a chave do último item da página num token opaco."""
+    return base64.urlsafe_b64encode(json.dumps(chave).encode()).decode()
+
+
+def _ler_continuacao(token: Optional[str]) -> Optional[list]:
+    """Decodifica o token de continuação (None na primeira página)."""
+    if not token:
+        return None
+    try:
+        chave = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('Token de continuação inválido')
+    if not isinstance(chave, list) or len(chave) != 2:
+        raise ValueError('Token de continuação inválido')
+    return chave
+
+
+@medir_servicos
 class ClienteService:
     """Service de clientes."""
     
     @staticmethod
     def listar_todos() -> List[Cliente]:
         """Lista todos os clientes."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM Clientes ORDER BY nome')
-        
-        clientes = []
-        for row in cursor.fetchall():
-            clientes.append(Cliente(
-                id_cliente=row[0],
-                nome=row[1],
-                telefone=row[2],
-                email=row[3],
-                banco_preferencial=row[4] or "Caixa"
-            ))
-        
-        conn.close()
-        return clientes
+        with conexao() as conn:
+            cursor = conn.execute('SELECT * FROM Clientes ORDER BY nome')
+            return list(map(mapeador(Cliente, cursor.description), cursor))
     
     @staticmethod
     def buscar_por_id(id_cliente: str) -> Optional[Cliente]:
         """Busca cliente por ID."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM Clientes WHERE id_cliente = ?', (id_cliente,))
-        
-        row = cursor.fetchone()
-        conn.close()
+        with conexao() as conn:
+            cursor = conn.execute('SELECT * FROM Clientes WHERE id_cliente = ?', (id_cliente,))
+            row = cursor.fetchone()
         
         if row:
-            return Cliente(
-                id_cliente=row[0],
-                nome=row[1],
-                telefone=row[2],
-                email=row[3],
-                banco_preferencial=row[4] or "Caixa"
-            )
+            return mapeador(Cliente, cursor.description)(row)
         return None
     
+    @staticmethod
+    def buscar(termo: str, limit: int = 20) -> List[Cliente]:
+        """Busca clientes por prefixo em nome, código, telefone e e-mail.
+
+        Cada palavra digitada precisa casar com o início de alguma palavra
+        do cliente. Usa o índice FTS5 (ordenado por relevância) quando
+        existir, senão LIKE.
+        """
+        palavras = re.findall(r'\w+', termo or '')
+        if not palavras:
+            return []
+        
+        with conexao() as conn:
+            if database.busca_clientes_disponivel(conn):
+                consulta = ' '.join(f'"{p}"*' for p in palavras)
+                # bm25 custa por linha casada: prefixos curtos que casam com
+                # milhares de clientes saem sem ranking (a lista se refina
+                # na próxima tecla).
+                casados = conn.execute('''
+                    SELECT COUNT(*) FROM (
+                        SELECT 1 FROM ClientesBusca WHERE ClientesBusca MATCH ? LIMIT ?
+                    )
+                ''', (consulta, LIMITE_RANKING + 1)).fetchone()[0]
+                ordem = 'bm25(ClientesBusca, 10.0, 5.0, 2.0, 1.0), c.nome' if casados <= LIMITE_RANKING else 'b.rowid'
+                cursor = conn.execute(f'''
+                    SELECT c.* FROM ClientesBusca b
+                    JOIN Clientes c ON c.rowid = b.rowid
+                    WHERE ClientesBusca MATCH ?
+                    ORDER BY {ordem}
+                    LIMIT ?
+                ''', (consulta, limit))
+            else:
+                # Prefixo de palavra, como no FTS: início do campo ou logo
+                # depois de espaço/pontuação. O LIKE '%palavra%' barato vem
+                # antes, para só as linhas que contêm a palavra pagarem os
+                # replace() que separam as palavras.
+                colunas = database.COLUNAS_BUSCA_CLIENTES
+                condicao = '(' + ' OR '.join(
+                    f"{c} LIKE ? ESCAPE '\\' OR ({c} LIKE '%' || ? ESCAPE '\\'"
+                    f" AND {_palavras_sql(c)} LIKE '% ' || ? ESCAPE '\\')"
+                    for c in colunas
+                ) + ')'
+                params = []
+                for palavra in palavras:
+                    padrao = re.sub(r'([%_\\])', r'\\\1', palavra) + '%'
+                    params.extend([padrao] * (3 * len(colunas)))
+                prefixo = palavras[0] + '%'
+                cursor = conn.execute(f'''
+                    SELECT * FROM Clientes
+                    WHERE {' AND '.join([condicao] * len(palavras))}
+                    ORDER BY CASE WHEN id_cliente LIKE ? THEN 0 WHEN nome LIKE ? THEN 1 ELSE 2 END, nome
+                    LIMIT ?
+                ''', params + [prefixo, prefixo, limit])
+            return list(map(mapeador(Cliente, cursor.description), cursor))
+    
     @staticmethod
     def cadastrar(dados: Dict) -> Dict:
         """Cadastra um cliente."""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO Clientes (id_cliente, nome, telefone, email, banco_preferencial)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                dados['id_cliente'].upper(),
-                dados['nome'],
-                dados.get('telefone'),
-                dados.get('email'),
-                dados.get('banco_preferencial', 'Caixa')
-            ))
-            
-            conn.commit()
-            conn.close()
+            with conexao() as conn:
+                conn.execute('''
+                    INSERT INTO Clientes (id_cliente, nome, telefone, email, banco_preferencial)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (
+                    dados['id_cliente'].upper(),
+                    dados['nome'],
+                    dados.get('telefone'),
+                    dados.get('email'),
+                    dados.get('banco_preferencial', 'Caixa')
+                ))
             
+            cache_servicos.invalidar('clientes')
             return {'sucesso': True, 'mensagem': 'Cliente cadastrado!'}
             
         except Exception as e:
             return {'sucesso': False, 'mensagem': str(e)}
     
     @staticmethod
+    def cadastrar_lote(lista: List[Dict]) -> Dict:
+        """Cadastra vários clientes numa única transação."""
+        linhas = []
+        erros = []
+        for indice, dados in enumerate(lista):
+            try:
+                linhas.append((indice, (
+                    dados['id_cliente'].upper(),
+                    dados['nome'],
+                    dados.get('telefone'),
+                    dados.get('email'),
+                    dados.get('banco_preferencial') or 'Caixa'
+                )))
+            except (KeyError, AttributeError) as e:
+                erros.append({'indice': indice, 'erro': f'Campo inválido: {e}'})
+        
+        try:
+            with conexao(imediata=True) as conn:
+                importados, erros_sql = _executar_lote(conn, '''
+                    INSERT INTO Clientes (id_cliente, nome, telefone, email, banco_preferencial)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', linhas)
+        except Exception as e:
+            return {'sucesso': False, 'mensagem': str(e), 'importados': 0, 'erros': erros}
+        
+        cache_servicos.invalidar('clientes')
+        erros = sorted(erros + erros_sql, key=lambda e: e['indice'])
+        return {
+            'sucesso': True,
+            'mensagem': f'{importados} clientes cadastrados!',
+            'importados': importados,
+            'erros': erros
+        }
+    
+    @staticmethod
+    @cacheado(('clientes',))
     def get_resumo() -> Dict:
         """Retorna resumo de clientes."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM Clientes')
-        total = cursor.fetchone()[0]
-        conn.close()
+        with conexao() as conn:
+            total = conn.execute('SELECT COUNT(*) FROM Clientes').fetchone()[0]
         
         return {'total': total}
 
 
+@medir_servicos
+class ModeloService:
+    """Service de modelos."""
+    
+    @staticmethod
+    def listar_todos() -> List[Modelo]:
+        """Lista todos os modelos."""
+        with conexao() as conn:
+            cursor = conn.execute('SELECT modelo, custo_unitario FROM Modelos ORDER BY modelo')
+            return list(map(mapeador(Modelo, cursor.description), cursor))
+    
+    @staticmethod
+    def salvar_lote(lista: List[Dict]) -> Dict:
+        """Cadastra ou atualiza vários modelos numa única transação."""
+        linhas = []
+        erros = []
+        for indice, dados in enumerate(lista):
+            try:
+                linhas.append((indice, (dados['modelo'].strip(), Dinheiro.de_reais(dados['custo_unitario']))))
+            except (KeyError, AttributeError, TypeError, ValueError) as e:
+                erros.append({'indice': indice, 'erro': f'Campo inválido: {e}'})
+        
+        try:
+            with conexao(imediata=True) as conn:
+                importados, erros_sql = _executar_lote(
+                    conn,
+                    'INSERT OR REPLACE INTO Modelos (modelo, custo_unitario) VALUES (?, ?)',
+                    linhas
+                )
+        except Exception as e:
+            return {'sucesso': False, 'mensagem': str(e), 'importados': 0, 'erros': erros}
+        
+        erros = sorted(erros + erros_sql, key=lambda e: e['indice'])
+        return {
+            'sucesso': True,
+            'mensagem': f'{importados} modelos salvos!',
+            'importados': importados,
+            'erros': erros
+        }
+
+
+@medir_servicos
 class RemessaService:
     """Service de remessas."""
     
     @staticmethod
-    def listar_todos(id_cliente: str = None, status: str = None) -> List[Remessa]:
-        """Lista remessas."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
+    def _consulta(id_cliente: str = None, status: str = None,
+                  apos: Optional[list] = None, limite: int = None) -> Tuple[str, list]:
+        """Monta a consulta de listagem (mais recentes primeiro)."""
         query = 'SELECT * FROM Remessas WHERE 1=1'
         params = []
         
@@ -110,156 +303,231 @@ class RemessaService:
             query += ' AND status = ?'
             params.append(status)
         
-        query += ' ORDER BY data_criacao DESC'
+        if apos:
+            query += ' AND (data_criacao, id_remessa) < (?, ?)'
+            params.extend(apos)
+        
+        query += ' ORDER BY data_criacao DESC, id_remessa DESC'
+        
+        if limite:
+            query += ' LIMIT ?'
+            params.append(limite)
+        
+        return query, params
+    
+    @staticmethod
+    def listar_todos(id_cliente: str = None, status: str = None) -> List[Remessa]:
+        """Lista remessas."""
+        query, params = RemessaService._consulta(id_cliente, status)
+        
+        with conexao() as conn:
+            cursor = conn.execute(query, params)
+            return list(map(mapeador(Remessa, cursor.description), cursor))
+    
+    @staticmethod
+    def listar_pagina(id_cliente: str = None, status: str = None, limite: int = 50,
+                      continuacao: str = None) -> Dict:
+        """Retorna uma página de remessas e o token da próxima (ou None)."""
+        apos = _ler_continuacao(continuacao)
+        query, params = RemessaService._consulta(id_cliente, status, apos, limite + 1)
         
-        cursor.execute(query, params)
+        with conexao() as conn:
+            cursor = conn.execute(query, params)
+            itens = list(map(mapeador(Remessa, cursor.description), cursor))
         
-        remessas = []
-        for row in cursor.fetchall():
-            remessas.append(Remessa(
-                id_remessa=row[0],
-                id_cliente=row[1],
-                modelo=row[2],
-                quantidade=row[3],
-                custo_unitario=row[4],
-                saldo_montar=row[5],
-                entregue=row[6],
-                prazo_dias=row[7],
-                data_criacao=row[8],
-                cliente_destino=row[9],
-                data_prevista=row[10],
-                status=row[11]
-            ))
+        proxima = None
+        if len(itens) > limite:
+            itens = itens[:limite]
+            proxima = _gerar_continuacao(itens[-1].data_criacao, itens[-1].id_remessa)
         
-        conn.close()
-        return remessas
+        return {'itens': itens, 'continuacao': proxima}
+    
+    @staticmethod
+    def iter_todos(id_cliente: str = None, status: str = None, lote: int = 500) -> Iterator[Remessa]:
+        """Percorre as remessas página a página, sem carregar a tabela toda."""
+        continuacao = None
+        while True:
+            pagina = RemessaService.listar_pagina(id_cliente, status, lote, continuacao)
+            yield from pagina['itens']
+            continuacao = pagina['continuacao']
+            if not continuacao:
+                return
     
     @staticmethod
     def get_overdue() -> List[Remessa]:
         """Retorna remessas atrasadas."""
         hoje = datetime.now().strftime('%Y-%m-%d')
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM Remessas 
-            WHERE data_prevista < ? AND saldo_montar > 0 AND status != 'Entregue'
-            ORDER BY data_prevista
-        ''', (hoje,))
-        
-        remessas = []
-        for row in cursor.fetchall():
-            remessas.append(Remessa(
-                id_remessa=row[0],
-                id_cliente=row[1],
-                modelo=row[2],
-                quantidade=row[3],
-                custo_unitario=row[4],
-                saldo_montar=row[5],
-                entregue=row[6],
-                prazo_dias=row[7],
-                data_criacao=row[8],
-                cliente_destino=row[9],
-                data_prevista=row[10],
-                status=row[11]
-            ))
-        
-        conn.close()
-        return remessas
+        
+        with conexao() as conn:
+            cursor = conn.execute('''
+                SELECT * FROM Remessas 
+                WHERE data_prevista < ? AND saldo_montar > 0 AND status != 'Entregue'
+                ORDER BY data_prevista
+            ''', (hoje,))
+            return list(map(mapeador(Remessa, cursor.description), cursor))
+    
+    @staticmethod
+    def reservar_ids(conn: sqlite3.Connection, quantidade: int = 1) -> List[str]:
+        """Reserva números de OP consecutivos na transação de ``conn``.
+
+        O sufixo do aparelho evita que duas OPs criadas em aparelhos
+        diferentes tenham o mesmo id na sincronização. Antes do primeiro
+        contato com o servidor o sufixo é provisório (``-P``) e a OP muda de
+        id no primeiro envio.
+        """
+        sufixo = database.identidade_aparelho(conn)[0]
+        return [f"OP-{n:04d}-{sufixo}" for n in database.reservar_sequencia(conn, 'ultimo_id_remessa', quantidade)]
     
     @staticmethod
     def criar(dados: Dict) -> Dict:
         """Cria uma nova remessa."""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Gerar ID
-            cursor.execute("SELECT valor FROM Configuracoes WHERE chave = 'ultimo_id_remessa'")
-            ultimo = int(cursor.fetchone()[0])
-            novo_id = ultimo + 1
-            id_remessa = f"OP-{novo_id:04d}"
-            
-            # Calcular data prevista
-            prazo = dados.get('prazo_dias', 30)
-            data_prevista = (datetime.now() + timedelta(days=prazo)).strftime('%Y-%m-%d')
-            
-            cursor.execute('''
-                INSERT INTO Remessas 
-                (id_remessa, id_cliente, modelo, quantidade, custo_unitario, 
-                 saldo_montar, data_criacao, data_prevista, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                id_remessa,
-                dados['id_cliente'],
-                dados['modelo'],
-                dados['quantidade'],
-                dados['custo_unitario'],
-                dados['quantidade'],
-                datetime.now().strftime('%Y-%m-%d'),
-                data_prevista,
-                'Em Aberto'
-            ))
-            
-            # Atualizar contador
-            cursor.execute(
-                "UPDATE Configuracoes SET valor = ? WHERE chave = 'ultimo_id_remessa'",
-                (str(novo_id),)
-            )
-            
-            conn.commit()
-            conn.close()
+            with conexao(imediata=True) as conn:
+                cursor = conn.cursor()
+                
+                # Gerar ID
+                id_remessa = RemessaService.reservar_ids(conn)[0]
+                
+                # Calcular data prevista
+                prazo = dados.get('prazo_dias', 30)
+                data_prevista = (datetime.now() + timedelta(days=prazo)).strftime('%Y-%m-%d')
+                
+                cursor.execute('''
+                    INSERT INTO Remessas 
+                    (id_remessa, id_cliente, modelo, quantidade, custo_unitario, 
+                     saldo_montar, data_criacao, data_prevista, status)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    id_remessa,
+                    dados['id_cliente'],
+                    dados['modelo'],
+                    dados['quantidade'],
+                    Dinheiro.de_reais(dados['custo_unitario']),
+                    dados['quantidade'],
+                    datetime.now().strftime('%Y-%m-%d'),
+                    data_prevista,
+                    'Em Aberto'
+                ))
             
+            cache_servicos.invalidar('producao')
             return {'sucesso': True, 'mensagem': f'OP {id_remessa} criada!', 'id': id_remessa}
             
         except Exception as e:
             return {'sucesso': False, 'mensagem': str(e)}
     
+    @staticmethod
+    def criar_lote(lista: List[Dict]) -> Dict:
+        """Cria várias remessas numa única transação.
+
+        Aceita também ``saldo_montar`` e ``data_criacao`` para carregar OPs
+        em aberto vindas de outro sistema. Sem ``custo_unitario``, usa o
+        custo cadastrado em Modelos. Os ids das OPs criadas vêm em ``ids``.
+        """
+        hoje = datetime.now()
+        erros = []
+        
+        try:
+            with conexao(imediata=True) as conn:
+                custos = None
+                if any(d.get('custo_unitario') in (None, '') for d in lista):
+                    custos = dict(conn.execute('SELECT modelo, custo_unitario FROM Modelos'))
+                
+                validas = []
+                for indice, dados in enumerate(lista):
+                    try:
+                        quantidade = int(dados['quantidade'])
+                        custo = dados.get('custo_unitario')
+                        if custo in (None, ''):
+                            if dados['modelo'] not in custos:
+                                raise ValueError(f"Modelo sem custo cadastrado: {dados['modelo']}")
+                            custo = custos[dados['modelo']]
+                        else:
+                            custo = Dinheiro.de_reais(custo)
+                        prazo = int(dados.get('prazo_dias') or 30)
+                        criacao = dados.get('data_criacao') or hoje.strftime('%Y-%m-%d')
+                        data_prevista = (datetime.strptime(criacao, '%Y-%m-%d') + timedelta(days=prazo)).strftime('%Y-%m-%d')
+                        saldo = dados.get('saldo_montar')
+                        saldo = quantidade if saldo in (None, '') else int(saldo)
+                        validas.append((indice, [
+                            dados['id_cliente'], dados['modelo'], quantidade, custo,
+                            saldo, quantidade - saldo, prazo, criacao, data_prevista,
+                            'Em Aberto' if saldo > 0 else 'Entregue'
+                        ]))
+                    except KeyError as e:
+                        erros.append({'indice': indice, 'erro': f'Campo inválido: {e}'})
+                    except (TypeError, ValueError) as e:
+                        erros.append({'indice': indice, 'erro': str(e)})
+                
+                linhas = []
+                if validas:
+                    ids = RemessaService.reservar_ids(conn, len(validas))
+                    linhas = [(indice, tuple([id_remessa] + params))
+                              for id_remessa, (indice, params) in zip(ids, validas)]
+                
+                importados, erros_sql = _executar_lote(conn, '''
+                    INSERT INTO Remessas 
+                    (id_remessa, id_cliente, modelo, quantidade, custo_unitario,
+                     saldo_montar, entregue, prazo_dias, data_criacao, data_prevista, status)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', linhas)
+        except Exception as e:
+            return {'sucesso': False, 'mensagem': str(e), 'importados': 0, 'erros': erros}
+        
+        cache_servicos.invalidar('producao')
+        falhas = {e['indice'] for e in erros_sql}
+        erros = sorted(erros + erros_sql, key=lambda e: e['indice'])
+        return {
+            'sucesso': True,
+            'mensagem': f'{importados} OPs criadas!',
+            'importados': importados,
+            'ids': [params[0] for indice, params in linhas if indice not in falhas],
+            'erros': erros
+        }
+    
     @staticmethod
     def registrar_entrega(id_remessa: str, quantidade: int) -> Dict:
         """Registra uma entrega."""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Buscar remessa
-            cursor.execute('SELECT * FROM Remessas WHERE id_remessa = ?', (id_remessa,))
-            row = cursor.fetchone()
-            
-            if not row:
-                return {'sucesso': False, 'mensagem': 'OP não encontrada'}
-            
-            saldo_atual = row[5]
-            entregue_atual = row[6]
-            custo = row[4]
-            
-            if quantidade > saldo_atual:
-                quantidade = saldo_atual
-            
-            novo_saldo = saldo_atual - quantidade
-            novo_entregue = entregue_atual + quantidade
-            status = 'Entregue' if novo_saldo == 0 else 'Em Aberto'
-            
-            # Atualizar remessa
-            cursor.execute('''
-                UPDATE Remessas 
-                SET saldo_montar = ?, entregue = ?, status = ?
-                WHERE id_remessa = ?
-            ''', (novo_saldo, novo_entregue, status, id_remessa))
-            
-            # Criar financeiro
-            data_entrega = datetime.now().strftime('%Y-%m-%d')
-            data_venc = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-            
-            cursor.execute('''
-                INSERT INTO Financeiro 
-                (id_remessa, quantidade, valor_receber, data_entrega, data_vencimento, status)
-                VALUES (?, ?, ?, ?, ?, 'Pendente')
-            ''', (id_remessa, quantidade, quantidade * custo, data_entrega, data_venc))
-            
-            conn.commit()
-            conn.close()
+            with conexao(imediata=True) as conn:
+                cursor = conn.cursor()
+                
+                # Buscar remessa
+                cursor.execute('SELECT * FROM Remessas WHERE id_remessa = ?', (id_remessa,))
+                row = cursor.fetchone()
+                
+                if not row:
+                    return {'sucesso': False, 'mensagem': 'OP não encontrada'}
+                
+                saldo_atual = row[5]
+                entregue_atual = row[6]
+                custo = row[4]
+                
+                if quantidade > saldo_atual:
+                    quantidade = saldo_atual
+                
+                novo_saldo = saldo_atual - quantidade
+                novo_entregue = entregue_atual + quantidade
+                status = 'Entregue' if novo_saldo == 0 else 'Em Aberto'
+                
+                # Atualizar remessa
+                cursor.execute('''
+                    UPDATE Remessas 
+                    SET saldo_montar = ?, entregue = ?, status = ?
+                    WHERE id_remessa = ?
+                ''', (novo_saldo, novo_entregue, status, id_remessa))
+                
+                # Criar financeiro
+                data_entrega = datetime.now().strftime('%Y-%m-%d')
+                data_venc = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
+                
+                fin_id = database.reservar_ids_financeiro(conn)[0]
+                cursor.execute('''
+                    INSERT INTO Financeiro 
+                    (id, id_remessa, quantidade, valor_receber, data_entrega, data_vencimento, status)
+                    VALUES (?, ?, ?, ?, ?, ?, 'Pendente')
+                ''', (fin_id, id_remessa, quantidade, quantidade * custo, data_entrega, data_venc))
             
+            cache_servicos.invalidar('producao', 'financeiro', f'financeiro:{row[1]}')
             return {
                 'sucesso': True, 
                 'mensagem': f'Entrega de {quantidade} unidades registrada!',
@@ -270,35 +538,129 @@ class RemessaService:
             return {'sucesso': False, 'mensagem': str(e)}
     
     @staticmethod
-    def get_estatisticas() -> Dict:
-        """Retorna estatísticas."""
-        conn = get_connection()
-        cursor = conn.cursor()
+    def registrar_entregas(itens: List[Tuple[str, int]]) -> Dict:
+        """Registra entregas de várias OPs numa única transação.
+
+        As quantidades são somadas por OP e limitadas ao ``saldo_montar`` no
+        próprio SQL. Retorna um resultado por OP, na ordem de entrada.
+        """
+        pedidos: Dict[str, int] = {}
+        for id_remessa, quantidade in itens:
+            pedidos[id_remessa] = pedidos.get(id_remessa, 0) + max(int(quantidade), 0)
         
-        cursor.execute('''
-            SELECT COUNT(*), SUM(saldo_montar), SUM(saldo_montar * custo_unitario)
-            FROM Remessas WHERE saldo_montar > 0
-        ''')
-        row = cursor.fetchone()
+        if not pedidos:
+            return {'sucesso': True, 'mensagem': 'Nenhuma entrega informada', 'resultados': []}
         
-        conn.close()
+        data_entrega = datetime.now().strftime('%Y-%m-%d')
+        data_venc = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
+        
+        try:
+            with conexao(imediata=True) as conn:
+                conn.execute('''
+                    CREATE TEMP TABLE IF NOT EXISTS _entregas (
+                        id_remessa TEXT PRIMARY KEY,
+                        pedida INTEGER NOT NULL,
+                        efetiva INTEGER
+                    )
+                ''')
+                conn.execute('DELETE FROM _entregas')
+                # rowid 1..n: posição do pedido no bloco de ids de Financeiro
+                conn.executemany(
+                    'INSERT INTO _entregas (rowid, id_remessa, pedida) VALUES (?, ?, ?)',
+                    ((ordem, id_remessa, pedida) for ordem, (id_remessa, pedida) in enumerate(pedidos.items(), 1))
+                )
+                ids = database.reservar_ids_financeiro(conn, len(pedidos))
+                
+                # Limita ao saldo (NULL quando a OP não existe)
+                conn.execute('''
+                    UPDATE _entregas SET efetiva = (
+                        SELECT MIN(_entregas.pedida, r.saldo_montar)
+                        FROM Remessas r WHERE r.id_remessa = _entregas.id_remessa
+                    )
+                ''')
+                
+                conn.execute('''
+                    INSERT INTO Financeiro 
+                    (id, id_remessa, quantidade, valor_receber, data_entrega, data_vencimento, status)
+                    SELECT ? + e.rowid, e.id_remessa, e.efetiva, e.efetiva * r.custo_unitario, ?, ?, 'Pendente'
+                    FROM _entregas e
+                    JOIN Remessas r ON r.id_remessa = e.id_remessa
+                    WHERE e.efetiva > 0
+                ''', (ids.start - 1, data_entrega, data_venc))
+                
+                conn.execute('''
+                    UPDATE Remessas
+                    SET saldo_montar = saldo_montar - (
+                            SELECT efetiva FROM _entregas e WHERE e.id_remessa = Remessas.id_remessa),
+                        entregue = entregue + (
+                            SELECT efetiva FROM _entregas e WHERE e.id_remessa = Remessas.id_remessa),
+                        status = CASE WHEN saldo_montar - (
+                            SELECT efetiva FROM _entregas e WHERE e.id_remessa = Remessas.id_remessa) = 0
+                            THEN 'Entregue' ELSE 'Em Aberto' END
+                    WHERE id_remessa IN (SELECT id_remessa FROM _entregas WHERE efetiva > 0)
+                ''')
+                
+                rows = conn.execute('''
+                    SELECT e.id_remessa, e.pedida, e.efetiva, r.saldo_montar, r.id_cliente
+                    FROM _entregas e
+                    LEFT JOIN Remessas r ON r.id_remessa = e.id_remessa
+                ''').fetchall()
+                conn.execute('DELETE FROM _entregas')
+        except Exception as e:
+            return {'sucesso': False, 'mensagem': str(e), 'resultados': []}
+        
+        por_op = {row[0]: row for row in rows}
+        resultados = []
+        for id_remessa in pedidos:
+            _, pedida, efetiva, saldo, _ = por_op[id_remessa]
+            if efetiva is None:
+                resultados.append({'id_remessa': id_remessa, 'sucesso': False,
+                                   'mensagem': 'OP não encontrada', 'quantidade': 0})
+            elif pedida == 0:
+                resultados.append({'id_remessa': id_remessa, 'sucesso': False,
+                                   'mensagem': 'Quantidade inválida', 'quantidade': 0})
+            elif efetiva == 0:
+                resultados.append({'id_remessa': id_remessa, 'sucesso': False,
+                                   'mensagem': 'OP sem saldo', 'quantidade': 0})
+            else:
+                resultados.append({'id_remessa': id_remessa, 'sucesso': True,
+                                   'mensagem': f'Entrega de {efetiva} unidades registrada!',
+                                   'quantidade': efetiva, 'finalizada': saldo == 0})
+        
+        clientes = {row[4] for row in rows if row[2]}
+        cache_servicos.invalidar('producao', 'financeiro', *(f'financeiro:{c}' for c in clientes))
+        
+        registradas = sum(1 for r in resultados if r['sucesso'])
+        return {
+            'sucesso': True,
+            'mensagem': f'{registradas} de {len(resultados)} entregas registradas!',
+            'resultados': resultados
+        }
+    
+    @staticmethod
+    @cacheado(('producao',))
+    def get_estatisticas() -> Dict:
+        """Retorna estatísticas."""
+        with conexao() as conn:
+            row = conn.execute(
+                'SELECT ops_abertas, saldo_montar, valor_saldo FROM ResumoGeral WHERE id = 1'
+            ).fetchone() or (0, 0, 0)
         
         return {
             'total_ops': row[0] or 0,
             'total_saldo': row[1] or 0,
-            'valor_saldo': row[2] or 0
+            'valor_saldo': _reais(row[2])
         }
 
 
+@medir_servicos
 class FinanceiroService:
     """Service financeiro."""
     
     @staticmethod
-    def get_all(id_cliente: str = None, status: str = None) -> List[Dict]:
-        """Lista títulos financeiros."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
+    def _consulta(id_cliente: str = None, status: str = None,
+                  apos: Optional[list] = None, limite: int = None) -> Tuple[str, list]:
+        """Monta a consulta de títulos (vencimento mais próximo primeiro)."""
         query = '''
             SELECT f.*, c.nome as cliente_nome
             FROM Financeiro f
@@ -316,119 +678,402 @@ class FinanceiroService:
             query += ' AND f.status = ?'
             params.append(status)
         
-        query += ' ORDER BY f.data_vencimento ASC'
-        
-        cursor.execute(query, params)
-        
-        titulos = []
-        for row in cursor.fetchall():
-            titulos.append({
-                'id': row[0],
-                'id_remessa': row[1],
-                'quantidade': row[2],
-                'valor_receber': row[3],
-                'data_entrega': row[4],
-                'data_vencimento': row[5],
-                'status': row[6],
-                'banco': row[7],
-                'data_recebimento': row[8],
-                'cliente_nome': row[9] if len(row) > 9 else ''
-            })
+        if apos:
+            vencimento, fin_id = apos
+            if vencimento is None:
+                # NULL vem antes de qualquer data na ordenação ascendente
+                query += ' AND ((f.data_vencimento IS NULL AND f.id > ?) OR f.data_vencimento IS NOT NULL)'
+                params.append(fin_id)
+            else:
+                query += ' AND (f.data_vencimento, f.id) > (?, ?)'
+                params.extend([vencimento, fin_id])
         
-        conn.close()
-        return titulos
+        query += ' ORDER BY f.data_vencimento ASC, f.id ASC'
+        
+        if limite:
+            query += ' LIMIT ?'
+            params.append(limite)
+        
+        return query, params
     
     @staticmethod
-    def get_totais(id_cliente: str = None) -> Dict:
-        """Retorna totais."""
-        conn = get_connection()
-        cursor = conn.cursor()
+    def get_all(id_cliente: str = None, status: str = None) -> List[Dict]:
+        """Lista títulos financeiros."""
+        query, params = FinanceiroService._consulta(id_cliente, status)
         
-        query = '''
-            SELECT 
-                SUM(CASE WHEN f.status = 'Pendente' THEN f.valor_receber ELSE 0 END) as pendente,
-                SUM(CASE WHEN f.status = 'Recebido' THEN f.valor_receber ELSE 0 END) as recebido
-            FROM Financeiro f
-            LEFT JOIN Remessas r ON r.id_remessa = f.id_remessa
-            WHERE 1=1
-        '''
-        params = []
+        with conexao() as conn:
+            cursor = conn.execute(query, params)
+            return list(map(mapeador(dict, cursor.description), cursor))
+    
+    @staticmethod
+    def get_pagina(id_cliente: str = None, status: str = None, limite: int = 50,
+                   continuacao: str = None) -> Dict:
+        """Retorna uma página de títulos e o token da próxima (ou None)."""
+        apos = _ler_continuacao(continuacao)
+        query, params = FinanceiroService._consulta(id_cliente, status, apos, limite + 1)
         
-        if id_cliente:
-            query += ' AND r.id_cliente = ?'
-            params.append(id_cliente)
+        with conexao() as conn:
+            cursor = conn.execute(query, params)
+            itens = list(map(mapeador(dict, cursor.description), cursor))
         
-        cursor.execute(query, params)
-        row = cursor.fetchone()
-        conn.close()
+        proxima = None
+        if len(itens) > limite:
+            itens = itens[:limite]
+            proxima = _gerar_continuacao(itens[-1]['data_vencimento'], itens[-1]['id'])
         
+        return {'itens': itens, 'continuacao': proxima}
+    
+    @staticmethod
+    def iter_all(id_cliente: str = None, status: str = None, lote: int = 500) -> Iterator[Dict]:
+        """Percorre os títulos página a página, sem carregar a tabela toda."""
+        continuacao = None
+        while True:
+            pagina = FinanceiroService.get_pagina(id_cliente, status, lote, continuacao)
+            yield from pagina['itens']
+            continuacao = pagina['continuacao']
+            if not continuacao:
+                return
+    
+    @staticmethod
+    @cacheado(lambda id_cliente=None: (f'financeiro:{id_cliente}', 'financeiro:*') if id_cliente else ('financeiro',))
+    def get_totais(id_cliente: str = None) -> Dict:
+        """Retorna totais."""
+        with conexao() as conn:
+            if id_cliente:
+                row = conn.execute(
+                    'SELECT pendente, recebido FROM ResumoCliente WHERE id_cliente = ?',
+                    (id_cliente,)
+                ).fetchone()
+            else:
+                row = conn.execute('SELECT pendente, recebido FROM ResumoGeral WHERE id = 1').fetchone()
+        
+        row = row or (0, 0)
         return {
-            'pendente': row[0] or 0,
-            'recebido': row[1] or 0
+            'pendente': _reais(row[0]),
+            'recebido': _reais(row[1])
         }
     
     @staticmethod
+    @cacheado(('recebimentos',))
     def get_monthly_received(banco: str, year: int, month: int) -> float:
         """Retorna total recebido no mês."""
-        conn = get_connection()
-        cursor = conn.cursor()
+        with conexao() as conn:
+            row = conn.execute(
+                'SELECT recebido FROM ResumoBancoMes WHERE banco = ? AND mes = ?',
+                (banco, f"{year}-{month:02d}")
+            ).fetchone()
+        
+        return _reais(row[0] if row else 0)
+    
+    @staticmethod
+    @cacheado(('recebimentos',))
+    def get_matriz_bancos(inicio: str = None, fim: str = None) -> Dict:
+        """Recebido por banco × mês (``'AAAA-MM'``), com uso do limite mensal.
+
+        Sem datas, cobre os últimos 6 meses. Cada célula traz ``recebido``,
+        ``limite`` e ``utilizacao`` (recebido / limite, ou None sem limite).
+        Bancos com recebimento mas fora da tabela Bancos entram sem limite.
+        """
+        fim = fim or datetime.now().strftime('%Y-%m')
+        if not inicio:
+            ano, mes = divmod(int(fim[:4]) * 12 + int(fim[5:7]) - 1 - 5, 12)
+            inicio = f"{ano}-{mes + 1:02d}"
+        meses = _meses_entre(inicio, fim)
+        
+        with conexao() as conn:
+            rows = conn.execute('''
+                SELECT b.nome, b.limite_mensal, r.mes, r.recebido
+                FROM Bancos b
+                LEFT JOIN ResumoBancoMes r
+                    ON r.banco = b.nome AND r.mes BETWEEN :inicio AND :fim
+                UNION ALL
+                SELECT r.banco, NULL, r.mes, r.recebido
+                FROM ResumoBancoMes r
+                WHERE r.mes BETWEEN :inicio AND :fim
+                  AND r.banco NOT IN (SELECT nome FROM Bancos)
+            ''', {'inicio': inicio, 'fim': fim}).fetchall()
+        
+        limites = {}
+        recebidos = {}
+        for banco, limite, mes, recebido in rows:
+            limites.setdefault(banco, limite)
+            if mes is not None:
+                recebidos[(banco, mes)] = recebido
+        
+        # Soma e utilização em centavos; reais só na saída
+        bancos = []
+        for banco in sorted(limites):
+            limite = limites[banco]
+            recebido = [recebidos.get((banco, mes), 0) for mes in meses]
+            celulas = [{
+                'mes': mes,
+                'recebido': _reais(valor),
+                'limite': _reais(limite) if limite is not None else None,
+                'utilizacao': valor / limite if limite else None
+            } for mes, valor in zip(meses, recebido)]
+            bancos.append({
+                'banco': banco,
+                'limite_mensal': _reais(limite) if limite is not None else None,
+                'total': _reais(sum(recebido)),
+                'celulas': celulas
+            })
+        
+        return {
+            'meses': meses,
+            'bancos': bancos,
+            'totais_mes': {mes: _reais(sum(recebidos.get((b, mes), 0) for b in limites)) for mes in meses}
+        }
+    
+    @staticmethod
+    def get_aging(id_cliente: str = None) -> Dict:
+        """Retorna os títulos pendentes por faixa de atraso.
+
+        Sem ``id_cliente`` devolve ``{'data_base', 'total', 'clientes'}``;
+        com ele, só as faixas do cliente. Cada faixa vem de FAIXAS_AGING,
+        mais ``'vencido'`` (soma das faixas em atraso).
+        """
+        aging = FinanceiroService._aging_do_dia(datetime.now().strftime('%Y-%m-%d'))
+        if id_cliente:
+            return dict(aging['clientes'].get(id_cliente) or _faixas_vazias())
+        return aging
+    
+    @staticmethod
+    @cacheado(('financeiro',), ttl=24 * 3600)
+    def _aging_do_dia(hoje: str) -> Dict:
+        """Calcula o aging na data ``hoje`` (cacheado por dia)."""
+        base = datetime.strptime(hoje, '%Y-%m-%d')
+        limites = {
+            f'd{dias}': (base - timedelta(days=dias)).strftime('%Y-%m-%d')
+            for dias in (7, 30, 90)
+        }
         
-        start = f"{year}-{month:02d}-01"
-        if month == 12:
-            end = f"{year + 1}-01-01"
-        else:
-            end = f"{year}-{month + 1:02d}-01"
+        with conexao() as conn:
+            rows = conn.execute('''
+                SELECT r.id_cliente,
+                       CASE
+                           WHEN f.data_vencimento IS NULL OR f.data_vencimento >= :hoje THEN 0
+                           WHEN f.data_vencimento >= :d7 THEN 1
+                           WHEN f.data_vencimento >= :d30 THEN 2
+                           WHEN f.data_vencimento >= :d90 THEN 3
+                           ELSE 4
+                       END AS faixa,
+                       SUM(f.valor_receber)
+                FROM Financeiro f
+                JOIN Remessas r ON r.id_remessa = f.id_remessa
+                WHERE f.status = 'Pendente'
+                GROUP BY r.id_cliente, faixa
+            ''', dict(limites, hoje=hoje)).fetchall()
         
-        cursor.execute('''
-            SELECT SUM(valor_receber) 
-            FROM Financeiro 
-            WHERE status = 'Recebido' AND banco = ? AND data_recebimento >= ? AND data_recebimento < ?
-        ''', (banco, start, end))
+        # Acumula em centavos e converte no fim
+        total = dict.fromkeys(FAIXAS_AGING + ('vencido',), 0)
+        clientes = {}
+        for id_cliente, faixa, valor in rows:
+            nome = FAIXAS_AGING[faixa]
+            cliente = clientes.setdefault(id_cliente, dict.fromkeys(total, 0))
+            for destino in (cliente, total):
+                destino[nome] += valor
+                if faixa:
+                    destino['vencido'] += valor
         
-        result = cursor.fetchone()[0] or 0
-        conn.close()
-        return result
+        for faixas in (total, *clientes.values()):
+            for nome, valor in faixas.items():
+                faixas[nome] = _reais(valor)
+        
+        return {'data_base': hoje, 'total': total, 'clientes': clientes}
     
     @staticmethod
     def liquidar(fin_id: int, banco: str) -> str:
         """Liquida um título."""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
             data_receb = datetime.now().strftime('%Y-%m-%d')
             
-            cursor.execute('''
-                UPDATE Financeiro 
-                SET status = 'Recebido', banco = ?, data_recebimento = ?
-                WHERE id = ?
-            ''', (banco, data_receb, fin_id))
-            
-            conn.commit()
-            conn.close()
+            with conexao() as conn:
+                conn.execute('''
+                    UPDATE Financeiro 
+                    SET status = 'Recebido', banco = ?, data_recebimento = ?
+                    WHERE id = ?
+                ''', (banco, data_receb, fin_id))
+                row = conn.execute('''
+                    SELECT r.id_cliente FROM Financeiro f
+                    JOIN Remessas r ON r.id_remessa = f.id_remessa
+                    WHERE f.id = ?
+                ''', (fin_id,)).fetchone()
             
+            cliente = f'financeiro:{row[0]}' if row else 'financeiro:*'
+            cache_servicos.invalidar('financeiro', cliente, 'recebimentos')
             return "OK"
             
         except Exception as e:
             return str(e)
 
 
+@medir_servicos
+class DashboardService:
+    """Service do dashboard."""
+    
+    @staticmethod
+    @cacheado(('clientes', 'producao', 'financeiro', 'recebimentos'))
+    def snapshot(top_n: int = 3) -> Dict:
+        """Retorna todos os KPIs do dashboard e as N OPs mais atrasadas.
+
+        Uma única consulta composta: os totais vêm das tabelas de resumo e os
+        alertas entram por LEFT JOIN, então tudo sai do mesmo snapshot.
+        """
+        hoje = datetime.now()
+        
+        with conexao() as conn:
+            rows = conn.execute('''
+                WITH alertas AS (
+                    SELECT id_remessa, id_cliente, modelo, data_prevista, saldo_montar
+                    FROM Remessas
+                    WHERE data_prevista < :hoje AND saldo_montar > 0 AND status != 'Entregue'
+                    ORDER BY data_prevista
+                    LIMIT :top_n
+                )
+                SELECT g.ops_abertas, g.saldo_montar, g.valor_saldo, g.pendente, g.recebido,
+                       (SELECT COUNT(*) FROM Clientes),
+                       (SELECT SUM(recebido) FROM ResumoBancoMes WHERE mes = :mes),
+                       (SELECT COUNT(*) FROM Remessas
+                        WHERE data_prevista < :hoje AND saldo_montar > 0 AND status != 'Entregue'),
+                       a.id_remessa, a.id_cliente, a.modelo, a.data_prevista, a.saldo_montar
+                FROM ResumoGeral g
+                LEFT JOIN alertas a
+                WHERE g.id = 1
+            ''', {
+                'hoje': hoje.strftime('%Y-%m-%d'),
+                'mes': hoje.strftime('%Y-%m'),
+                'top_n': top_n
+            }).fetchall()
+        
+        kpis = rows[0] if rows else (0,) * 8
+        alertas = [
+            {
+                'id_remessa': r[8],
+                'id_cliente': r[9],
+                'modelo': r[10],
+                'data_prevista': r[11],
+                'saldo_montar': r[12],
+                'dias_atraso': (hoje - datetime.strptime(r[11], '%Y-%m-%d')).days
+            }
+            for r in sorted(rows, key=lambda r: r[11] or '') if r[8] is not None
+        ]
+        
+        return {
+            'ops_abertas': kpis[0] or 0,
+            'saldo_montar': kpis[1] or 0,
+            'valor_saldo': _reais(kpis[2]),
+            'pendente': _reais(kpis[3]),
+            'recebido': _reais(kpis[4]),
+            'clientes': kpis[5] or 0,
+            'faturamento_mes': _reais(kpis[6]),
+            'atrasadas': kpis[7] or 0,
+            'alertas': alertas
+        }
+
+
+@medir_servicos
+class ConfiguracaoService:
+    """Service de configurações."""
+    
+    @staticmethod
+    def listar_perfis_banco() -> List[str]:
+        """Lista os perfis de PRAGMA disponíveis."""
+        return list(database.PERFIS_PRAGMA)
+    
+    @staticmethod
+    def get_perfil_banco() -> str:
+        """Retorna o perfil de PRAGMA em uso."""
+        with conexao() as conn:
+            return database.get_perfil(conn)
+    
+    @staticmethod
+    def definir_perfil_banco(perfil: str) -> Dict:
+        """Troca o perfil de PRAGMA do banco."""
+        try:
+            database.definir_perfil(perfil)
+            return {'sucesso': True, 'mensagem': f'Perfil {perfil} ativado!'}
+        except Exception as e:
+            return {'sucesso': False, 'mensagem': str(e)}
+    
+    @staticmethod
+    def verificar_resumos(corrigir: bool = False) -> Dict:
+        """Confere as tabelas de resumo e, se pedido, as reconstrói."""
+        try:
+            with conexao(imediata=True) as conn:
+                divergencias = database.verificar_resumos(conn)
+                if divergencias and corrigir:
+                    database.reconstruir_resumos(conn)
+            
+            if divergencias and corrigir:
+                cache_servicos.limpar()
+            
+            if not divergencias:
+                return {'sucesso': True, 'mensagem': 'Resumos conferidos', 'divergencias': []}
+            mensagem = 'Resumos reconstruídos' if corrigir else f'{len(divergencias)} divergências'
+            return {'sucesso': True, 'mensagem': mensagem, 'divergencias': divergencias}
+        except Exception as e:
+            return {'sucesso': False, 'mensagem': str(e), 'divergencias': []}
+    
+    @staticmethod
+    def get_estatisticas_cache() -> Dict:
+        """Retorna os contadores do cache de leitura."""
+        return cache_servicos.estatisticas()
+    
+    @staticmethod
+    def get_metricas_banco() -> Dict:
+        """Retorna os tempos por consulta e por service e as consultas lentas."""
+        return metricas.resumo()
+    
+    @staticmethod
+    def definir_metricas_banco(ativo: bool) -> Dict:
+        """Liga ou desliga a coleta de métricas do banco."""
+        metricas.ativo = ativo
+        # Conexões abertas no outro modo são trocadas
+        database.get_gerenciador().reciclar()
+        return {'sucesso': True, 'mensagem': 'Coleta de métricas ligada' if ativo else 'Coleta de métricas desligada'}
+    
+    @staticmethod
+    def exportar_metricas_banco(caminho: Optional[str] = None) -> Dict:
+        """Grava as métricas do banco num arquivo JSON ao lado do banco."""
+        try:
+            if caminho is None:
+                pasta = os.path.dirname(os.path.abspath(database.get_db_path()))
+                caminho = os.path.join(pasta, f"metricas-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+            metricas.exportar(caminho)
+            return {'sucesso': True, 'mensagem': f'Métricas: {caminho}', 'arquivo': caminho}
+        except Exception as e:
+            return {'sucesso': False, 'mensagem': str(e)}
+    
+    @staticmethod
+    def limpar_metricas_banco() -> Dict:
+        """Zera as métricas do banco."""
+        metricas.limpar()
+        return {'sucesso': True, 'mensagem': 'Métricas zeradas'}
+
+
+@medir_servicos
 class BackupService:
     """Service de backup."""
     
     @staticmethod
-    def backup() -> Dict:
-        """Realiza backup."""
+    def backup(progresso=None) -> Dict:
+        """Realiza backup (online, compactado e verificado)."""
         try:
-            import shutil
-            from app.database import get_db_path
+            from .backup import MotorBackup
             
-            src = get_db_path()
-            dst = src.replace('.db', f'_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.db')
+            registro = MotorBackup().executar(progresso)
             
-            shutil.copy2(src, dst)
-            
-            return {'sucesso': True, 'mensagem': f'Backup: {dst}'}
+            if not registro['novo']:
+                return {'sucesso': True, 'mensagem': 'Nenhuma alteração desde o último backup',
+                        'arquivo': registro['arquivo']}
+            return {'sucesso': True, 'mensagem': f"Backup: {registro['arquivo']}",
+                    'arquivo': registro['arquivo']}
             
         except Exception as e:
             return {'sucesso': False, 'mensagem': str(e)}
+    
+    @staticmethod
+    def listar() -> List[Dict]:
+        """Lista os backups existentes."""
+        from .backup import MotorBackup
+        return MotorBackup().listar()
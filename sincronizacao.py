@@ -0,0 +1,381 @@
+"""
+Sincronização incremental entre aparelhos.
+
+Cada aparelho registra suas alterações no diário ``Alteracoes`` (gatilhos em
+database.py). Sincronizar é enviar ao servidor o que mudou desde o último
+envio e aplicar o que os outros aparelhos enviaram desde o último
+recebimento; os cursores ficam em ``SyncCursores``, um por par.
+
+Os pacotes são JSON comprimido com gzip, em lotes. Só vai a última versão
+de cada linha alterada (lida da tabela no momento da exportação) ou uma
+remoção.
+
+Conflitos: vale a alteração com o maior ``(carimbo, dispositivo)`` — o
+carimbo é UTC com milissegundos e o id do aparelho desempata, então todos
+os aparelhos chegam ao mesmo resultado, em qualquer ordem de chegada.
+As chaves são as das próprias tabelas, e as geradas no aparelho não se
+repetem entre aparelhos: no primeiro envio o servidor dá ao aparelho um
+número único, e as OPs levam esse número no sufixo e os ids de Financeiro
+ficam na faixa dele (``database.identidade_aparelho``). Ao importar OPs, o
+contador local passa do maior número recebido, para que a numeração siga
+crescente em todos os aparelhos.
+"""
+import gzip
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .database import (
+    TABELAS_SYNC, avancar_contador_op, conexao, numero_aparelho, numero_op, registrar_aparelho
+)
+from .cache import cache_servicos
+
+# 2: valores em centavos (inteiros); pacotes 1 tinham reais
+VERSAO_PACOTE = 2
+TAMANHO_LOTE = 500
+PAR_PADRAO = 'servidor'
+
+
+def empacotar(dados: Dict) -> bytes:
+    """Serializa e comprime um pacote."""
+    return gzip.compress(json.dumps(dados, separators=(',', ':')).encode('utf-8'))
+
+
+def desempacotar(pacote: bytes) -> Dict:
+    """Descomprime e valida um pacote."""
+    dados = json.loads(gzip.decompress(pacote).decode('utf-8'))
+    if dados.get('versao') != VERSAO_PACOTE:
+        raise ValueError(f"Versão de pacote não suportada: {dados.get('versao')}")
+    return dados
+
+
+def dispositivo_local(conn) -> str:
+    """Id deste aparelho (criado na migração do diário)."""
+    return conn.execute('SELECT dispositivo FROM SyncContexto WHERE id = 1').fetchone()[0]
+
+
+def get_cursor(conn, par: str) -> Tuple[int, int]:
+    """Retorna (enviado, recebido) do par."""
+    row = conn.execute('SELECT enviado, recebido FROM SyncCursores WHERE par = ?', (par,)).fetchone()
+    return tuple(row) if row else (0, 0)
+
+
+def _gravar_cursor(conn, par: str, enviado: int = None, recebido: int = None):
+    conn.execute('''
+        INSERT INTO SyncCursores (par, enviado, recebido, ultima_sincronizacao)
+        VALUES (:par, COALESCE(:enviado, 0), COALESCE(:recebido, 0), :agora)
+        ON CONFLICT (par) DO UPDATE SET
+            enviado = COALESCE(:enviado, enviado),
+            recebido = COALESCE(:recebido, recebido),
+            ultima_sincronizacao = :agora
+    ''', {'par': par, 'enviado': enviado, 'recebido': recebido,
+          'agora': datetime.now().strftime('%Y-%m-%d %H:%M:%S')})
+
+
+def _colunas(conn, tabela: str) -> List[str]:
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({tabela})')]
+
+
+def exportar_delta(conn, par: str = PAR_PADRAO, desde: int = None,
+                   limite: int = TAMANHO_LOTE) -> Tuple[bytes, int, bool]:
+    """Exporta as alterações locais ainda não enviadas ao par.
+
+    Retorna ``(pacote, ate, mais)``: ``ate`` é o seq do diário até onde o
+    pacote cobre e ``mais`` indica que há outro lote. Alterações que vieram
+    do próprio par não voltam para ele.
+    """
+    if desde is None:
+        desde = get_cursor(conn, par)[0]
+    # Limite fixado antes da leitura: o que for gravado depois fica para a próxima
+    fim = conn.execute('SELECT COALESCE(MAX(seq), 0) FROM Alteracoes').fetchone()[0]
+
+    rows = conn.execute('''
+        SELECT a.seq, a.tabela, a.chave, a.operacao, a.carimbo, a.dispositivo
+        FROM Alteracoes a
+        WHERE a.seq > :desde AND a.seq <= :fim
+          AND a.par IS NOT :par
+          AND a.seq = (SELECT MAX(b.seq) FROM Alteracoes b
+                       WHERE b.tabela = a.tabela AND b.chave = a.chave)
+        ORDER BY a.seq
+        LIMIT :limite
+    ''', {'desde': desde, 'fim': fim, 'par': par, 'limite': limite + 1}).fetchall()
+
+    mais = len(rows) > limite
+    rows = rows[:limite]
+    # Sem mais lotes, o cursor vai até ``fim`` (o resto não é para este par)
+    ate = rows[-1][0] if mais else max(fim, desde)
+
+    # Valores atuais das linhas alteradas, uma consulta por tabela
+    colunas = {}
+    valores = {}
+    for tabela, chave in TABELAS_SYNC.items():
+        chaves = [r[2] for r in rows if r[1] == tabela and r[3] == 'U']
+        if not chaves:
+            continue
+        colunas[tabela] = _colunas(conn, tabela)
+        indice = colunas[tabela].index(chave)
+        for inicio in range(0, len(chaves), 500):
+            parte = chaves[inicio:inicio + 500]
+            marcadores = ','.join('?' * len(parte))
+            for linha in conn.execute(f'SELECT * FROM {tabela} WHERE {chave} IN ({marcadores})', parte):
+                valores[(tabela, linha[indice])] = list(linha)
+
+    alteracoes = []
+    for _, tabela, chave, operacao, carimbo, dispositivo in rows:
+        linha = valores.get((tabela, chave)) if operacao == 'U' else None
+        if operacao == 'U' and linha is None:
+            operacao = 'D'
+        alteracoes.append([tabela, chave, operacao, carimbo, dispositivo, linha])
+
+    pacote = empacotar({
+        'versao': VERSAO_PACOTE,
+        'dispositivo': dispositivo_local(conn),
+        'ate': ate,
+        'colunas': colunas,
+        'alteracoes': alteracoes,
+    })
+    return pacote, ate, mais
+
+
+def _ultimo_carimbo(conn, tabela: str, chave) -> Optional[Tuple[str, str]]:
+    """(carimbo, dispositivo) da alteração mais recente da linha no diário."""
+    row = conn.execute('''
+        SELECT carimbo, dispositivo FROM Alteracoes
+        WHERE tabela = ? AND chave = ?
+        ORDER BY seq DESC LIMIT 1
+    ''', (tabela, chave)).fetchone()
+    return tuple(row) if row else None
+
+
+def importar_delta(conn, pacote: bytes, par: str = PAR_PADRAO) -> Dict:
+    """Aplica um pacote recebido do par, resolvendo conflitos por carimbo.
+
+    Deve rodar dentro de uma transação (``conexao(imediata=True)``). As
+    linhas aplicadas entram no diário com o carimbo e a origem remotos.
+    """
+    dados = desempacotar(pacote)
+    locais = {tabela: set(_colunas(conn, tabela)) for tabela in TABELAS_SYNC}
+    aplicadas = 0
+    conflitos = 0
+    maior_op = 0
+
+    try:
+        for tabela, chave, operacao, carimbo, dispositivo, linha in dados['alteracoes']:
+            if tabela not in TABELAS_SYNC:
+                continue
+
+            atual = _ultimo_carimbo(conn, tabela, chave)
+            if atual is not None and atual >= (carimbo, dispositivo):
+                # A versão local é igual ou mais nova: fica a local
+                if atual != (carimbo, dispositivo):
+                    conflitos += 1
+                continue
+
+            conn.execute(
+                'UPDATE SyncContexto SET origem = ?, carimbo = ?, par = ? WHERE id = 1',
+                (dispositivo, carimbo, par)
+            )
+            coluna_chave = TABELAS_SYNC[tabela]
+            if operacao == 'D':
+                conn.execute(f'DELETE FROM {tabela} WHERE {coluna_chave} = ?', (chave,))
+            else:
+                pares = [(c, v) for c, v in zip(dados['colunas'][tabela], linha) if c in locais[tabela]]
+                nomes = [c for c, _ in pares]
+                atualizacao = ', '.join(f'{c} = excluded.{c}' for c in nomes if c != coluna_chave)
+                conn.execute(f'''
+                    INSERT INTO {tabela} ({', '.join(nomes)})
+                    VALUES ({', '.join('?' * len(nomes))})
+                    ON CONFLICT ({coluna_chave}) DO UPDATE SET {atualizacao}
+                ''', [v for _, v in pares])
+                if tabela == 'Remessas':
+                    maior_op = max(maior_op, numero_op(chave) or 0)
+            aplicadas += 1
+    finally:
+        conn.execute('UPDATE SyncContexto SET origem = NULL, carimbo = NULL, par = NULL WHERE id = 1')
+
+    if maior_op:
+        avancar_contador_op(conn, maior_op)
+
+    return {
+        'ate': dados['ate'],
+        'recebidas': len(dados['alteracoes']),
+        'aplicadas': aplicadas,
+        'conflitos': conflitos,
+    }
+
+
+def compactar_diario(conn) -> int:
+    """Remove do diário as entradas superadas por outra mais nova da mesma linha.
+
+    A exportação e a resolução de conflitos só olham a última entrada de
+    cada linha, então isso não muda o que será sincronizado.
+    """
+    cursor = conn.execute('''
+        DELETE FROM Alteracoes
+        WHERE seq < (SELECT MAX(b.seq) FROM Alteracoes b
+                     WHERE b.tabela = Alteracoes.tabela AND b.chave = Alteracoes.chave)
+    ''')
+    return cursor.rowcount
+
+
+class Sincronizador:
+    """Sincroniza o banco local com um servidor.
+
+    O servidor precisa de dois métodos que trocam pacotes em bytes:
+    ``enviar(dispositivo, pacote)`` e ``receber(dispositivo, desde, limite)``,
+    este último devolvendo um pacote com ``ate`` (cursor do servidor) e
+    a flag ``mais``. Precisa também de ``registrar(dispositivo)``, que
+    devolve um número diferente para cada aparelho (e sempre o mesmo para
+    o mesmo aparelho).
+    """
+
+    def __init__(self, servidor, par: str = PAR_PADRAO, tamanho_lote: int = TAMANHO_LOTE):
+        self.servidor = servidor
+        self.par = par
+        self.tamanho_lote = tamanho_lote
+
+    def registrar(self) -> int:
+        """Obtém do servidor o número deste aparelho, se ainda não tiver."""
+        with conexao() as conn:
+            numero = numero_aparelho(conn)
+            dispositivo = dispositivo_local(conn)
+        if numero is not None:
+            return numero
+        
+        numero = self.servidor.registrar(dispositivo)
+        with conexao(imediata=True) as conn:
+            registrar_aparelho(conn, numero)
+        # Chaves de OPs e títulos mudaram
+        cache_servicos.limpar()
+        return numero
+
+    def enviar(self) -> int:
+        """Envia as alterações locais pendentes; retorna quantas foram."""
+        # As chaves provisórias são trocadas antes de qualquer envio
+        self.registrar()
+        enviadas = 0
+        mais = True
+        while mais:
+            with conexao() as conn:
+                dispositivo = dispositivo_local(conn)
+                pacote, ate, mais = exportar_delta(conn, self.par, limite=self.tamanho_lote)
+
+            quantidade = len(desempacotar(pacote)['alteracoes'])
+            if quantidade:
+                self.servidor.enviar(dispositivo, pacote)
+                enviadas += quantidade
+
+            # Só avança o cursor depois que o servidor aceitou o lote
+            with conexao() as conn:
+                _gravar_cursor(conn, self.par, enviado=ate)
+        return enviadas
+
+    def receber(self) -> Dict:
+        """Aplica o que os outros aparelhos enviaram desde o último recebimento."""
+        totais = {'recebidas': 0, 'aplicadas': 0, 'conflitos': 0}
+        mais = True
+        while mais:
+            with conexao() as conn:
+                dispositivo = dispositivo_local(conn)
+                recebido = get_cursor(conn, self.par)[1]
+
+            pacote = self.servidor.receber(dispositivo, recebido, self.tamanho_lote)
+            mais = desempacotar(pacote).get('mais', False)
+
+            # Aplicar o lote e avançar o cursor na mesma transação
+            with conexao(imediata=True) as conn:
+                resultado = importar_delta(conn, pacote, self.par)
+                _gravar_cursor(conn, self.par, recebido=resultado['ate'])
+
+            for campo in totais:
+                totais[campo] += resultado[campo]
+
+        if totais['aplicadas']:
+            cache_servicos.limpar()
+        return totais
+
+    def sincronizar(self) -> Dict:
+        """Envia e depois recebe."""
+        try:
+            enviadas = self.enviar()
+            recebimento = self.receber()
+        except Exception as e:
+            return {'sucesso': False, 'mensagem': f'Erro na sincronização: {e}'}
+
+        return dict(
+            recebimento,
+            sucesso=True,
+            enviadas=enviadas,
+            mensagem=f"{enviadas} alterações enviadas, {recebimento['aplicadas']} aplicadas"
+        )
+
+
+class ServidorSyncLocal:
+    """Servidor de sincronização em memória, para testes e benchmarks.
+
+    Guarda a versão mais nova de cada linha (mesma regra de conflito dos
+    aparelhos) com um número de sequência próprio, que é o cursor de
+    recebimento dos aparelhos.
+    """
+
+    def __init__(self):
+        self._seq = 0
+        self._aparelhos: Dict[str, int] = {}
+        self._linhas: Dict[Tuple[str, object], Dict] = {}
+        self._colunas: Dict[str, List[str]] = {}
+        self.bytes_recebidos = 0
+        self.bytes_enviados = 0
+
+    def registrar(self, dispositivo: str) -> int:
+        return self._aparelhos.setdefault(dispositivo, len(self._aparelhos) + 1)
+
+    def enviar(self, dispositivo: str, pacote: bytes):
+        self.bytes_recebidos += len(pacote)
+        dados = desempacotar(pacote)
+
+        for tabela, chave, operacao, carimbo, origem, linha in dados['alteracoes']:
+            atual = self._linhas.get((tabela, chave))
+            if atual is not None and (atual['carimbo'], atual['dispositivo']) >= (carimbo, origem):
+                continue
+            if linha is not None:
+                # Guarda como dicionário: aparelhos podem estar em versões de schema diferentes
+                linha = dict(zip(dados['colunas'][tabela], linha))
+            self._seq += 1
+            self._linhas[(tabela, chave)] = {
+                'seq': self._seq, 'operacao': operacao, 'carimbo': carimbo,
+                'dispositivo': origem, 'linha': linha, 'enviado_por': dispositivo,
+            }
+
+    def receber(self, dispositivo: str, desde: int, limite: int) -> bytes:
+        novas = sorted(
+            ((chave, item) for chave, item in self._linhas.items()
+             if item['seq'] > desde and item['enviado_por'] != dispositivo),
+            key=lambda par: par[1]['seq']
+        )
+        mais = len(novas) > limite
+        novas = novas[:limite]
+        ate = novas[-1][1]['seq'] if mais else max(self._seq, desde)
+
+        colunas: Dict[str, List[str]] = {}
+        for (tabela, _), item in novas:
+            if item['linha'] is not None:
+                nomes = colunas.setdefault(tabela, [])
+                nomes.extend(c for c in item['linha'] if c not in nomes)
+
+        alteracoes = []
+        for (tabela, chave), item in novas:
+            linha = item['linha']
+            if linha is not None:
+                linha = [linha.get(c) for c in colunas[tabela]]
+            alteracoes.append([tabela, chave, item['operacao'], item['carimbo'], item['dispositivo'], linha])
+
+        pacote = empacotar({
+            'versao': VERSAO_PACOTE,
+            'dispositivo': 'servidor',
+            'ate': ate,
+            'mais': mais,
+            'colunas': colunas,
+            'alteracoes': alteracoes,
+        })
+        self.bytes_enviados += len(pacote)
+        return pacote
@@ -0,0 +1,11 @@
+"""
+Utilitários compartilhados pelos testes.
+"""
+from app import database
+from app.cache import cache_servicos
+
+
+def usar_banco(caminho):
+    """Aponta o pool para ``caminho`` e descarta o cache do banco anterior."""
+    database.configurar(caminho)
+    cache_servicos.limpar()
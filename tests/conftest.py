@@ -0,0 +1,31 @@
+"""
+Fixtures dos testes. Rode a partir da pasta que contém ``app/``:
+
+    python -m pytest app/tests
+"""
+import pytest
+
+from app import database
+from app.tests.comum import usar_banco
+
+
+@pytest.fixture
+def banco(tmp_path):
+    """Banco novo, já inicializado, num diretório temporário."""
+    caminho = str(tmp_path / 'teste.db')
+    usar_banco(caminho)
+    database.init_db()
+    yield caminho
+    usar_banco(None)
+
+
+@pytest.fixture
+def aparelhos(tmp_path):
+    """Dois bancos independentes, como dois aparelhos: ``{'a': caminho, 'b': caminho}``."""
+    caminhos = {}
+    for nome in ('a', 'b'):
+        caminhos[nome] = str(tmp_path / f'{nome}.db')
+        usar_banco(caminhos[nome])
+        database.init_db()
+    yield caminhos
+    usar_banco(None)
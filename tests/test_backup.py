@@ -0,0 +1,29 @@
+"""
+Backup incremental: nomes únicos mesmo com vários backups no mesmo
+segundo e retenção apagando os antigos.
+"""
+import sqlite3
+
+from app import database
+from app.backup import MotorBackup
+
+
+def test_nomes_nao_se_repetem_com_retencao(banco, tmp_path):
+    motor = MotorBackup(banco, pasta=str(tmp_path / 'backups'), retencao=1, pausa=0)
+    nomes = []
+    for i in range(10):
+        with database.conexao() as conn:
+            conn.execute("INSERT INTO Clientes (id_cliente, nome) VALUES (?, 'x')", (f'C{i}',))
+        registro = motor.executar()
+        assert registro['novo']
+        nomes.append(registro['arquivo'])
+
+    assert len(set(nomes)) == len(nomes)
+    assert [r['arquivo'] for r in motor.listar()] == nomes[-1:]
+
+    destino = motor.restaurar(nomes[-1], str(tmp_path / 'restaurado.db'))
+    conn = sqlite3.connect(destino)
+    try:
+        assert conn.execute('SELECT COUNT(*) FROM Clientes').fetchone()[0] == 10
+    finally:
+        conn.close()
@@ -0,0 +1,150 @@
+"""
+Migrações 1→última sobre um banco com o schema original (valores REAL,
+``user_version`` 0), como o de um aparelho que nunca foi atualizado.
+"""
+import sqlite3
+
+from app import database
+from app.services import RemessaService
+from app.tests.comum import usar_banco
+
+# Schema da primeira versão do app, antes de qualquer migração
+SCHEMA_ORIGINAL = '''
+    CREATE TABLE Clientes (
+        id_cliente TEXT PRIMARY KEY,
+        nome TEXT NOT NULL,
+        telefone TEXT,
+        email TEXT,
+        banco_preferencial TEXT DEFAULT 'Caixa'
+    );
+    CREATE TABLE Modelos (
+        modelo TEXT PRIMARY KEY,
+        custo_unitario REAL NOT NULL
+    );
+    CREATE TABLE Remessas (
+        id_remessa TEXT PRIMARY KEY,
+        id_cliente TEXT NOT NULL,
+        modelo TEXT NOT NULL,
+        quantidade INTEGER NOT NULL,
+        custo_unitario REAL NOT NULL,
+        saldo_montar INTEGER DEFAULT 0,
+        entregue INTEGER DEFAULT 0,
+        prazo_dias INTEGER DEFAULT 30,
+        data_criacao TEXT NOT NULL,
+        cliente_destino TEXT,
+        data_prevista TEXT,
+        status TEXT DEFAULT 'Em Aberto'
+    );
+    CREATE TABLE Financeiro (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_remessa TEXT NOT NULL,
+        quantidade INTEGER NOT NULL,
+        valor_receber REAL NOT NULL,
+        data_entrega TEXT NOT NULL,
+        data_vencimento TEXT,
+        status TEXT DEFAULT 'Pendente',
+        banco TEXT,
+        data_recebimento TEXT
+    );
+    CREATE TABLE Configuracoes (chave TEXT PRIMARY KEY, valor TEXT);
+    CREATE TABLE Usuarios (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        usuario TEXT UNIQUE NOT NULL,
+        senha_hash TEXT NOT NULL
+    );
+    CREATE TABLE Bancos (nome TEXT PRIMARY KEY, limite_mensal REAL DEFAULT 5000);
+    INSERT INTO Configuracoes VALUES ('ultimo_id_remessa', '0');
+    INSERT INTO Bancos (nome) VALUES ('Caixa'), ('Banco do Brasil'), ('Itaú'), ('Bradesco'), ('Nubank');
+
+    INSERT INTO Clientes (id_cliente, nome) VALUES ('C1', 'Ana'), ('C2', 'Bia');
+    INSERT INTO Modelos VALUES ('Camiseta', 2.5), ('Calça', 1.005);
+    INSERT INTO Remessas (id_remessa, id_cliente, modelo, quantidade, custo_unitario,
+                          saldo_montar, entregue, data_criacao)
+    VALUES ('OP-0001', 'C1', 'Camiseta', 10, 2.5, 6, 4, '2024-01-10'),
+           ('OP-0002', 'C2', 'Calça', 20, 1.005, 0, 20, '2024-01-11');
+    INSERT INTO Financeiro (id_remessa, quantidade, valor_receber, data_entrega,
+                            status, banco, data_recebimento)
+    VALUES ('OP-0001', 4, 10.0, '2024-01-15', 'Pendente', NULL, NULL),
+           ('OP-0002', 20, 20.1, '2024-01-16', 'Recebido', 'Caixa', '2024-02-01');
+'''
+
+
+def banco_original(caminho) -> str:
+    conn = sqlite3.connect(caminho)
+    conn.executescript(SCHEMA_ORIGINAL)
+    conn.close()
+    return str(caminho)
+
+
+def test_migra_schema_original_ate_a_ultima_versao(tmp_path):
+    usar_banco(banco_original(tmp_path / 'original.db'))
+    try:
+        database.init_db()
+
+        with database.conexao() as conn:
+            versao = database.get_schema_version(conn)
+            modelos = dict(conn.execute('SELECT modelo, custo_unitario FROM Modelos'))
+            titulos = conn.execute('SELECT valor_receber FROM Financeiro ORDER BY id').fetchall()
+            tipos = {r[1]: r[2] for r in conn.execute('PRAGMA table_info(Remessas)')}
+            gatilhos = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+            contador = conn.execute(
+                "SELECT valor FROM Configuracoes WHERE chave = 'ultimo_id_remessa'").fetchone()[0]
+            divergencias = database.verificar_resumos(conn)
+
+        assert versao == database.MIGRACOES[-1][0]
+        assert modelos == {'Camiseta': 250, 'Calça': 101}
+        assert titulos == [(1000,), (2010,)]
+        assert tipos['custo_unitario'] == 'INTEGER'
+        assert {'trg_resumo_remessa_ins', 'trg_resumo_financeiro_upd',
+                'trg_diario_remessas_ins'} <= gatilhos
+        assert int(contador) >= 2
+        assert divergencias == []
+
+        # O banco migrado continua utilizável pelos services
+        id_remessa = RemessaService.criar({'id_cliente': 'C1', 'modelo': 'Camiseta',
+                                           'quantidade': 5, 'custo_unitario': 2.5})['id']
+        assert RemessaService.registrar_entrega(id_remessa, 5)['sucesso']
+        antigas = {r.id_remessa: r for r in RemessaService.listar_todos()}
+        assert antigas['OP-0001'].custo_unitario == 2.5
+        with database.conexao() as conn:
+            assert database.verificar_resumos(conn) == []
+
+        # Rodar de novo não reaplica nada
+        database.init_db()
+        with database.conexao() as conn:
+            assert database.get_schema_version(conn) == versao
+            assert conn.execute('SELECT COUNT(*) FROM Remessas').fetchone()[0] == 3
+    finally:
+        usar_banco(None)
+
+
+def test_migracao_que_falha_nao_deixa_rastro(tmp_path, monkeypatch):
+    usar_banco(banco_original(tmp_path / 'original.db'))
+    try:
+        def quebrar(conn):
+            conn.execute("UPDATE Modelos SET custo_unitario = 0")
+            raise RuntimeError('falha no meio da migração')
+
+        ultima = database.MIGRACOES[-1][0]
+        monkeypatch.setattr(database, 'MIGRACOES',
+                            database.MIGRACOES + [(ultima + 1, 'quebrada', [quebrar])])
+        try:
+            database.init_db()
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError('a migração quebrada deveria propagar o erro')
+
+        # init_db roda numa transação só: o banco volta inteiro ao estado original
+        with database.conexao() as conn:
+            assert database.get_schema_version(conn) == 0
+            assert conn.execute(
+                "SELECT custo_unitario FROM Modelos WHERE modelo = 'Camiseta'").fetchone()[0] == 2.5
+
+        monkeypatch.undo()
+        database.init_db()
+        with database.conexao() as conn:
+            assert database.get_schema_version(conn) == ultima
+            assert database.verificar_resumos(conn) == []
+    finally:
+        usar_banco(None)
@@ -0,0 +1,179 @@
+"""
+Sincronização entre dois aparelhos pelo ServidorSyncLocal: diário,
+cursores, conflitos e unicidade das chaves geradas em cada aparelho.
+"""
+import time
+
+import pytest
+
+from app import database
+from app.services import ClienteService, RemessaService
+from app.sincronizacao import (
+    Sincronizador, ServidorSyncLocal, exportar_delta, desempacotar, get_cursor
+)
+from app.tests.comum import usar_banco
+
+CONTADOR = 1 << database.BITS_CONTADOR_FINANCEIRO
+PROVISORIA = database.NUMERO_PROVISORIO << database.BITS_CONTADOR_FINANCEIRO
+
+
+def popular(prefixo: str, ops: int = 3):
+    """Cliente, modelo, OPs e uma entrega parcial em cada OP."""
+    ClienteService.cadastrar({'id_cliente': f'{prefixo}1', 'nome': f'Cliente {prefixo}'})
+    ids = [RemessaService.criar({'id_cliente': f'{prefixo}1', 'modelo': 'Camiseta',
+                                 'quantidade': 10, 'custo_unitario': 2.5})['id']
+           for _ in range(ops)]
+    for id_remessa in ids:
+        assert RemessaService.registrar_entrega(id_remessa, 4)['sucesso']
+    return ids
+
+
+def conteudo():
+    """Linhas das tabelas sincronizadas, comparáveis entre aparelhos."""
+    with database.conexao() as conn:
+        return {
+            tabela: sorted(conn.execute(f'SELECT * FROM {tabela}').fetchall(), key=repr)
+            for tabela in database.TABELAS_SYNC
+        }
+
+
+def sem_divergencia():
+    with database.conexao() as conn:
+        return database.verificar_resumos(conn) == []
+
+
+def sincronizar(caminho, servidor):
+    usar_banco(caminho)
+    resultado = Sincronizador(servidor, tamanho_lote=7).sincronizar()
+    assert resultado['sucesso'], resultado['mensagem']
+    return resultado
+
+
+def test_diario_registra_insercao_e_remocao(banco):
+    ClienteService.cadastrar({'id_cliente': 'C1', 'nome': 'Ana'})
+    with database.conexao() as conn:
+        conn.execute("UPDATE Clientes SET telefone = '1' WHERE id_cliente = 'C1'")
+        conn.execute("DELETE FROM Clientes WHERE id_cliente = 'C1'")
+        operacoes = [r[0] for r in conn.execute(
+            "SELECT operacao FROM Alteracoes WHERE tabela = 'Clientes' AND chave = 'C1' ORDER BY seq")]
+        pacote, _, mais = exportar_delta(conn)
+
+    assert operacoes == ['U', 'U', 'D']
+    # Só a última alteração de cada linha vai no pacote
+    alteracoes = desempacotar(pacote)['alteracoes']
+    assert [(a[0], a[1], a[2]) for a in alteracoes] == [('Clientes', 'C1', 'D')]
+    assert not mais
+
+
+def test_cursores_avancam_e_nada_e_reenviado(aparelhos):
+    servidor = ServidorSyncLocal()
+    usar_banco(aparelhos['a'])
+    popular('A')
+
+    primeira = sincronizar(aparelhos['a'], servidor)
+    with database.conexao() as conn:
+        enviado, _ = get_cursor(conn, 'servidor')
+        ultimo = conn.execute('SELECT MAX(seq) FROM Alteracoes').fetchone()[0]
+    segunda = sincronizar(aparelhos['a'], servidor)
+
+    assert primeira['enviadas'] > 0
+    assert enviado == ultimo
+    assert segunda['enviadas'] == 0 and segunda['recebidas'] == 0
+
+
+def test_dois_aparelhos_convergem_sem_colisao_de_chaves(aparelhos):
+    servidor = ServidorSyncLocal()
+    usar_banco(aparelhos['a'])
+    ops_a = popular('A')
+    usar_banco(aparelhos['b'])
+    ops_b = popular('B')
+
+    # Antes do primeiro contato as chaves são provisórias nos dois
+    assert all(op.endswith('-' + database.SUFIXO_PROVISORIO) for op in ops_a + ops_b)
+
+    sincronizar(aparelhos['a'], servidor)
+    sincronizar(aparelhos['b'], servidor)
+    sincronizar(aparelhos['a'], servidor)
+
+    usar_banco(aparelhos['a'])
+    em_a = conteudo()
+    assert sem_divergencia()
+    usar_banco(aparelhos['b'])
+    em_b = conteudo()
+    assert sem_divergencia()
+
+    assert em_a == em_b
+    ops = [r[0] for r in em_a['Remessas']]
+    titulos = [r[0] for r in em_a['Financeiro']]
+    assert len(ops) == len(set(ops)) == 6
+    assert len(titulos) == len(set(titulos)) == 6
+    assert sorted({op.rsplit('-', 1)[1] for op in ops}) == ['N1', 'N2']
+    assert sorted({t // CONTADOR for t in titulos}) == [1, 2]
+
+
+def test_registro_troca_chaves_provisorias(banco):
+    popular('A', ops=2)
+    with database.conexao() as conn:
+        assert conn.execute('SELECT MIN(id) FROM Financeiro').fetchone()[0] >= PROVISORIA
+
+    Sincronizador(ServidorSyncLocal()).registrar()
+
+    with database.conexao() as conn:
+        ops = [r[0] for r in conn.execute('SELECT id_remessa FROM Remessas')]
+        titulos = conn.execute('SELECT id, id_remessa FROM Financeiro').fetchall()
+        chaves = conn.execute('SELECT tabela, chave FROM Alteracoes').fetchall()
+
+    assert all(op.endswith('-N1') for op in ops)
+    assert all(CONTADOR <= id < 2 * CONTADOR and id_remessa in ops for id, id_remessa in titulos)
+    # O diário não tem mais nenhuma chave provisória
+    assert not [c for t, c in chaves if t == 'Remessas' and c.endswith('-P')]
+    assert not [c for t, c in chaves if t == 'Financeiro' and c >= PROVISORIA]
+    assert sem_divergencia()
+    # As próximas chaves já saem definitivas
+    assert RemessaService.criar({'id_cliente': 'A1', 'modelo': 'Camiseta', 'quantidade': 1,
+                                 'custo_unitario': 1})['id'].endswith('-N1')
+
+
+def test_servidor_da_o_mesmo_numero_ao_mesmo_aparelho():
+    servidor = ServidorSyncLocal()
+    assert [servidor.registrar(d) for d in ('x', 'y', 'x', 'z')] == [1, 2, 1, 3]
+
+
+@pytest.mark.parametrize('ultimo', ['a', 'b'])
+def test_conflito_vale_a_alteracao_mais_recente(aparelhos, ultimo):
+    servidor = ServidorSyncLocal()
+    usar_banco(aparelhos['a'])
+    ClienteService.cadastrar({'id_cliente': 'C1', 'nome': 'Ana'})
+    sincronizar(aparelhos['a'], servidor)
+    sincronizar(aparelhos['b'], servidor)
+
+    # Os dois editam o mesmo cliente offline; o último a editar deve vencer
+    primeiro = 'b' if ultimo == 'a' else 'a'
+    for aparelho in (primeiro, ultimo):
+        usar_banco(aparelhos[aparelho])
+        with database.conexao() as conn:
+            conn.execute("UPDATE Clientes SET nome = ? WHERE id_cliente = 'C1'", (f'Ana {aparelho}',))
+        time.sleep(0.01)
+
+    for aparelho in ('a', 'b', 'a'):
+        sincronizar(aparelhos[aparelho], servidor)
+
+    for aparelho in ('a', 'b'):
+        usar_banco(aparelhos[aparelho])
+        assert ClienteService.buscar_por_id('C1').nome == f'Ana {ultimo}'
+
+
+def test_remocao_propaga(aparelhos):
+    servidor = ServidorSyncLocal()
+    usar_banco(aparelhos['a'])
+    ClienteService.cadastrar({'id_cliente': 'C1', 'nome': 'Ana'})
+    sincronizar(aparelhos['a'], servidor)
+    sincronizar(aparelhos['b'], servidor)
+
+    usar_banco(aparelhos['b'])
+    with database.conexao() as conn:
+        conn.execute("DELETE FROM Clientes WHERE id_cliente = 'C1'")
+    sincronizar(aparelhos['b'], servidor)
+    sincronizar(aparelhos['a'], servidor)
+
+    assert ClienteService.buscar_por_id('C1') is None
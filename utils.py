@@ -1,6 +1,7 @@
 """
 Utilitários para mobile.
 """
+import importlib
 
 
 def format_currency(value: float) -> str:
@@ -30,3 +31,43 @@ class Logger:
     @staticmethod
     def error(msg: str):
         print(f"[ERROR] {msg}")
+
+
+class ImportacaoTardia:
+    """Referência a uma classe cujo módulo só é importado no primeiro uso.
+
+    Chamar a referência instancia a classe; atributos são repassados a ela.
+    Não serve como classe base nem em ``isinstance``: para isso use
+    ``resolver()``.
+    """
+    
+    __slots__ = ('modulo', 'nome', '_alvo')
+    
+    def __init__(self, modulo: str, nome: str):
+        self.modulo = modulo
+        self.nome = nome
+        self._alvo = None
+    
+    def resolver(self):
+        """Importa o módulo (uma vez só) e retorna a classe."""
+        if self._alvo is None:
+            self._alvo = getattr(importlib.import_module(self.modulo), self.nome)
+        return self._alvo
+    
+    def __call__(self, *args, **kwargs):
+        return self.resolver()(*args, **kwargs)
+    
+    def __getattr__(self, nome):
+        return getattr(self.resolver(), nome)
+    
+    def __repr__(self):
+        return f"<ImportacaoTardia {self.modulo}.{self.nome}>"
+
+
+def tardio(modulo: str, *nomes: str):
+    """Cria referências tardias para ``nomes`` de ``modulo``.
+
+    Uso: ``MDDialog = tardio('kivymd.uix.dialog', 'MDDialog')``.
+    """
+    referencias = tuple(ImportacaoTardia(modulo, nome) for nome in nomes)
+    return referencias[0] if len(referencias) == 1 else referencias